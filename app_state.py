@@ -2,8 +2,16 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass, field
-from typing import ClassVar
+from typing import Any, Callable, ClassVar, Mapping
+
+from config_snapshot import ConfigSnapshot
+from exclusion_filter import ExclusionFilter
+from poll_scheduler import MODE_FAST, PollPolicy
+from process_snapshot import ProcessSnapshotService
+from state_events import StateChanges
+from switch_policy import SwitchPolicy
 
 APP_VERSION: str = "1.1.0"
 GITHUB_REPO: str = "QEXLAUWASD/Twitch-StreamManger"
@@ -13,12 +21,18 @@ LANGUAGE_LABEL_TO_CODE: dict[str, str] = {
     "中文": "zh",
 }
 
-POLL_INTERVAL_SEC: int = 30
-UI_REFRESH_INTERVAL_MS: int = 1000
+EVENT_POLL_INTERVAL_SEC: float = 1.0
+EVENT_SETTLE_SEC: float = 0.25
+UI_WORKER_THREADS: int = 2
 PROCESS_LIST_REFRESH_INTERVAL_MS: int = 60_000
 PERIODIC_DEBUG_CYCLES: int = 10
 API_TIMEOUT_SEC: int = 10
 API_MAX_RETRIES: int = 2
+HELIX_GAMES_BATCH_SIZE: int = 100
+GAME_ID_CACHE_TTL_SEC: int = 7 * 24 * 3600
+GAME_ID_NEGATIVE_TTL_SEC: int = 24 * 3600
+OUTBOX_RETRY_MIN_SEC: float = 5.0
+OUTBOX_RETRY_MAX_SEC: float = 300.0
 DEFAULT_TEMPLATE: str = " %game% %date%"
 FALLBACK_CATEGORY: str = "Just Chatting"
 NO_GAME_LABEL: str = "No game detected"
@@ -55,6 +69,20 @@ I18N: dict[str, dict[str, str]] = {
         "update_available_msg": "A new version {latest} is available (current: {current}).\nVisit the GitHub releases page to download it.",
         "up_to_date": "Up to date",
         "update_check_error": "Could not check for updates.",
+        "dump_trace": "Dump Trace",
+        "trace_saved": "Trace of the last {count} cycles saved to:\n{path}",
+        "trace_disabled": "Tracing is disabled. Set \"tracing\": {\"enabled\": true} in config.json and restart.",
+        "filter": "Filter:",
+        "scan_interval": "Next scan in up to {seconds:.0f}s ({mode})",
+        "poll_mode_fast": "fast",
+        "poll_mode_backoff": "backing off",
+        "poll_mode_idle": "idle",
+        "poll_mode_cpu_busy": "CPU busy",
+        "import_mappings": "Import mappings…",
+        "mapping_files": "Mapping files (CSV / JSON)",
+        "import_summary": "Imported {added} mappings.\n{existing} already configured, {duplicates} duplicates and {invalid} invalid rows were skipped.",
+        "import_unresolved": "{count} categories were not found on Twitch (kept as written):\n{names}",
+        "import_failed": "Could not import {path}:\n{error}",
     },
     "zh": {
         "app_title": "Twitch 自動標題 - 介面",
@@ -87,6 +115,20 @@ I18N: dict[str, dict[str, str]] = {
         "update_available_msg": "發現新版本 {latest}（目前版本：{current}）。\n請前往 GitHub Releases 頁面下載。",
         "up_to_date": "已是最新版本",
         "update_check_error": "無法檢查更新。",
+        "dump_trace": "匯出追蹤",
+        "trace_saved": "最近 {count} 個週期的追蹤已儲存至：\n{path}",
+        "trace_disabled": "追蹤功能未啟用。請在 config.json 設定 \"tracing\": {\"enabled\": true} 後重新啟動。",
+        "filter": "篩選:",
+        "scan_interval": "下次掃描最多 {seconds:.0f} 秒後（{mode}）",
+        "poll_mode_fast": "快速",
+        "poll_mode_backoff": "逐步放緩",
+        "poll_mode_idle": "閒置",
+        "poll_mode_cpu_busy": "CPU 忙碌",
+        "import_mappings": "匯入對應…",
+        "mapping_files": "對應檔 (CSV / JSON)",
+        "import_summary": "已匯入 {added} 筆對應。\n略過：已設定 {existing} 筆、重複 {duplicates} 筆、無效 {invalid} 列。",
+        "import_unresolved": "有 {count} 個分類在 Twitch 上找不到（保留原文字）：\n{names}",
+        "import_failed": "無法匯入 {path}：\n{error}",
     },
 }
 
@@ -95,14 +137,61 @@ I18N: dict[str, dict[str, str]] = {
 class AppState:
     """Centralized application state shared across modules."""
 
-    app_config: dict = field(default_factory=dict)
-    base_template: str = DEFAULT_TEMPLATE
-    process_names: dict[str, str] = field(default_factory=dict)
-    twitch_categories: dict[str, str] = field(default_factory=dict)
+    config: ConfigSnapshot = field(default_factory=lambda: ConfigSnapshot(base_template=DEFAULT_TEMPLATE))
     current_game: str = "Unknown"
     custom_suffix: str = ""
     keep_last_when_no_game: bool = True
     language: str = "zh"
     excluded_names: set[str] = field(default_factory=set)
     excluded_prefixes: list[str] = field(default_factory=list)
+    exclusion_filter: ExclusionFilter = field(default_factory=ExclusionFilter, repr=False)
+    processes: ProcessSnapshotService = field(default_factory=ProcessSnapshotService, repr=False)
     dark_mode: bool = False
+    switch_policy: SwitchPolicy = field(default_factory=SwitchPolicy)
+    poll_policy: PollPolicy = field(default_factory=PollPolicy)
+    poll_interval: float = 0.0
+    poll_mode: str = MODE_FAST
+    changes: StateChanges = field(default_factory=StateChanges, repr=False)
+    _config_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    # -- Configuration (read-only views of the current snapshot) --
+
+    @property
+    def app_config(self) -> Mapping[str, Any]:
+        return self.config.raw
+
+    @property
+    def base_template(self) -> str:
+        return self.config.base_template
+
+    @property
+    def process_names(self) -> Mapping[str, str]:
+        return self.config.process_names
+
+    @property
+    def twitch_categories(self) -> Mapping[str, str]:
+        return self.config.twitch_categories
+
+    @property
+    def config_version(self) -> int:
+        return self.config.version
+
+    def publish_config(self, build: Callable[[ConfigSnapshot], ConfigSnapshot]) -> ConfigSnapshot:
+        """Swap in ``build(current)`` as the next config version and return it.
+
+        Writers are serialized (*build* may persist the snapshot before it
+        becomes visible); readers just take :attr:`config` without locking.
+        """
+        with self._config_lock:
+            current = self.config
+            snapshot = build(current).with_version(current.version + 1)
+            self.config = snapshot
+        self.changes.publish("config_version", snapshot.version)
+        return snapshot
+
+    def update_observed(self, **values: Any) -> None:
+        """Set display fields (e.g. ``current_game``) and publish those that changed."""
+        for name, value in values.items():
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                self.changes.publish(name, value)
@@ -0,0 +1,4 @@
+"""Benchmarks and local stand-ins for Twitch Stream Auto-Title.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_matcher``.
+"""
@@ -0,0 +1,254 @@
+"""Micro-benchmarks for the detection hot path in ``process_monitor``.
+
+Usage::
+
+    python -m benchmarks.bench_detection [--processes 200,1000,10000]
+        [--mappings 10,100,1000,10000] [--output results.json]
+        [--compare baseline.json [--tolerance 2.0]]
+
+For every combination of process-table size and mapping count it times
+
+* ``is_excluded_process`` – per name, with a cold and a warm verdict cache,
+* ``_iter_non_excluded`` – cold (fresh snapshot), steady (no churn) and
+  with 1 % of the PIDs replaced between calls,
+* ``get_current_game`` – matcher compile, full scan (no game running) and
+  the memoized path,
+* ``debug_all_processes`` – with DEBUG logging enabled (records are
+  formatted, then discarded),
+
+against a synthetic process table injected into the snapshot service;
+``psutil`` is patched to fail loudly if anything still reaches it.
+Results are written as JSON.  With ``--compare`` each timing is checked
+against an earlier run and the exit status is 1 if any got slower than
+*tolerance* times the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import logging
+import platform
+import random
+import sys
+import time
+from typing import Any, Callable
+from unittest import mock
+
+import psutil
+
+import process_monitor
+from app_state import AppState
+from benchmarks.bench_matcher import _synthetic_mappings, _synthetic_processes
+from config_snapshot import ConfigSnapshot
+from config_store import mark_exclusions_changed
+from process_snapshot import ProcessSnapshotService
+
+PROCESS_SIZES: tuple[int, ...] = (200, 1_000, 10_000)
+MAPPING_SIZES: tuple[int, ...] = (10, 100, 1_000, 10_000)
+
+# Typical exclusion lists: a few dozen names plus some vendor prefixes.
+EXCLUDED_NAMES: tuple[str, ...] = tuple(f"svc{i:05d}.exe" for i in range(0, 100_000, 2_000))
+EXCLUDED_PREFIXES: tuple[str, ...] = ("helper1", "updater2", "agent3", "nvidia", "microsoft", "steamwebhelper")
+
+_MAX_LOOPS: int = 1_000
+
+
+class SyntheticProcessTable:
+    """``pid → (name, create_time)`` table standing in for psutil."""
+
+    def __init__(self, size: int, rng: random.Random) -> None:
+        names = _synthetic_processes(size, rng)
+        # Real tables repeat names (browsers, service hosts); keep ~10 % duplicates.
+        names += [rng.choice(names) for _ in range(max(0, size - len(names)))]
+        self.procs: dict[int, tuple[str, float]] = {4 * (i + 1): (n, 1.0e9 + i) for i, n in enumerate(names)}
+        self._next_pid = 4 * (len(self.procs) + 1)
+        self._rng = rng
+
+    def pids(self) -> list[int]:
+        return list(self.procs)
+
+    def resolve(self, pid: int) -> tuple[str, float] | None:
+        return self.procs.get(pid)
+
+    def churn(self, fraction: float) -> list[int]:
+        """Replace *fraction* of the processes; return the exited PIDs."""
+        exited = self._rng.sample(list(self.procs), max(1, int(len(self.procs) * fraction)))
+        for pid in exited:
+            name, _ = self.procs.pop(pid)
+            self.procs[self._next_pid] = (name, time.time())
+            self._next_pid += 4
+        return exited
+
+
+class _DiscardHandler(logging.Handler):
+    """Format every record (that is the cost being measured) and drop it."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+
+
+def _measure(fn: Callable[[], object], setup: Callable[[], object] | None = None, min_time: float = 0.05) -> tuple[float, int]:
+    """Best-of-3 seconds per call, growing the loop count until a round takes *min_time*."""
+    loops = 1
+    while True:
+        best = float("inf")
+        for _ in range(3):
+            elapsed = 0.0
+            for _ in range(loops):
+                if setup is not None:
+                    setup()
+                start = time.perf_counter()
+                fn()
+                elapsed += time.perf_counter() - start
+            best = min(best, elapsed)
+        if best >= min_time or loops >= _MAX_LOOPS:
+            return best / loops, loops
+        loops = min(_MAX_LOOPS, max(loops * 2, int(loops * min_time / max(best, 1e-9))))
+
+
+def _reset_detection_caches(state: AppState) -> None:
+    state.processes.detection = None
+
+
+def _reset_matcher_cache(state: AppState) -> None:
+    state.config = dataclasses.replace(state.config)  # same config, empty derived cache
+    state.processes.detection = None
+
+
+def bench_case(n_procs: int, n_mappings: int, seed: int, min_time: float) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    table = SyntheticProcessTable(n_procs, rng)
+    state = AppState(
+        config=ConfigSnapshot.from_config({"process_name": _synthetic_mappings(n_mappings, rng)}),
+        excluded_names=set(EXCLUDED_NAMES),
+        excluded_prefixes=list(EXCLUDED_PREFIXES),
+        processes=ProcessSnapshotService(list_pids=table.pids, resolve=table.resolve),
+    )
+    mark_exclusions_changed(state)
+    names = [name for name, _ in table.procs.values()]
+    results: list[dict[str, Any]] = []
+
+    def record(function: str, variant: str, fn: Callable[[], object], setup: Callable[[], object] | None = None, per: int = 1) -> None:
+        seconds, loops = _measure(fn, setup, min_time)
+        results.append({
+            "function": function,
+            "variant": variant,
+            "processes": n_procs,
+            "mappings": n_mappings,
+            "seconds_per_call": seconds / per,
+            "loops": loops,
+        })
+
+    def exclude_all() -> None:
+        for name in names:
+            process_monitor.is_excluded_process(name, state)
+
+    def cold_filter() -> None:
+        mark_exclusions_changed(state)
+
+    record("is_excluded_process", "cold", exclude_all, cold_filter, per=len(names))
+    exclude_all()
+    record("is_excluded_process", "warm", exclude_all, per=len(names))
+
+    def fresh_service() -> None:
+        state.processes = ProcessSnapshotService(list_pids=table.pids, resolve=table.resolve)
+
+    record("_iter_non_excluded", "cold", lambda: process_monitor._iter_non_excluded(state), fresh_service)
+    record("_iter_non_excluded", "steady", lambda: process_monitor._iter_non_excluded(state))
+    exited: list[int] = []
+    record(
+        "_iter_non_excluded",
+        "churn-1%",
+        lambda: process_monitor.take_process_snapshot(state, exited),
+        lambda: exited.__setitem__(slice(None), table.churn(0.01)),
+    )
+
+    snapshot = process_monitor.take_process_snapshot(state)
+    record("get_current_game", "compile", lambda: process_monitor.compiled_matcher(state), lambda: _reset_matcher_cache(state))
+    assert process_monitor.get_current_game(state, snapshot) is None
+    record("get_current_game", "scan", lambda: process_monitor.get_current_game(state, snapshot), lambda: _reset_detection_caches(state))
+    record("get_current_game", "memoized", lambda: process_monitor.get_current_game(state, snapshot))
+
+    logger = process_monitor.logger
+    handler = _DiscardHandler()
+    saved = (logger.level, logger.propagate, logger.handlers[:])
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    try:
+        record("debug_all_processes", "debug-enabled", lambda: process_monitor.debug_all_processes(state))
+    finally:
+        logger.setLevel(saved[0])
+        logger.propagate = saved[1]
+        logger.handlers[:] = saved[2]
+    return results
+
+
+def compare(results: list[dict[str, Any]], baseline_path: str, tolerance: float) -> list[str]:
+    """Return a line per timing that regressed beyond *tolerance* times the baseline."""
+    with open(baseline_path, "r", encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    key = lambda r: (r["function"], r["variant"], r["processes"], r["mappings"])  # noqa: E731
+    before = {key(r): r["seconds_per_call"] for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = before.get(key(r))
+        if old and r["seconds_per_call"] > old * tolerance:
+            regressions.append(
+                f"{r['function']}[{r['variant']}] {r['processes']} procs / {r['mappings']} mappings: "
+                f"{old * 1e6:.2f}µs → {r['seconds_per_call'] * 1e6:.2f}µs"
+            )
+    return regressions
+
+
+def _sizes(text: str) -> list[int]:
+    return [int(part.replace("_", "")) for part in text.split(",") if part.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=_sizes, default=list(PROCESS_SIZES))
+    parser.add_argument("--mappings", type=_sizes, default=list(MAPPING_SIZES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timing round")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON output to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=2.0)
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    unexpected = AssertionError("psutil must not be used by the benchmark")
+    with mock.patch.object(psutil, "pids", side_effect=unexpected), \
+            mock.patch.object(psutil, "process_iter", side_effect=unexpected), \
+            mock.patch.object(psutil, "Process", side_effect=unexpected):
+        for n_procs in args.processes:
+            for n_mappings in args.mappings:
+                print(f"{n_procs:>6} processes × {n_mappings:>6} mappings …", file=sys.stderr)
+                results.extend(bench_case(n_procs, n_mappings, args.seed, args.min_time))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
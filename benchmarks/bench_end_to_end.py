@@ -0,0 +1,240 @@
+"""End-to-end latency from a game launch to the PATCH reaching Helix.
+
+Usage::
+
+    python -m benchmarks.bench_end_to_end [--switches 20] [--latency 0.05]
+        [--jitter 0.1] [--error-rate 0.1] [--burst 3] [--background 300]
+
+Runs the real pipeline – ``monitor_game_and_update_title`` →
+``UpdateOutbox`` → ``TwitchClient`` – against a fake process table (fed
+through a :class:`SyntheticProcessEventSource`) and the local
+:class:`FakeHelix` stand-in with the requested latency and faults.  Each
+switch stops the running game and launches the next one, then waits until
+the stand-in has applied the matching PATCH.
+
+The debouncer is set to commit immediately so the numbers measure the
+pipeline itself (``replay_switch_trace`` covers the debouncer).  Reported:
+
+* detection-to-PATCH latency (launch → PATCH applied) p50 / p95 / p99,
+* Helix requests per switch (retries included),
+* worst monitor stall: the longest launch → ``state.current_game`` lag,
+  which must stay below ``--stall-budget`` however slow or flaky the API is.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import math
+import sys
+import threading
+import time
+
+from app_state import AppState
+from benchmarks.fake_helix import FakeHelix
+from config_snapshot import ConfigSnapshot
+from process_events import EVENT_EXEC, EVENT_EXIT, ProcessEvent, SyntheticProcessEventSource
+from process_monitor import monitor_game_and_update_title
+from process_snapshot import ProcessSnapshotService
+from switch_policy import SwitchPolicy
+from twitch_client import TwitchClient
+from update_outbox import UpdateOutbox
+
+GAMES: dict[str, tuple[str, str]] = {
+    "valorant.exe": ("Valorant", "VALORANT"),
+    "r5apex.exe": ("Apex Legends", "Apex Legends"),
+    "javaw.exe": ("Minecraft", "Minecraft"),
+    "cs2.exe": ("Counter-Strike 2", "Counter-Strike"),
+    "escapefromtarkov.exe": ("Tarkov", "Escape from Tarkov"),
+}
+
+INSTANT_POLICY = SwitchPolicy(
+    stable_observations=1,
+    stable_seconds=0.0,
+    no_game_grace_seconds=0.0,
+    max_switches_per_minute=0,
+)
+
+
+class FakeProcessTable:
+    """PID table standing in for psutil; launches and exits emit events."""
+
+    def __init__(self, source: SyntheticProcessEventSource) -> None:
+        self._source = source
+        self._lock = threading.Lock()
+        self._procs: dict[int, tuple[str, float]] = {}
+        self._pids = itertools.count(1000)
+
+    def pids(self) -> list[int]:
+        with self._lock:
+            return list(self._procs)
+
+    def resolve(self, pid: int) -> tuple[str, float] | None:
+        with self._lock:
+            return self._procs.get(pid)
+
+    def spawn(self, name: str) -> int:
+        """Add a process without notifying (used for the background load)."""
+        pid = next(self._pids)
+        with self._lock:
+            self._procs[pid] = (name, time.time())
+        return pid
+
+    def switch(self, stop_pid: int | None, name: str) -> int:
+        """Exit *stop_pid* and launch *name* in one batch of events."""
+        with self._lock:
+            if stop_pid is not None:
+                self._procs.pop(stop_pid, None)
+        pid = self.spawn(name)
+        events = [ProcessEvent(EVENT_EXEC, pid)]
+        if stop_pid is not None:
+            events.insert(0, ProcessEvent(EVENT_EXIT, stop_pid))
+        self._source.push(events)
+        return pid
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _wait_for(predicate, timeout: float, step: float = 0.001) -> float | None:
+    """Poll *predicate*; return the ``perf_counter`` time it held, or ``None``."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return time.perf_counter()
+        time.sleep(step)
+    return None
+
+
+def run(args: argparse.Namespace) -> int:
+    source = SyntheticProcessEventSource()
+    table = FakeProcessTable(source)
+    for i in range(args.background):
+        table.spawn(f"service_{i}.exe")
+
+    state = AppState(
+        config=ConfigSnapshot.from_config({
+            "process_name": {game: exe for exe, (game, _) in GAMES.items()},
+            "TwitchCategoryName": {game: category for game, category in GAMES.values()},
+        }),
+        keep_last_when_no_game=True,
+        processes=ProcessSnapshotService(list_pids=table.pids, resolve=table.resolve),
+        switch_policy=INSTANT_POLICY,
+    )
+    with FakeHelix(rate_limit=args.bucket, refill_seconds=args.refill) as helix:
+        client = TwitchClient("client-id", "token", helix.channel["broadcaster_id"], api_base=helix.base_url)
+        outbox = UpdateOutbox(client)
+        outbox.start(state.twitch_categories.values())
+        # Let the channel sync and the game-id pre-warm finish fault-free.
+        _wait_for(lambda: helix.count("GET", "/games") >= 1, timeout=5.0)
+        time.sleep(0.1)
+        category_ids = {name: gid for gid, name in helix.games.values()}
+
+        helix.latency, helix.jitter, helix.error_rate = args.latency, args.jitter, args.error_rate
+        helix.reset_log()
+
+        stop = threading.Event()
+        monitor = threading.Thread(
+            target=monitor_game_and_update_title,
+            args=(state, outbox, source, stop),
+            name="monitor",
+            daemon=True,
+        )
+        monitor.start()
+
+        latencies: list[float] = []
+        stalls: list[float] = []
+        undelivered = 0
+        running: int | None = None
+        order = itertools.cycle(GAMES.items())
+        for i in range(args.switches):
+            exe, (game, category) = next(order)
+            if args.burst and i == args.switches // 2:
+                helix.inject(429, args.burst)
+            mark = len(helix.requests)
+            launched = time.perf_counter()
+            running = table.switch(running, exe)
+
+            detected = _wait_for(lambda: state.current_game == game, timeout=args.timeout)
+            stalls.append((detected if detected is not None else time.perf_counter()) - launched)
+
+            game_id = category_ids[category]
+
+            def patched() -> bool:
+                return any(
+                    r.method == "PATCH" and r.status == 204 and (r.body or {}).get("game_id") == game_id
+                    for r in helix.requests[mark:]
+                )
+
+            if _wait_for(patched, timeout=args.timeout, step=0.002) is None:
+                undelivered += 1
+                continue
+            applied = next(
+                r.timestamp
+                for r in helix.requests[mark:]
+                if r.method == "PATCH" and r.status == 204 and (r.body or {}).get("game_id") == game_id
+            )
+            latencies.append(applied - launched)
+
+        stop.set()
+        source.wake()
+        monitor.join(timeout=2.0)
+        outbox.stop()
+        requests = len(helix.requests)
+        statuses = helix.statuses()
+
+    latencies.sort()
+    worst_stall = max(stalls, default=0.0)
+    print(
+        f"{args.switches} switches, {args.background} background processes, "
+        f"API latency {args.latency * 1000:.0f}ms + <={args.jitter * 1000:.0f}ms jitter, "
+        f"error rate {args.error_rate:.0%}, 429 burst {args.burst}"
+    )
+    print(
+        "detection-to-PATCH: "
+        f"p50 {_percentile(latencies, 50) * 1000:7.1f}ms  "
+        f"p95 {_percentile(latencies, 95) * 1000:7.1f}ms  "
+        f"p99 {_percentile(latencies, 99) * 1000:7.1f}ms  "
+        f"({len(latencies)} delivered, {undelivered} undelivered)"
+    )
+    print(
+        f"requests per switch: {requests / max(1, args.switches):.2f} "
+        f"({statuses.count(204)} x 204, {sum(s >= 500 for s in statuses)} x 5xx, {statuses.count(429)} x 429)"
+    )
+    print(f"worst monitor stall: {worst_stall * 1000:.1f}ms (budget {args.stall_budget * 1000:.0f}ms)")
+
+    failed = False
+    if undelivered:
+        print(f"FAIL: {undelivered} switches never reached Helix", file=sys.stderr)
+        failed = True
+    if worst_stall > args.stall_budget:
+        print("FAIL: detection was held up by the Twitch API", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--switches", type=int, default=20)
+    parser.add_argument("--background", type=int, default=300, help="idle processes in the fake table")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every Helix request")
+    parser.add_argument("--jitter", type=float, default=0.1, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="fraction of requests answered with a 5xx")
+    parser.add_argument("--burst", type=int, default=3, help="429s injected halfway through (0 disables)")
+    parser.add_argument("--bucket", type=int, default=800)
+    parser.add_argument("--refill", type=float, default=60.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for each switch")
+    parser.add_argument("--stall-budget", type=float, default=1.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
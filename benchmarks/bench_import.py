@@ -0,0 +1,125 @@
+"""Bulk mapping import against the local Helix stand-in.
+
+Usage::
+
+    python -m benchmarks.bench_import [--entries 5000] [--categories 1500]
+        [--unknown 0.1] [--existing 200] [--latency 0.02] [--backend json]
+
+Writes a CSV of *entries* game → process → category rows (spread over
+*categories* distinct categories, a fraction *unknown* of which Twitch
+does not know, plus repeated rows) into a temporary config directory that
+already has *existing* of the games configured, then runs
+``mapping_import.import_mapping_file`` with ``TwitchClient.resolve_games``
+pointed at :class:`FakeHelix`.  Checks that
+
+* already configured games and repeats are skipped,
+* categories are looked up 100 names per ``GET /games``,
+* the unknown categories are reported,
+* everything lands in one journal entry / one transaction,
+
+and that the import finishes within ``--budget`` seconds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+
+from app_state import HELIX_GAMES_BATCH_SIZE, AppState
+from benchmarks.fake_helix import FakeHelix
+from config_journal import JOURNAL_FILENAME
+from config_store import (
+    CONFIG_FILENAME,
+    STORAGE_BACKEND_JSON,
+    apply_config_to_state,
+    flush_config,
+    load_config,
+)
+from mapping_import import import_mapping_file
+from twitch_client import TwitchClient
+
+
+def _write_fixture(base_dir: str, args: argparse.Namespace) -> tuple[str, dict[str, str], int]:
+    """Create config.json and the CSV; return the CSV path, the Twitch catalog and the repeat count."""
+    unknown = int(args.categories * args.unknown)
+    catalog = {f"Category {i}": str(100000 + i) for i in range(args.categories - unknown)}
+    names = list(catalog) + [f"Unknown Category {i}" for i in range(unknown)]
+    rows = [(f"Game {i}", f"game{i}.exe", names[i % len(names)].lower()) for i in range(args.entries)]
+    repeats = args.entries // 50
+    rows += rows[-repeats:]
+
+    config = {
+        "base": " %game%",
+        "storage": {"backend": args.backend},
+        "process_name": {game: proc for game, proc, _ in rows[: args.existing]},
+        "TwitchCategoryName": {},
+    }
+    with open(os.path.join(base_dir, CONFIG_FILENAME), "w", encoding="utf-8") as fh:
+        json.dump(config, fh)
+    path = os.path.join(base_dir, "library.csv")
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["game", "process", "category"])
+        writer.writerows(rows)
+    return path, catalog, repeats
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as base_dir:
+        path, catalog, repeats = _write_fixture(base_dir, args)
+        state = AppState()
+        apply_config_to_state(state, load_config(base_dir))
+        with FakeHelix(games=catalog, latency=args.latency) as helix:
+            client = TwitchClient("client-id", "token", helix.channel["broadcaster_id"], api_base=helix.base_url)
+            start = time.perf_counter()
+            report = import_mapping_file(base_dir, state, path, client.resolve_games)
+            elapsed = time.perf_counter() - start
+            lookups = helix.count("GET", "/games")
+        journal_entries = 0
+        journal_path = os.path.join(base_dir, JOURNAL_FILENAME)
+        if os.path.exists(journal_path):
+            with open(journal_path, "r", encoding="utf-8") as fh:
+                journal_entries = sum(1 for line in fh if line.strip())
+        flush_config(base_dir)
+
+        print(f"{args.entries} rows ({repeats} repeated), {args.existing} already configured, backend {args.backend}")
+        print(report.summary())
+        print(f"import: {elapsed:.2f}s (budget {args.budget:.0f}s), {lookups} x GET /games, {journal_entries} journal entries")
+
+        unknown = int(args.categories * args.unknown)
+        checks = {
+            "added": report.added == args.entries - args.existing,
+            "existing": report.existing == args.existing,
+            "duplicates": report.duplicates == repeats,
+            "unresolved": len(report.unresolved) == unknown,
+            "batched lookups": lookups == math.ceil(args.categories / HELIX_GAMES_BATCH_SIZE),
+            "single write": journal_entries == (1 if args.backend == STORAGE_BACKEND_JSON else 0),
+            "canonical names": state.twitch_categories.get(f"Game {args.existing}") == f"Category {args.existing}",
+            "budget": elapsed <= args.budget,
+        }
+        failed = [name for name, ok in checks.items() if not ok]
+        if failed:
+            print(f"FAILED: {', '.join(failed)}")
+        return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=1500)
+    parser.add_argument("--unknown", type=float, default=0.1, help="fraction of categories Twitch does not know")
+    parser.add_argument("--existing", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per Helix request")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--budget", type=float, default=5.0)
+    return run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
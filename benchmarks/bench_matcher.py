@@ -0,0 +1,92 @@
+"""Benchmark: compiled GameMatcher vs. the original nested matching loop.
+
+Usage::
+
+    python -m benchmarks.bench_matcher [--processes 300] [--repeat 20]
+
+Prints, for 100 / 1,000 / 10,000 mappings, the per-scan time of the
+original ``for proc in procs: for game in mappings`` loop next to the
+compile time and per-scan time of :class:`game_matcher.GameMatcher`.
+Both are measured on a miss (no game running), which is the common case
+and the worst case for the nested loop.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Mapping, Sequence
+
+from game_matcher import GameMatcher
+
+MAPPING_SIZES: tuple[int, ...] = (100, 1_000, 10_000)
+
+
+def _nested_loop(process_names: Sequence[str], mappings: Mapping[str, str]) -> str | None:
+    """The pre-matcher algorithm from ``process_monitor.get_current_game``."""
+    for proc_name in process_names:
+        for game, expected in mappings.items():
+            if not expected:
+                continue
+            a = proc_name.lower()
+            e = expected.lower()
+            if a == e or e in a:
+                return game
+    return None
+
+
+def _synthetic_mappings(count: int, rng: random.Random) -> dict[str, str]:
+    suffixes = ("-Win64-Shipping.exe", ".exe", "_dx12.exe", "Game.exe")
+    return {
+        f"Game {i:05d}": f"Title{i:05d}{rng.choice(suffixes)}"
+        for i in range(count)
+    }
+
+
+def _synthetic_processes(count: int, rng: random.Random) -> list[str]:
+    stems = ("svc", "helper", "updater", "agent", "host", "broker", "daemon")
+    return sorted(
+        {f"{rng.choice(stems)}{rng.randrange(100_000):05d}.exe" for _ in range(count)},
+        key=str.lower,
+    )
+
+
+def _time_per_call(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    procs = _synthetic_processes(args.processes, rng)
+    print(f"{len(procs)} processes, {args.repeat} repeats per measurement\n")
+    print(f"{'mappings':>9} | {'nested loop':>12} | {'compile':>10} | {'matcher':>10} | {'speed-up':>8}")
+    print("-" * 62)
+    for size in MAPPING_SIZES:
+        mappings = _synthetic_mappings(size, rng)
+        repeat = max(1, args.repeat * 100 // size)
+        nested = _time_per_call(lambda: _nested_loop(procs, mappings), repeat)
+
+        start = time.perf_counter()
+        matcher = GameMatcher(mappings)
+        compile_s = time.perf_counter() - start
+        compiled = _time_per_call(lambda: matcher.best(procs), args.repeat)
+
+        assert _nested_loop(procs, mappings) is None and matcher.best(procs) is None
+        print(
+            f"{size:>9,} | {nested * 1e3:>9.2f} ms | {compile_s * 1e3:>7.2f} ms"
+            f" | {compiled * 1e3:>7.3f} ms | {nested / compiled:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
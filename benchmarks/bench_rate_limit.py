@@ -0,0 +1,99 @@
+"""Exercise ``TwitchClient`` rate-limit pacing against the local Helix stand-in.
+
+Usage::
+
+    python -m benchmarks.bench_rate_limit [--bucket 10] [--refill 2]
+
+Scenarios (the stand-in runs a *bucket*-point bucket refilled every
+*refill* seconds):
+
+* ``sequential`` – more PATCHes than the bucket holds, one after another;
+  the client should wait for the reset rather than collect 429s.
+* ``superseded`` – several threads PATCH while the bucket is empty; only
+  the newest request should reach the server.
+* ``burst`` – the server answers a 429 burst; the client retries once the
+  reported reset has passed and succeeds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import threading
+import time
+
+from benchmarks.fake_helix import FakeHelix
+from twitch_client import TwitchClient
+
+
+def _client(helix: FakeHelix) -> TwitchClient:
+    return TwitchClient("client-id", "token", helix.channel["broadcaster_id"], api_base=helix.base_url)
+
+
+def sequential(bucket: int, refill: float) -> bool:
+    with FakeHelix(rate_limit=bucket, refill_seconds=refill) as helix:
+        client = _client(helix)
+        total = bucket * 2 + 2
+        start = time.perf_counter()
+        for i in range(total):
+            client.update_channel(title=f"title {i}")
+        elapsed = time.perf_counter() - start
+        statuses = helix.statuses("PATCH")
+        n429 = statuses.count(429)
+        print(
+            f"sequential: {total} PATCHes in {elapsed:.2f}s, {len(statuses)} sent, "
+            f"{n429} x 429, budget left {client.rate_limit_remaining}"
+        )
+        # Only the very first 429 (before the first headers) is acceptable.
+        return n429 <= 1 and helix.channel["title"] == f"title {total - 1}"
+
+
+def superseded(bucket: int, refill: float) -> bool:
+    with FakeHelix(rate_limit=bucket, refill_seconds=refill) as helix:
+        client = _client(helix)
+        for i in range(bucket):  # drain the bucket
+            client.update_channel(title=f"drain {i}")
+        helix.reset_log()
+
+        threads = []
+        for i in range(5):
+            t = threading.Thread(target=client.update_channel, kwargs={"title": f"queued {i}"})
+            t.start()
+            threads.append(t)
+            time.sleep(0.05)
+        for t in threads:
+            t.join()
+        sent = [r.body.get("title") for r in helix.requests if r.method == "PATCH" and r.status == 204]
+        print(f"superseded: 5 queued PATCHes, delivered {sent}")
+        return sent == ["queued 4"]
+
+
+def burst(bucket: int, refill: float) -> bool:
+    with FakeHelix(rate_limit=bucket, refill_seconds=refill) as helix:
+        client = _client(helix)
+        helix.inject(429, 2)
+        start = time.perf_counter()
+        ok = client.update_channel(title="after burst")
+        elapsed = time.perf_counter() - start
+        print(f"burst: 2 x 429 injected, success={ok} after {elapsed:.2f}s, statuses {helix.statuses()}")
+        return ok and helix.channel["title"] == "after burst"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bucket", type=int, default=10)
+    parser.add_argument("--refill", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    results = {fn.__name__: fn(args.bucket, args.refill) for fn in (sequential, superseded, burst)}
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        print(f"FAIL: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
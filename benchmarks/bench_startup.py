@@ -0,0 +1,108 @@
+"""Startup budget: import cost of ``main`` and time to the first detection.
+
+Usage::
+
+    python -m benchmarks.bench_startup [--runs 5] [--import-budget-ms 120]
+        [--first-scan-budget-ms 500]
+
+Each run starts a fresh interpreter.  ``python -X importtime -c "import
+main"`` gives the cumulative import time of the entry point and the set of
+modules it pulls in; a second child imports ``main`` and performs one real
+process scan + detection, which approximates time-to-first-detection
+without the GUI or network.  Medians are compared with the budgets, and
+the run fails (exit status 1) if a budget is exceeded or a module that must
+stay lazy (:data:`LAZY_MODULES`) is imported eagerly again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use only: HTTP stack (outbox thread), file watcher, GUI,
+# and the opt-in metrics endpoint (http.server).
+LAZY_MODULES: tuple[str, ...] = ("requests", "urllib3", "charset_normalizer", "watchdog", "tkinter", "ui", "http")
+
+_FIRST_SCAN_SCRIPT = """
+import time
+t0 = time.perf_counter()
+import main
+from app_state import AppState
+from process_monitor import get_current_game
+get_current_game(AppState())
+print((time.perf_counter() - t0) * 1000.0)
+"""
+
+
+def _child(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure_imports() -> tuple[float, set[str]]:
+    """Return ``(cumulative ms for import main, top-level modules imported)``."""
+    proc = _child("-X", "importtime", "-c", "import main")
+    total_us = 0
+    modules: set[str] = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split(":", 1)[1].split("|"))
+        if not cumulative.isdigit():
+            continue  # header line
+        modules.add(name.split(".")[0])
+        if name == "main":
+            total_us = int(cumulative)
+    return total_us / 1000.0, modules
+
+
+def measure_first_scan() -> float:
+    """Milliseconds from the first import to a finished detection pass."""
+    return float(_child("-c", _FIRST_SCAN_SCRIPT).stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=120.0)
+    parser.add_argument("--first-scan-budget-ms", type=float, default=500.0)
+    args = parser.parse_args()
+
+    import_ms: list[float] = []
+    scan_ms: list[float] = []
+    eager: set[str] = set()
+    for _ in range(args.runs):
+        ms, modules = measure_imports()
+        import_ms.append(ms)
+        eager |= modules.intersection(LAZY_MODULES)
+        scan_ms.append(measure_first_scan())
+
+    import_median = statistics.median(import_ms)
+    scan_median = statistics.median(scan_ms)
+    print(f"import main:          median {import_median:7.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    print(f"time to first scan:   median {scan_median:7.1f} ms (budget {args.first_scan_budget_ms:.0f} ms)")
+
+    failures = []
+    if eager:
+        failures.append(f"imported eagerly: {', '.join(sorted(eager))}")
+    if import_median > args.import_budget_ms:
+        failures.append("import budget exceeded")
+    if scan_median > args.first_scan_budget_ms:
+        failures.append("first-scan budget exceeded")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
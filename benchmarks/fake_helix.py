@@ -0,0 +1,268 @@
+"""Local stand-in for the Twitch Helix endpoints used by ``TwitchClient``.
+
+Serves ``GET /helix/games``, ``GET /helix/channels`` and
+``PATCH /helix/channels`` from memory and records every request, so the
+client can be exercised (and its round trips counted) without touching
+the real API.  Optionally it runs a Helix-style rate-limit bucket (with
+``Ratelimit-*`` headers and 429s), can be told to fail the next requests
+with a given status, and can simulate a slow or flaky API with a per-request
+*latency* (plus random *jitter*) and a random 5xx *error_rate*::
+
+    with FakeHelix() as helix:
+        client = TwitchClient("id", "token", "1234", api_base=helix.base_url)
+        client.update_channel(title="Hello", category="VALORANT")
+        assert helix.count("PATCH", "/channels") == 1
+
+Run ``python -m benchmarks.fake_helix`` to keep one running in the
+foreground.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Mapping
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_GAMES: dict[str, str] = {
+    "Just Chatting": "509658",
+    "VALORANT": "516575",
+    "Apex Legends": "511224",
+    "Escape from Tarkov": "491931",
+    "Counter-Strike": "32399",
+    "Minecraft": "27471",
+}
+
+
+@dataclass(frozen=True)
+class HelixRequest:
+    """One request as seen by the stand-in."""
+
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    body: dict[str, Any] | None
+    timestamp: float = field(default_factory=time.perf_counter)
+    status: int = 0
+
+
+class FakeHelix:
+    """In-memory Helix server bound to an ephemeral localhost port."""
+
+    def __init__(
+        self,
+        games: Mapping[str, str] | None = None,
+        broadcaster_id: str = "1234",
+        title: str = "",
+        game_name: str = "",
+        port: int = 0,
+        rate_limit: int | None = None,
+        refill_seconds: float = 60.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        catalog = DEFAULT_GAMES if games is None else games
+        self.games: dict[str, tuple[str, str]] = {n.lower(): (gid, n) for n, gid in catalog.items()}
+        gid, name = self.games.get(game_name.lower(), ("", ""))
+        self.channel: dict[str, str] = {
+            "broadcaster_id": broadcaster_id,
+            "title": title,
+            "game_id": gid,
+            "game_name": name,
+        }
+        self.requests: list[HelixRequest] = []
+        self.rate_limit = rate_limit
+        self.refill_seconds = refill_seconds
+        self._points = rate_limit or 0
+        self._bucket_reset = time.monotonic() + refill_seconds
+        self._injected: deque[int] = deque()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/helix"
+
+    def start(self) -> FakeHelix:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def __enter__(self) -> FakeHelix:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    def count(self, method: str | None = None, path: str | None = None) -> int:
+        """Number of recorded requests matching *method* and/or *path*."""
+        with self._lock:
+            return sum(
+                1
+                for r in self.requests
+                if (method is None or r.method == method) and (path is None or r.path == path)
+            )
+
+    def statuses(self, method: str | None = None, path: str | None = None) -> list[int]:
+        """Response statuses of the recorded requests matching *method* / *path*."""
+        with self._lock:
+            return [
+                r.status
+                for r in self.requests
+                if (method is None or r.method == method) and (path is None or r.path == path)
+            ]
+
+    def reset_log(self) -> None:
+        with self._lock:
+            self.requests.clear()
+
+    def inject(self, status: int, count: int = 1) -> None:
+        """Answer the next *count* requests with *status* (e.g. a 429 burst)."""
+        with self._lock:
+            self._injected.extend([status] * count)
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def handle(self, req: HelixRequest) -> tuple[int, dict[str, str], dict[str, Any] | None]:
+        """Return ``(status, headers, json_body)`` for *req* and record it.
+
+        The simulated latency elapses before the request takes effect; the
+        recorded timestamp is the moment it did.
+        """
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            status, headers, body = self._respond(req)
+            self.requests.append(replace(req, timestamp=time.perf_counter(), status=status))
+        return status, headers, body
+
+    def _rate_limit_headers(self) -> tuple[bool, dict[str, str]]:
+        """Spend one bucket point; return ``(allowed, Ratelimit-* headers)``."""
+        if self.rate_limit is None:
+            return True, {}
+        now = time.monotonic()
+        if now >= self._bucket_reset:
+            self._points = self.rate_limit
+            self._bucket_reset = now + self.refill_seconds
+        allowed = self._points > 0
+        if allowed:
+            self._points -= 1
+        reset_epoch = math.ceil(time.time() + (self._bucket_reset - now))
+        return allowed, {
+            "Ratelimit-Limit": str(self.rate_limit),
+            "Ratelimit-Remaining": str(self._points),
+            "Ratelimit-Reset": str(reset_epoch),
+        }
+
+    def _respond(self, req: HelixRequest) -> tuple[int, dict[str, str], dict[str, Any] | None]:
+        allowed, rl_headers = self._rate_limit_headers()
+        if not allowed:
+            return 429, rl_headers, {"error": "Too Many Requests", "status": 429}
+        if self._injected:
+            status = self._injected.popleft()
+            return status, rl_headers, {"error": "Injected", "status": status}
+        if self.error_rate and self._rng.random() < self.error_rate:
+            status = self._rng.choice((500, 502, 503))
+            return status, rl_headers, {"error": "Simulated failure", "status": status}
+        status, headers, body = self._route(req)
+        return status, {**rl_headers, **headers}, body
+
+    def _route(self, req: HelixRequest) -> tuple[int, dict[str, str], dict[str, Any] | None]:
+        if req.method == "GET" and req.path == "/games":
+            names = req.query.get("name", [])
+            if len(names) > 100:
+                return 400, {}, {"error": "Bad Request", "message": "too many name parameters"}
+            found = [self.games.get(n.lower()) for n in names]
+            data = [{"id": gid, "name": name} for gid, name in filter(None, found)]
+            return 200, {}, {"data": data}
+        if req.path == "/channels":
+            if req.query.get("broadcaster_id", [""])[0] != self.channel["broadcaster_id"]:
+                return 400, {}, {"error": "Bad Request", "message": "unknown broadcaster_id"}
+            if req.method == "GET":
+                return 200, {}, {"data": [dict(self.channel)]}
+            if req.method == "PATCH":
+                body = req.body or {}
+                if "title" in body:
+                    self.channel["title"] = body["title"]
+                if "game_id" in body:
+                    by_id = {gid: name for gid, name in self.games.values()}
+                    self.channel["game_id"] = body["game_id"]
+                    self.channel["game_name"] = by_id.get(body["game_id"], "")
+                return 204, {}, None
+        return 404, {}, {"error": "Not Found"}
+
+
+def _make_handler(helix: FakeHelix) -> type[BaseHTTPRequestHandler]:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self) -> None:
+            url = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            req = HelixRequest(
+                method=self.command,
+                path=url.path.removeprefix("/helix"),
+                query=parse_qs(url.query),
+                body=json.loads(raw) if raw else None,
+            )
+            status, headers, body = helix.handle(req)
+            payload = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if payload:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_PATCH = _dispatch
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return _Handler
+
+
+if __name__ == "__main__":
+    server = FakeHelix(port=8765).start()
+    print(f"Fake Helix listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,116 @@
+"""Replay a detection trace through the switch debouncer.
+
+Usage::
+
+    python -m benchmarks.replay_switch_trace [--trace trace.json] [--keep-last]
+
+A trace is a JSON list of ``[seconds, game_or_null]`` observations, i.e.
+what ``get_current_game`` returned at each scan.  The replay mirrors the
+monitor loop: besides the traced scans it re-observes whenever the
+debouncer asks for a re-check.  It prints the Twitch updates the monitor
+would send without and with the debouncer; the built-in trace (a noisy
+game launch) must produce exactly one debounced update.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Sequence
+
+from app_state import FALLBACK_CATEGORY
+from switch_policy import GameSwitchDebouncer, SwitchPolicy
+
+# A game launch: the launcher's helper flickers while anti-cheat restarts
+# the game, then a steady session with one short relaunch gap.
+NOISY_LAUNCH: list[tuple[float, str | None]] = [
+    (0.0, "Valorant"),
+    (0.6, None),
+    (1.1, "Valorant"),
+    (1.4, None),
+    (2.0, "Valorant"),
+    (2.3, "Valorant"),
+    (20.0, None),
+    (24.5, "Valorant"),
+    (30.0, "Valorant"),
+    (60.0, "Valorant"),
+    (90.0, "Valorant"),
+]
+
+
+def _target(game: str | None, keep_last: bool, decided: bool = True) -> str | None:
+    if game is not None:
+        return game
+    return None if keep_last or not decided else FALLBACK_CATEGORY
+
+
+def replay_naive(trace: Sequence[tuple[float, str | None]], keep_last: bool) -> list[tuple[float, str]]:
+    """Updates sent when every detection change is pushed straight away."""
+    updates: list[tuple[float, str]] = []
+    last: str | None = None
+    for t, game in trace:
+        target = _target(game, keep_last)
+        if target is not None and target != last:
+            last = target
+            updates.append((t, target))
+    return updates
+
+
+def replay_debounced(
+    trace: Sequence[tuple[float, str | None]],
+    keep_last: bool,
+    policy: SwitchPolicy | None = None,
+) -> list[tuple[float, str]]:
+    """Updates sent with the debouncer between detection and Twitch."""
+    debouncer = GameSwitchDebouncer(policy)
+    updates: list[tuple[float, str]] = []
+    last: str | None = None
+
+    def observe(t: float, game: str | None) -> None:
+        nonlocal last
+        debouncer.observe(game, t)
+        target = _target(debouncer.committed, keep_last, debouncer.decided)
+        if target is not None and target != last:
+            last = target
+            updates.append((t, target))
+
+    for i, (t, game) in enumerate(trace):
+        observe(t, game)
+        next_t = trace[i + 1][0] if i + 1 < len(trace) else float("inf")
+        while (due := debouncer.seconds_until_due(t)) is not None and t + due < next_t:
+            t += due
+            observe(t, game)
+    return updates
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="JSON file with [seconds, game_or_null] pairs")
+    parser.add_argument("--keep-last", action="store_true", help="keep the last title when no game is detected")
+    args = parser.parse_args()
+
+    if args.trace:
+        with open(args.trace, "r", encoding="utf-8") as fh:
+            trace = [(float(t), g) for t, g in json.load(fh)]
+    else:
+        trace = NOISY_LAUNCH
+
+    naive = replay_naive(trace, args.keep_last)
+    debounced = replay_debounced(trace, args.keep_last)
+    print(f"{len(trace)} observations over {trace[-1][0] - trace[0][0]:.1f}s")
+    print(f"without debounce: {len(naive)} updates")
+    for t, game in naive:
+        print(f"  t={t:6.1f}s  -> {game}")
+    print(f"with debounce:    {len(debounced)} updates")
+    for t, game in debounced:
+        print(f"  t={t:6.1f}s  -> {game}")
+
+    if not args.trace and len(debounced) != 1:
+        print("FAIL: the noisy launch trace should produce exactly one update", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,12 +7,8 @@ import json
 import logging
 import os
 import sys
-import tkinter as tk
-from tkinter import messagebox, simpledialog
 from typing import Any
 
-import requests
-
 logger = logging.getLogger(__name__)
 
 DEFAULT_CONFIG_URL: str = (
@@ -21,6 +17,13 @@ DEFAULT_CONFIG_URL: str = (
 )
 REQUEST_TIMEOUT: int = 10
 
+# Environment variables that override the matching config.ini keys.
+CREDENTIAL_ENV_VARS: dict[str, str] = {
+    "client_id": "TWITCH_CLIENT_ID",
+    "access_token": "TWITCH_ACCESS_TOKEN",
+    "streamer_id": "TWITCH_STREAMER_ID",
+}
+
 DEFAULT_EXCLUSIONS: dict[str, list[str]] = {
     "exclude_process_names": [
         "System",
@@ -50,17 +53,32 @@ def get_base_dir() -> str:
 # File bootstrapping
 # ---------------------------------------------------------------------------
 
-def ensure_required_files(base_dir: str) -> None:
-    """Create config.ini / config.json / excluded_processes.json if missing."""
-    _ensure_config_ini(base_dir)
+def ensure_required_files(base_dir: str, interactive: bool = True) -> None:
+    """Create config.ini / config.json / excluded_processes.json if missing.
+
+    With *interactive* ``False`` (headless mode) no dialogs are shown: a
+    missing config.ini is fine when the credentials come from the
+    environment, and fatal otherwise.
+    """
+    _ensure_config_ini(base_dir, interactive)
     _ensure_config_json(base_dir)
     _ensure_excluded_json(base_dir)
 
 
-def _ensure_config_ini(base_dir: str) -> None:
+def _ensure_config_ini(base_dir: str, interactive: bool = True) -> None:
     path = os.path.join(base_dir, "config.ini")
-    if os.path.exists(path):
+    if os.path.exists(path) or all(os.environ.get(var) for var in CREDENTIAL_ENV_VARS.values()):
         return
+    if not interactive:
+        logger.error(
+            "config.ini not found and %s not set – cannot start headless",
+            "/".join(CREDENTIAL_ENV_VARS.values()),
+        )
+        sys.exit(1)
+
+    # Only the first-run prompt needs Tk; headless mode never imports it.
+    import tkinter as tk
+    from tkinter import messagebox, simpledialog
 
     logger.info("config.ini not found – prompting for credentials…")
     root_tmp = tk.Tk()
@@ -102,6 +120,8 @@ def _ensure_config_json(base_dir: str) -> None:
         return
 
     logger.info("config.json not found – downloading default…")
+    import requests
+
     try:
         resp = requests.get(DEFAULT_CONFIG_URL, timeout=REQUEST_TIMEOUT)
         resp.raise_for_status()
@@ -128,11 +148,14 @@ def _ensure_excluded_json(base_dir: str) -> None:
 # ---------------------------------------------------------------------------
 
 def load_credentials(base_dir: str) -> dict[str, str]:
-    """Read Twitch credentials from config.ini."""
+    """Read Twitch credentials from config.ini, overridden by ``TWITCH_*`` env vars."""
     auth = configparser.ConfigParser()
     auth.read(os.path.join(base_dir, "config.ini"))
-    return {
-        "client_id": auth.get("Twitch", "client_id"),
-        "access_token": auth.get("Twitch", "access_token"),
-        "streamer_id": auth.get("Twitch", "streamer_id"),
+    creds = {
+        key: os.environ.get(var) or auth.get("Twitch", key, fallback="")
+        for key, var in CREDENTIAL_ENV_VARS.items()
     }
+    missing = [key for key, value in creds.items() if not value]
+    if missing:
+        raise ValueError(f"Missing Twitch credentials: {', '.join(missing)}")
+    return creds
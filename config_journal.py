@@ -0,0 +1,236 @@
+"""Write-behind journal for config.json edits.
+
+Rewriting (and fsyncing) the whole config.json for every edit makes bulk
+edits quadratic in I/O.  Instead each edit – a *transaction* of one or more
+operations – is appended as a single JSON line to ``config.journal`` and
+applied to an in-memory copy of the config.  The copy is *compacted* into
+config.json (atomically) a few seconds after the first pending edit, when
+the journal grows long, and at shutdown; the journal is then truncated.
+
+After a crash, :meth:`ConfigJournal.load` replays the journal on top of
+config.json and compacts the result straight away.  Operations are idempotent, so replaying edits that were
+already compacted is harmless, and a torn last line is ignored.
+
+Operations::
+
+    {"op": "map", "game": ..., "process": ..., "category": ... | null}
+    {"op": "unmap", "game": ...}
+    {"op": "set", "key": ..., "value": ...}
+    {"op": "unset", "key": ...}
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Iterable
+
+from config_snapshot import CATEGORIES_KEY, MAPPINGS_KEY
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME: str = "config.journal"
+CONFIG_COMPACT_DELAY_SEC: float = 5.0
+CONFIG_JOURNAL_MAX_ENTRIES: int = 500
+
+Op = dict[str, Any]
+
+_MISSING = object()
+
+
+def map_op(game: str, process: str, category: str | None = None) -> Op:
+    return {"op": "map", "game": game, "process": process, "category": category}
+
+
+def unmap_op(game: str) -> Op:
+    return {"op": "unmap", "game": game}
+
+
+def set_op(key: str, value: Any) -> Op:
+    return {"op": "set", "key": key, "value": value}
+
+
+def unset_op(key: str) -> Op:
+    return {"op": "unset", "key": key}
+
+
+def apply_ops(config: dict[str, Any], ops: Iterable[Op]) -> int:
+    """Apply *ops* to *config* in place; return how many changed something."""
+    changed = 0
+    for op in ops:
+        kind = op.get("op")
+        if kind == "map":
+            game, process, category = op["game"], op["process"], op.get("category")
+            mappings = config.setdefault(MAPPINGS_KEY, {})
+            categories = config.setdefault(CATEGORIES_KEY, {})
+            if mappings.get(game) != process or (category and categories.get(game) != category):
+                mappings[game] = process
+                if category:
+                    categories[game] = category
+                changed += 1
+        elif kind == "unmap":
+            game = op["game"]
+            found = config.get(MAPPINGS_KEY, {}).pop(game, None) is not None
+            found = config.get(CATEGORIES_KEY, {}).pop(game, None) is not None or found
+            changed += found
+        elif kind == "set":
+            if op["key"] not in config or config[op["key"]] != op["value"]:
+                config[op["key"]] = op["value"]
+                changed += 1
+        elif kind == "unset":
+            changed += config.pop(op["key"], _MISSING) is not _MISSING
+        else:
+            logger.warning("Ignoring unknown journal operation %r", kind)
+    return changed
+
+
+class ConfigJournal:
+    """Journal + in-memory copy of one config.json.
+
+    *read_config* / *write_config* load and atomically replace config.json
+    (``config_store`` passes its JSON helpers, so the config watcher still
+    recognises the compacted file as the app's own write); *write_config*
+    must raise on failure so the journal is only truncated after a good
+    write.  The files are read on first use.
+    """
+
+    def __init__(
+        self,
+        journal_path: str,
+        read_config: Callable[[], dict[str, Any]],
+        write_config: Callable[[dict[str, Any]], None],
+        compact_delay: float = CONFIG_COMPACT_DELAY_SEC,
+        max_entries: int = CONFIG_JOURNAL_MAX_ENTRIES,
+    ) -> None:
+        self.path = journal_path
+        self._read_config = read_config
+        self._write_config = write_config
+        self._compact_delay = compact_delay
+        self._max_entries = max_entries
+        self._lock = threading.RLock()
+        self._config: dict[str, Any] | None = None
+        self._pending: list[list[Op]] = []
+        self._timer: threading.Timer | None = None
+
+    @property
+    def pending(self) -> int:
+        """Transactions not yet compacted into config.json."""
+        with self._lock:
+            return len(self._pending)
+
+    def load(self) -> dict[str, Any]:
+        """Read config.json, replay the journal on top, and return a copy."""
+        with self._lock:
+            self._config = self._read_config()
+            self._pending = self._read_journal()
+            for ops in self._pending:
+                apply_ops(self._config, ops)
+            if self._pending:
+                logger.info("Recovered %d journaled config edits", len(self._pending))
+            # Fold recovered edits in right away: new appends must not land
+            # on the same line as a torn entry.
+            if self._pending:
+                self.compact()
+            elif os.path.exists(self.path) and os.path.getsize(self.path):
+                self._truncate()
+            return copy.deepcopy(self._config)
+
+    def rebase(self, config: dict[str, Any]) -> dict[str, Any]:
+        """Adopt an externally edited config.json, keeping edits not yet compacted."""
+        with self._lock:
+            self._ensure_loaded()
+            self._config = copy.deepcopy(config)
+            for ops in self._pending:
+                apply_ops(self._config, ops)
+            return copy.deepcopy(self._config)
+
+    def commit(self, ops: list[Op]) -> bool:
+        """Durably journal one transaction and apply it; ``False`` if it was a no-op.
+
+        Raises if the transaction could not be written anywhere; the
+        in-memory copy then stays what is on disk.
+        """
+        with self._lock:
+            config = self._ensure_loaded()
+            if not apply_ops(config, ops):
+                return False
+            self._pending.append(ops)
+            line = json.dumps({"ops": ops}, ensure_ascii=False, separators=(",", ":"))
+            try:
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    fh.write(line + "\n")
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            except OSError:
+                logger.exception("Could not append to %s – writing config.json directly", self.path)
+                try:
+                    self.compact()
+                except Exception:
+                    # Neither write reached disk: forget the edit, and re-read
+                    # config.json plus the journal on next use.
+                    self._pending.pop()
+                    self._config = None
+                    raise
+                return True
+            if len(self._pending) >= self._max_entries:
+                self.compact()
+            else:
+                self._schedule_compaction()
+            return True
+
+    def compact(self) -> None:
+        """Write the in-memory config to config.json and truncate the journal."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending or self._config is None:
+                return
+            self._write_config(copy.deepcopy(self._config))
+            self._truncate()
+            logger.debug("Compacted %d journaled config edits", len(self._pending))
+            self._pending = []
+
+    def _truncate(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as fh:
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _ensure_loaded(self) -> dict[str, Any]:
+        if self._config is None:
+            self.load()
+        assert self._config is not None
+        return self._config
+
+    def _schedule_compaction(self) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(self._compact_delay, self._compact_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception:
+            logger.exception("Config compaction failed – edits stay in %s", self.path)
+
+    def _read_journal(self) -> list[list[Op]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                lines = fh.read().splitlines()
+        except FileNotFoundError:
+            return []
+        transactions: list[list[Op]] = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                transactions.append(list(json.loads(line)["ops"]))
+            except (ValueError, KeyError, TypeError):
+                # A crash mid-append leaves a torn final line; that edit is lost.
+                logger.warning("Skipping unreadable line %d of %s", number, self.path)
+        return transactions
+
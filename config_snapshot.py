@@ -0,0 +1,100 @@
+"""Immutable, versioned view of config.json.
+
+Writers (the UI, the config watcher) never edit the mappings in place:
+they build a new :class:`ConfigSnapshot` and publish it with a single
+reference assignment (:meth:`app_state.AppState.publish_config`).  Readers
+take ``state.config`` once and use that object for the whole operation,
+without locks, so a concurrent edit can never change a dict underneath
+them.  Structures derived from a snapshot (the compiled matcher, indexes)
+are cached on the snapshot itself and die with it.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, TypeVar
+
+T = TypeVar("T")
+
+MAPPINGS_KEY: str = "process_name"
+CATEGORIES_KEY: str = "TwitchCategoryName"
+
+
+def _empty() -> Mapping[str, Any]:
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True, eq=False)
+class ConfigSnapshot:
+    """One published version of the configuration (never mutated)."""
+
+    version: int = 0
+    raw: Mapping[str, Any] = field(default_factory=_empty)
+    base_template: str = ""
+    process_names: Mapping[str, str] = field(default_factory=_empty)
+    twitch_categories: Mapping[str, str] = field(default_factory=_empty)
+    _derived: dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+    _derived_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any], base_template: str = "", version: int = 0) -> ConfigSnapshot:
+        """Freeze a config.json dictionary (*base_template* is the fallback for ``base``)."""
+        process_names = MappingProxyType(dict(config.get(MAPPINGS_KEY) or {}))
+        categories = MappingProxyType(dict(config.get(CATEGORIES_KEY) or {}))
+        raw = dict(config)
+        raw[MAPPINGS_KEY] = process_names
+        raw[CATEGORIES_KEY] = categories
+        return cls(
+            version=version,
+            raw=MappingProxyType(raw),
+            base_template=config.get("base", base_template),
+            process_names=process_names,
+            twitch_categories=categories,
+        )
+
+    def with_mappings(
+        self,
+        upserts: Mapping[str, tuple[str, str | None]] | None = None,
+        removals: Iterable[str] = (),
+    ) -> ConfigSnapshot:
+        """Return a copy with ``{game: (process, category)}`` set and *removals* dropped.
+
+        A ``None`` category leaves the game's existing category untouched.
+        """
+        process_names = dict(self.process_names)
+        categories = dict(self.twitch_categories)
+        for game in removals:
+            process_names.pop(game, None)
+            categories.pop(game, None)
+        for game, (process, category) in (upserts or {}).items():
+            process_names[game] = process
+            if category:
+                categories[game] = category
+        return self.with_values({MAPPINGS_KEY: process_names, CATEGORIES_KEY: categories})
+
+    def with_values(self, values: Mapping[str, Any]) -> ConfigSnapshot:
+        """Return a copy with top-level config keys replaced by *values*."""
+        raw = dict(self.raw)
+        raw.update(values)
+        return ConfigSnapshot.from_config(raw, self.base_template, self.version)
+
+    def with_version(self, version: int) -> ConfigSnapshot:
+        return dataclasses.replace(self, version=version)
+
+    def to_dict(self) -> dict[str, Any]:
+        """A plain, JSON-serialisable copy of the config."""
+        return {k: dict(v) if isinstance(v, MappingProxyType) else v for k, v in self.raw.items()}
+
+    def derived(self, key: str, build: Callable[[ConfigSnapshot], T]) -> T:
+        """Return ``build(self)``, computed once per snapshot and cached under *key*."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = build(self)
+            return self._derived[key]
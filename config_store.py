@@ -2,18 +2,46 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
 import tempfile
-from typing import Any
+import threading
+from typing import TYPE_CHECKING, Any, Iterable
 
 from app_state import AppState
+from config_journal import JOURNAL_FILENAME, ConfigJournal, Op, map_op, set_op, unmap_op, unset_op
+from config_snapshot import CATEGORIES_KEY, MAPPINGS_KEY, ConfigSnapshot
+from exclusion_filter import ExclusionFilter
+from poll_scheduler import PollPolicy
+from switch_policy import SwitchPolicy
+
+if TYPE_CHECKING:
+    from sqlite_store import MappingStore
 
 logger = logging.getLogger(__name__)
 
 CONFIG_FILENAME: str = "config.json"
 EXCLUSIONS_FILENAME: str = "excluded_processes.json"
+GAME_CACHE_FILENAME: str = "game_cache.json"
+PENDING_UPDATE_FILENAME: str = "pending_update.json"
+DATABASE_FILENAME: str = "stream_manager.db"
+
+STORAGE_BACKEND_JSON: str = "json"
+STORAGE_BACKEND_SQLITE: str = "sqlite"
+
+# Digest of the last content this process wrote, per path, so the config
+# watcher can tell its own saves from external edits.
+_written_digests: dict[str, str] = {}
+_written_lock = threading.Lock()
+
+# One write-behind journal per config directory (see config_journal).
+_journals: dict[str, ConfigJournal] = {}
+_journals_lock = threading.Lock()
+
+# Open SQLite stores per config directory, for the "sqlite" storage backend.
+_stores: dict[str, MappingStore] = {}
 
 
 # ---------------------------------------------------------------------------
@@ -35,51 +63,110 @@ def _read_json(path: str) -> dict[str, Any]:
 def _write_json(path: str, data: dict[str, Any]) -> None:
     """Atomically write *data* as JSON via a temp-file + rename."""
     try:
-        dir_name = os.path.dirname(path) or "."
-        with tempfile.NamedTemporaryFile(
-            mode="w", encoding="utf-8", dir=dir_name, delete=False, suffix=".tmp"
-        ) as tf:
-            json.dump(data, tf, ensure_ascii=False, indent=4)
-            tf.flush()
-            os.fsync(tf.fileno())
-        os.replace(tf.name, path)
+        _replace_json(path, data)
     except Exception:
         logger.exception("Failed to write %s", path)
 
 
+def _replace_json(path: str, data: dict[str, Any]) -> None:
+    """Like :func:`_write_json`, but raise on failure."""
+    payload = json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+    dir_name = os.path.dirname(path) or "."
+    with tempfile.NamedTemporaryFile(mode="wb", dir=dir_name, delete=False, suffix=".tmp") as tf:
+        tf.write(payload)
+        tf.flush()
+        os.fsync(tf.fileno())
+    with _written_lock:
+        _written_digests[os.path.abspath(path)] = hashlib.sha256(payload).hexdigest()
+    os.replace(tf.name, path)
+
+
+def written_digest(path: str) -> str | None:
+    """SHA-256 of the content last written to *path* by this process, if any."""
+    with _written_lock:
+        return _written_digests.get(os.path.abspath(path))
+
+
 # ---------------------------------------------------------------------------
 # config.json
 # ---------------------------------------------------------------------------
 
+def _journal(base_dir: str) -> ConfigJournal:
+    key = os.path.abspath(base_dir)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            path = os.path.join(key, CONFIG_FILENAME)
+            journal = ConfigJournal(
+                os.path.join(key, JOURNAL_FILENAME),
+                read_config=lambda: _read_json(path),
+                write_config=lambda data: _replace_json(path, data),
+            )
+            _journals[key] = journal
+        return journal
+
+
 def load_config(base_dir: str) -> dict[str, Any]:
-    """Load the main configuration dictionary from *base_dir*."""
-    return _read_json(os.path.join(base_dir, CONFIG_FILENAME))
+    """Load the main configuration dictionary from *base_dir*.
+
+    Edits journaled but not yet compacted (e.g. before a crash) are replayed.
+    With the SQLite backend the mappings come from the database.
+    """
+    config = _journal(base_dir).load()
+    _open_store(base_dir, config)
+    return _with_stored_mappings(base_dir, config)
+
+
+def reload_config(base_dir: str, state: AppState, config: dict[str, Any]) -> None:
+    """Apply externally edited *config* to *state*, keeping the app's pending edits.
+
+    The rebase runs inside :meth:`AppState.publish_config`, serialized with
+    mapping edits, so an edit made while the file was being reloaded is
+    never dropped from the published snapshot.
+    """
+    rebased: dict[str, Any] = {}
+
+    def build(current: ConfigSnapshot) -> ConfigSnapshot:
+        rebased.update(_with_stored_mappings(base_dir, _journal(base_dir).rebase(config)))
+        return ConfigSnapshot.from_config(rebased, current.base_template)
+
+    state.publish_config(build)
+    _apply_settings(state, rebased)
+
+
+def flush_config(base_dir: str) -> None:
+    """Compact pending config edits into config.json now (called at shutdown)."""
+    try:
+        _journal(base_dir).compact()
+    except Exception:
+        logger.exception("Failed to compact config edits – they stay in %s", JOURNAL_FILENAME)
 
 
 def apply_config_to_state(state: AppState, config: dict[str, Any]) -> None:
     """Populate *state* fields from a raw config dictionary."""
-    state.app_config = config
-    state.base_template = config.get("base", state.base_template)
-    state.process_names = config.get("process_name", {})
-    state.twitch_categories = config.get("TwitchCategoryName", {})
+    state.publish_config(lambda current: ConfigSnapshot.from_config(config, current.base_template))
+    _apply_settings(state, config)
+
+
+def _apply_settings(state: AppState, config: dict[str, Any]) -> None:
     state.language = config.get("language", state.language)
     state.keep_last_when_no_game = config.get("keep_last_when_none", state.keep_last_when_no_game)
     state.dark_mode = config.get("dark_mode", state.dark_mode)
+    state.switch_policy = SwitchPolicy.from_config(config.get("switch_policy"))
+    state.poll_policy = PollPolicy.from_config(config.get("poll_policy"))
 
 
 def save_config(base_dir: str, state: AppState) -> None:
-    """Persist current *state* settings into config.json.
-
-    Builds a fresh dictionary rather than mutating ``state.app_config`` in-place.
-    """
-    cfg: dict[str, Any] = dict(state.app_config)
-    cfg.setdefault("process_name", {})
-    cfg.setdefault("TwitchCategoryName", {})
-    cfg["base"] = state.base_template
-    cfg["language"] = state.language
-    cfg["keep_last_when_none"] = state.keep_last_when_no_game
-    cfg["dark_mode"] = state.dark_mode
-    _write_json(os.path.join(base_dir, CONFIG_FILENAME), cfg)
+    """Persist current *state* settings into config.json (via the journal)."""
+    try:
+        _journal(base_dir).commit([
+            set_op("base", state.base_template),
+            set_op("language", state.language),
+            set_op("keep_last_when_none", state.keep_last_when_no_game),
+            set_op("dark_mode", state.dark_mode),
+        ])
+    except Exception:
+        logger.exception("save_config failed")
 
 
 def add_custom_game(
@@ -95,23 +182,170 @@ def add_custom_game(
         return False
 
     try:
-        cfg: dict[str, Any] = dict(state.app_config)
-        cfg.setdefault("process_name", {})[game_name] = process_name_str
-        if twitch_category:
-            cfg.setdefault("TwitchCategoryName", {})[game_name] = twitch_category
+        _edit_mappings(base_dir, state, upserts={game_name: (process_name_str, twitch_category)})
+        logger.info("Added/updated game: %s → %s (category: %s)", game_name, process_name_str, twitch_category)
+        return True
+    except Exception:
+        logger.exception("add_custom_game failed")
+        return False
+
 
-        _write_json(os.path.join(base_dir, CONFIG_FILENAME), cfg)
+def remove_custom_game(base_dir: str, state: AppState, game_name: str) -> bool:
+    """Remove the mapping (and category) of *game_name*."""
+    try:
+        _edit_mappings(base_dir, state, removals=[game_name])
+        logger.info("Removed game: %s", game_name)
+        return True
+    except Exception:
+        logger.exception("remove_custom_game failed")
+        return False
 
-        # Sync state
-        state.app_config = cfg
-        state.process_names = cfg.get("process_name", {})
-        state.twitch_categories = cfg.get("TwitchCategoryName", {})
 
-        logger.info("Added/updated game: %s → %s (category: %s)", game_name, process_name_str, twitch_category)
+def apply_mapping_edits(
+    base_dir: str,
+    state: AppState,
+    upserts: dict[str, tuple[str, str | None]] | None = None,
+    removals: list[str] | None = None,
+) -> bool:
+    """Apply many mapping edits as one transaction (one journal entry, one publish)."""
+    try:
+        _edit_mappings(base_dir, state, upserts, removals)
+        logger.info("Applied %d mapping updates, %d removals", len(upserts or {}), len(removals or ()))
         return True
     except Exception:
-        logger.exception("add_custom_game failed")
+        logger.exception("apply_mapping_edits failed")
+        return False
+
+
+def _edit_mappings(
+    base_dir: str,
+    state: AppState,
+    upserts: dict[str, tuple[str, str | None]] | None = None,
+    removals: list[str] | None = None,
+) -> None:
+    """Store the edited mappings (journal or database), then publish them to *state*."""
+    store = _store(base_dir)
+    ops: list[Op] = [unmap_op(game) for game in removals or ()]
+    ops.extend(map_op(game, process, category) for game, (process, category) in (upserts or {}).items())
+
+    def build(current: ConfigSnapshot) -> ConfigSnapshot:
+        # Persist inside publish_config so edits reach disk in publish order.
+        if store is not None:
+            store.edit_mappings(upserts, removals or ())
+        else:
+            _journal(base_dir).commit(ops)
+        return current.with_mappings(upserts, removals or ())
+
+    state.publish_config(build)
+
+
+# ---------------------------------------------------------------------------
+# Storage backend (JSON files or SQLite)
+# ---------------------------------------------------------------------------
+
+def _store(base_dir: str) -> MappingStore | None:
+    """The open SQLite store of *base_dir*, or ``None`` for the JSON backend."""
+    with _journals_lock:
+        return _stores.get(os.path.abspath(base_dir))
+
+
+def uses_database(base_dir: str) -> bool:
+    """Whether mappings, game ids and exclusions of *base_dir* live in SQLite."""
+    return _store(base_dir) is not None
+
+
+def _open_store(base_dir: str, config: dict[str, Any]) -> None:
+    """Open the database when config.json selects the SQLite backend.
+
+    A new database is filled from the JSON files in one transaction.  Only
+    once that has committed are the mappings dropped from config.json, so
+    there is a single copy of them; categories of games without a process
+    mapping (which the database cannot hold) stay in config.json.  If the
+    import fails, the JSON backend stays in use.
+    """
+    storage = config.get("storage") or {}
+    backend = storage.get("backend", STORAGE_BACKEND_JSON)
+    if backend != STORAGE_BACKEND_SQLITE:
+        if backend != STORAGE_BACKEND_JSON:
+            logger.warning("Unknown storage backend '%s' – using %s", backend, STORAGE_BACKEND_JSON)
+        return
+    key = os.path.abspath(base_dir)
+    if _store(base_dir) is not None:
+        return
+    from sqlite_store import MappingStore
+
+    store = MappingStore(os.path.join(key, storage.get("path") or DATABASE_FILENAME))
+    if store.is_new:
+        try:
+            store.create(
+                config,
+                _read_json(os.path.join(key, GAME_CACHE_FILENAME)).get("games", {}),
+                _read_json(os.path.join(key, EXCLUSIONS_FILENAME)),
+            )
+        except Exception:
+            logger.exception("Could not import the JSON data into %s – keeping the JSON backend", store.path)
+            store.close()
+            return
+        mapped = config.get(MAPPINGS_KEY) or {}
+        orphans = {game: c for game, c in (config.get(CATEGORIES_KEY) or {}).items() if game not in mapped}
+        try:
+            journal = _journal(base_dir)
+            journal.commit([
+                unset_op(MAPPINGS_KEY),
+                set_op(CATEGORIES_KEY, orphans) if orphans else unset_op(CATEGORIES_KEY),
+            ])
+            journal.compact()
+        except Exception:
+            # Harmless: the database copy takes precedence from now on.
+            logger.exception("Could not drop the migrated mappings from %s", CONFIG_FILENAME)
+    with _journals_lock:
+        _stores[key] = store
+    logger.info("Storage: SQLite database %s", store.path)
+
+
+def _with_stored_mappings(base_dir: str, config: dict[str, Any]) -> dict[str, Any]:
+    """*config* with the mappings read from the database (SQLite backend only).
+
+    Only the columns the matcher and the title updates need are read.
+    """
+    store = _store(base_dir)
+    if store is None:
+        return config
+    config = dict(config)
+    config[MAPPINGS_KEY], config[CATEGORIES_KEY] = store.load_mappings()
+    return config
+
+
+def export_json(base_dir: str) -> bool:
+    """Move the database contents back into the JSON files and select the JSON backend.
+
+    The database file is left in place.  Returns ``False`` when the JSON
+    backend is already in use.
+    """
+    store = _store(base_dir)
+    if store is None:
+        logger.info("Storage is already JSON – nothing to export")
         return False
+    process_names, categories = store.load_mappings()
+    journal = _journal(base_dir)
+    config = journal.load()
+    # Categories of unmapped games never moved into the database.
+    categories = {**(config.get(CATEGORIES_KEY) or {}), **categories}
+    storage = dict(config.get("storage") or {})
+    storage["backend"] = STORAGE_BACKEND_JSON
+    journal.commit([
+        set_op(MAPPINGS_KEY, process_names),
+        set_op(CATEGORIES_KEY, categories),
+        set_op("storage", storage),
+    ])
+    journal.compact()
+    _write_json(os.path.join(base_dir, GAME_CACHE_FILENAME), {"games": store.load_game_ids()})
+    _write_json(os.path.join(base_dir, EXCLUSIONS_FILENAME), store.load_exclusions())
+    with _journals_lock:
+        _stores.pop(os.path.abspath(base_dir), None)
+    store.close()
+    logger.info("Exported %d mappings from %s to JSON", len(process_names), store.path)
+    return True
 
 
 # ---------------------------------------------------------------------------
@@ -120,14 +354,36 @@ def add_custom_game(
 
 def load_excluded_processes(base_dir: str, state: AppState) -> None:
     """Load process exclusion lists into *state*."""
-    data = _read_json(os.path.join(base_dir, EXCLUSIONS_FILENAME))
+    store = _store(base_dir)
+    if store is not None:
+        apply_excluded_processes(state, store.load_exclusions())
+        return
+    apply_excluded_processes(state, _read_json(os.path.join(base_dir, EXCLUSIONS_FILENAME)))
+
+
+def apply_excluded_processes(state: AppState, data: dict[str, Any]) -> None:
+    """Populate the exclusion lists in *state* from excluded_processes.json content."""
     state.excluded_names = {n.lower() for n in data.get("exclude_process_names", []) if n}
     state.excluded_prefixes = [p.lower() for p in data.get("exclude_prefixes", []) if p]
+    mark_exclusions_changed(state)
     logger.info("Loaded exclusions: %d names, %d prefixes", len(state.excluded_names), len(state.excluded_prefixes))
 
 
+def mark_exclusions_changed(state: AppState) -> None:
+    """Recompile the exclusion filter after the lists in *state* changed."""
+    state.exclusion_filter = ExclusionFilter(
+        state.excluded_names,
+        state.excluded_prefixes,
+        version=state.exclusion_filter.version + 1,
+    )
+
+
 def save_excluded_processes(base_dir: str, state: AppState) -> None:
     """Persist current exclusion lists."""
+    store = _store(base_dir)
+    if store is not None:
+        store.save_exclusions(state.excluded_names, state.excluded_prefixes)
+        return
     _write_json(
         os.path.join(base_dir, EXCLUSIONS_FILENAME),
         {
@@ -135,3 +391,53 @@ def save_excluded_processes(base_dir: str, state: AppState) -> None:
             "exclude_prefixes": state.excluded_prefixes,
         },
     )
+
+
+# ---------------------------------------------------------------------------
+# game_cache.json
+# ---------------------------------------------------------------------------
+
+def load_game_cache(base_dir: str) -> dict[str, Any]:
+    """Load the persisted category → game_id cache entries."""
+    store = _store(base_dir)
+    if store is not None:
+        return store.load_game_ids()
+    return _read_json(os.path.join(base_dir, GAME_CACHE_FILENAME)).get("games", {})
+
+
+def save_game_cache(base_dir: str, entries: dict[str, Any], changed: Iterable[str] | None = None) -> None:
+    """Persist category → game_id cache entries.
+
+    The SQLite backend writes only the *changed* keys (all when ``None``).
+    """
+    store = _store(base_dir)
+    if store is not None:
+        try:
+            store.save_game_ids(entries if changed is None else {k: entries[k] for k in changed if k in entries})
+        except Exception:
+            logger.exception("Failed to save game ids to %s", store.path)
+        return
+    _write_json(os.path.join(base_dir, GAME_CACHE_FILENAME), {"games": entries})
+
+
+# ---------------------------------------------------------------------------
+# pending_update.json
+# ---------------------------------------------------------------------------
+
+def load_pending_update(base_dir: str) -> dict[str, Any]:
+    """Return the channel update that was not yet delivered (or ``{}``)."""
+    return _read_json(os.path.join(base_dir, PENDING_UPDATE_FILENAME))
+
+
+def save_pending_update(base_dir: str, update: dict[str, Any] | None) -> None:
+    """Persist the undelivered channel update; ``None`` removes the file."""
+    path = os.path.join(base_dir, PENDING_UPDATE_FILENAME)
+    if update is not None:
+        _write_json(path, update)
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.exception("Failed to remove %s", path)
@@ -0,0 +1,250 @@
+"""Hot reload of config.json and excluded_processes.json.
+
+A single save fires several file-system events (temp file, fsync,
+rename), and editors often write in more steps still.  The watcher
+collects events for a short quiet window, then hashes each changed file
+and reloads it only when the content differs from what was last loaded –
+or last written by the app itself (see :func:`config_store.written_digest`).
+
+Changes are detected by watchdog or, for minimal overhead, by polling the
+files' mtime and size; the ``config_watch`` object in config.json picks
+the mode (read at startup).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Mapping
+
+from app_state import AppState
+from config_store import (
+    CONFIG_FILENAME,
+    EXCLUSIONS_FILENAME,
+    apply_excluded_processes,
+    reload_config,
+    uses_database,
+    written_digest,
+)
+
+if TYPE_CHECKING:
+    from watchdog.events import FileSystemEvent
+    from watchdog.observers.api import BaseObserver
+
+logger = logging.getLogger(__name__)
+
+WATCH_MODE_WATCHDOG: str = "watchdog"
+WATCH_MODE_POLL: str = "poll"
+WATCH_MODE_OFF: str = "off"
+CONFIG_RELOAD_DEBOUNCE_SEC: float = 0.5
+CONFIG_POLL_INTERVAL_SEC: float = 2.0
+
+WATCHED_FILES: tuple[str, ...] = (CONFIG_FILENAME, EXCLUSIONS_FILENAME)
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ConfigWatcher:
+    """Debounced, content-hashed reloader for the watched config files.
+
+    Doubles as the watchdog event handler: it duck-types
+    ``FileSystemEventHandler`` (watchdog only calls :meth:`dispatch`) so
+    watchdog need not be imported unless that mode is used.
+    """
+
+    def __init__(
+        self,
+        base_dir: str,
+        state: AppState,
+        mode: str = WATCH_MODE_WATCHDOG,
+        debounce: float = CONFIG_RELOAD_DEBOUNCE_SEC,
+        poll_interval: float = CONFIG_POLL_INTERVAL_SEC,
+    ) -> None:
+        self._base_dir = base_dir
+        self._state = state
+        self.mode = mode
+        self._debounce = debounce
+        self._poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._pending: set[str] = set()
+        self._due: float = 0.0
+        self._stopped: bool = False
+        self._thread: threading.Thread | None = None
+        self._observer: BaseObserver | None = None
+        self._stats: dict[str, tuple[int, int] | None] = {}
+        self._loaded: dict[str, str] = {}
+        for name in WATCHED_FILES:
+            self._stats[name] = self._stat(name)
+            data = self._read(name)
+            if data is not None:
+                self._loaded[name] = file_digest(data)
+
+    @classmethod
+    def from_config(cls, base_dir: str, state: AppState, config: Mapping[str, Any] | None) -> ConfigWatcher:
+        """Build a watcher from the ``config_watch`` object in config.json."""
+        config = config or {}
+        mode = str(config.get("mode") or WATCH_MODE_WATCHDOG)
+        if mode not in (WATCH_MODE_WATCHDOG, WATCH_MODE_POLL, WATCH_MODE_OFF):
+            logger.warning("Unknown config_watch mode '%s' – using %s", mode, WATCH_MODE_WATCHDOG)
+            mode = WATCH_MODE_WATCHDOG
+        debounce = config.get("debounce_seconds", CONFIG_RELOAD_DEBOUNCE_SEC)
+        poll = config.get("poll_seconds", CONFIG_POLL_INTERVAL_SEC)
+        return cls(
+            base_dir,
+            state,
+            mode=mode,
+            debounce=float(debounce) if isinstance(debounce, (int, float)) and debounce >= 0 else CONFIG_RELOAD_DEBOUNCE_SEC,
+            poll_interval=float(poll) if isinstance(poll, (int, float)) and poll > 0 else CONFIG_POLL_INTERVAL_SEC,
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self.mode == WATCH_MODE_OFF:
+            logger.info("Config hot reload disabled")
+            return
+        if self.mode == WATCH_MODE_WATCHDOG:
+            try:
+                from watchdog.observers import Observer
+
+                observer = Observer()
+                observer.schedule(self, path=self._base_dir, recursive=False)
+                observer.start()
+                self._observer = observer
+            except Exception:
+                logger.exception("Could not start watchdog – polling config files instead")
+                self.mode = WATCH_MODE_POLL
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=1)
+            except Exception:
+                logger.debug("Observer stop raised (ignored)", exc_info=True)
+            self._observer = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Change detection
+    # ------------------------------------------------------------------
+
+    def dispatch(self, event: FileSystemEvent) -> None:
+        """Watchdog entry point: note writes, creations and renames onto a watched file."""
+        if event.event_type not in ("modified", "created", "moved"):
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            name = os.path.basename(os.fsdecode(path)) if path else ""
+            if name in WATCHED_FILES:
+                self.notify(name)
+
+    def notify(self, name: str) -> None:
+        """Schedule a reload check of *name* after the quiet window."""
+        with self._cond:
+            self._pending.add(name)
+            self._due = time.monotonic() + self._debounce
+            self._cond.notify_all()
+
+    def _poll_stats(self) -> None:
+        for name in WATCHED_FILES:
+            stat = self._stat(name)
+            if stat != self._stats.get(name):
+                self._stats[name] = stat
+                self.notify(name)
+
+    def _run(self) -> None:
+        polling = self.mode == WATCH_MODE_POLL
+        next_poll = time.monotonic() + self._poll_interval
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    now = time.monotonic()
+                    if self._pending and now >= self._due:
+                        break
+                    if polling and now >= next_poll:
+                        break
+                    deadlines = [self._due] if self._pending else []
+                    if polling:
+                        deadlines.append(next_poll)
+                    self._cond.wait(min(deadlines) - now if deadlines else None)
+                if self._stopped:
+                    return
+                ready = self._pending if time.monotonic() >= self._due else set()
+                if ready:
+                    self._pending = set()
+            if polling and time.monotonic() >= next_poll:
+                next_poll = time.monotonic() + self._poll_interval
+                self._poll_stats()
+            for name in sorted(ready):
+                try:
+                    self._reload(name)
+                except Exception:
+                    logger.exception("Reloading %s failed", name)
+
+    # ------------------------------------------------------------------
+    # Reload
+    # ------------------------------------------------------------------
+
+    def _reload(self, name: str) -> None:
+        path = os.path.join(self._base_dir, name)
+        data = self._read(name)
+        if data is None:
+            return
+        digest = file_digest(data)
+        if digest == self._loaded.get(name):
+            logger.debug("%s unchanged – not reloading", name)
+            return
+        if digest == written_digest(path):
+            logger.debug("%s was written by the app – not reloading", name)
+            self._loaded[name] = digest
+            return
+        try:
+            parsed = json.loads(data.decode("utf-8"))
+        except ValueError:
+            # Probably caught mid-save by an editor; the next event retries.
+            logger.warning("%s is not valid JSON – keeping the current settings", name)
+            return
+        if not isinstance(parsed, dict):
+            logger.warning("%s does not contain a JSON object – ignored", name)
+            return
+        self._loaded[name] = digest
+        if name == EXCLUSIONS_FILENAME and uses_database(self._base_dir):
+            logger.info("%s changed, but exclusions are stored in the database – ignored", name)
+            return
+        if name == CONFIG_FILENAME:
+            reload_config(self._base_dir, self._state, parsed)
+            logger.info("%s reloaded (%d games)", name, len(self._state.process_names))
+        else:
+            apply_excluded_processes(self._state, parsed)
+
+    def _read(self, name: str) -> bytes | None:
+        try:
+            with open(os.path.join(self._base_dir, name), "rb") as fh:
+                return fh.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.exception("Could not read %s", name)
+            return None
+
+    def _stat(self, name: str) -> tuple[int, int] | None:
+        try:
+            st = os.stat(os.path.join(self._base_dir, name))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
@@ -0,0 +1,69 @@
+"""Compiled process-exclusion filter (frozen name set + prefix trie).
+
+Built once from ``excluded_processes.json`` (and again after every edit
+in the exclusions editor); never mutated afterwards.  Repeat lookups of
+the same process name are answered from a bounded two-generation verdict
+cache.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+VERDICT_CACHE_SIZE: int = 16384  # per generation; covers even very busy machines
+
+_END: str = ""  # trie terminal marker (no process-name character is empty)
+
+
+class ExclusionFilter:
+    """Immutable exclusion lists compiled for fast, case-insensitive lookup."""
+
+    def __init__(
+        self,
+        names: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        version: int = 0,
+        cache_size: int = VERDICT_CACHE_SIZE,
+    ) -> None:
+        self.version: int = version
+        self.names: frozenset[str] = frozenset(n.lower() for n in names if n)
+        self.prefixes: tuple[str, ...] = tuple(dict.fromkeys(p.lower() for p in prefixes if p))
+        self._trie: dict[str, Any] = {}
+        for prefix in self.prefixes:
+            node = self._trie
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node[_END] = True
+        self._cache_size = cache_size
+        self._verdicts: dict[str, bool] = {}
+        self._previous: dict[str, bool] = {}
+
+    def is_excluded(self, proc_name: str) -> bool:
+        """Return ``True`` if *proc_name* is excluded by name or prefix."""
+        verdict = self._verdicts.get(proc_name)
+        if verdict is None:
+            verdict = self._previous.get(proc_name)
+            if verdict is None:
+                verdict = self._evaluate(proc_name)
+            if len(self._verdicts) >= self._cache_size:
+                # Start a new generation.  Names looked up again before the
+                # next one fills are carried over, so the names seen on every
+                # scan stay cached however many one-off processes pass by.
+                self._previous, self._verdicts = self._verdicts, {}
+            self._verdicts[proc_name] = verdict
+        return verdict
+
+    def _evaluate(self, proc_name: str) -> bool:
+        if not proc_name:
+            return True
+        name_l = proc_name.lower()
+        if name_l in self.names:
+            return True
+        node = self._trie
+        for ch in name_l:
+            node = node.get(ch)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
@@ -0,0 +1,82 @@
+"""Persistent Twitch category → game_id cache with positive and negative TTLs.
+
+Stored as ``game_cache.json`` beside config.json.  Keys are lowercased
+category names; a ``None`` id records a category Twitch does not know, so
+repeated lookups of a typo do not hit the API until the negative TTL
+expires.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Iterable
+
+from app_state import GAME_ID_CACHE_TTL_SEC, GAME_ID_NEGATIVE_TTL_SEC
+from config_store import load_game_cache, save_game_cache
+
+logger = logging.getLogger(__name__)
+
+
+class GameIdCache:
+    """Thread-safe cache of ``category → (game_id, game_name)`` lookups.
+
+    *base_dir* ``None`` keeps the cache in memory only.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | None = None,
+        ttl: float = GAME_ID_CACHE_TTL_SEC,
+        negative_ttl: float = GAME_ID_NEGATIVE_TTL_SEC,
+    ) -> None:
+        self._base_dir = base_dir
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._dirty: set[str] = set()
+        if base_dir is not None:
+            self._entries = {
+                k: v for k, v in load_game_cache(base_dir).items()
+                if isinstance(v, dict) and "fetched" in v
+            }
+            logger.info("Loaded %d cached game ids", len(self._entries))
+
+    def get(self, category: str) -> tuple[str | None, str | None] | None:
+        """Return ``(game_id, game_name)``, ``(None, None)`` for a cached miss,
+        or ``None`` when *category* is not cached (or expired)."""
+        with self._lock:
+            entry = self._entries.get(category.lower())
+        if entry is None:
+            return None
+        ttl = self._ttl if entry.get("id") else self._negative_ttl
+        if time.time() - entry["fetched"] > ttl:
+            return None
+        return entry.get("id"), entry.get("name")
+
+    def missing(self, categories: Iterable[str]) -> list[str]:
+        """Return the distinct *categories* that need a lookup."""
+        seen: dict[str, str] = {}
+        for category in categories:
+            if category and category.lower() not in seen and self.get(category) is None:
+                seen[category.lower()] = category
+        return list(seen.values())
+
+    def put(self, category: str, game_id: str | None, game_name: str | None) -> None:
+        """Record a lookup result (``game_id=None`` for "not found")."""
+        with self._lock:
+            self._entries[category.lower()] = {"id": game_id, "name": game_name, "fetched": time.time()}
+            self._dirty.add(category.lower())
+
+    def save(self) -> None:
+        """Persist the cache if it changed since the last save."""
+        if self._base_dir is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            changed, self._dirty = self._dirty, set()
+        save_game_cache(self._base_dir, entries, changed)
@@ -0,0 +1,127 @@
+"""Compiled game→process matcher (exact hash table + Aho-Corasick automaton).
+
+A process name matches a mapping when it equals the expected process name
+or contains it, case-insensitively – the same rule ``_proc_matches`` has
+always applied.  Compiling the mappings once per config version turns the
+per-scan work into a single pass over the process names, independent of
+how many mappings are configured.
+
+When several mappings match, the winner is chosen by explicit priority:
+
+1. an exact match beats a substring match;
+2. a longer (more specific) expected name beats a shorter one;
+3. otherwise the mapping that comes first in config.json wins.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+
+@dataclass(frozen=True)
+class MatchHit:
+    """One ``(process, mapping)`` match."""
+
+    game: str
+    process: str
+    expected: str
+    exact: bool
+    order: int
+
+    @property
+    def rank(self) -> tuple[int, int, int]:
+        """Sort key – lower is better (see module docstring)."""
+        return (0 if self.exact else 1, -len(self.expected), self.order)
+
+
+class GameMatcher:
+    """Immutable matcher compiled from a ``{game: expected_process}`` mapping."""
+
+    def __init__(self, process_names: Mapping[str, str]) -> None:
+        # pattern id -> (game, expected, lowered expected, config order)
+        self._patterns: list[tuple[str, str, str, int]] = []
+        self._exact: dict[str, list[int]] = {}
+        for order, (game, expected) in enumerate(process_names.items()):
+            if not expected:
+                continue
+            lowered = expected.lower()
+            self._exact.setdefault(lowered, []).append(len(self._patterns))
+            self._patterns.append((game, expected, lowered, order))
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def _build(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        for lowered, idxs in self._exact.items():
+            node = 0
+            for ch in lowered:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    out.append(())
+                node = nxt
+            out[node] = tuple(idxs)
+
+        # Breadth-first: every node inherits the outputs of its failure link.
+        queue: deque[int] = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                if out[fail[child]]:
+                    out[child] = out[child] + out[fail[child]]
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def _scan(self, lowered: str) -> set[int]:
+        """Return the ids of every pattern occurring in *lowered*."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+        node = 0
+        for ch in lowered:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def match_all(self, process_names: Iterable[str]) -> list[MatchHit]:
+        """Return every match across *process_names*, best first."""
+        if not self._patterns:
+            return []
+        hits: list[MatchHit] = []
+        for name in process_names:
+            lowered = name.lower()
+            exact = self._exact.get(lowered, ())
+            for idx in self._scan(lowered):
+                game, expected, _, order = self._patterns[idx]
+                hits.append(MatchHit(game, name, expected, idx in exact, order))
+        hits.sort(key=lambda h: h.rank)
+        return hits
+
+    def best(self, process_names: Iterable[str]) -> MatchHit | None:
+        """Return the highest-priority match across *process_names*, if any."""
+        hits = self.match_all(process_names)
+        return hits[0] if hits else None
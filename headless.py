@@ -0,0 +1,58 @@
+"""Headless service mode: monitor and update Twitch without any GUI.
+
+Started with ``python main.py --headless``.  Nothing here (or in the
+modules it pulls in) imports tkinter, so the process stays small enough to
+run as a background service on a dedicated streaming machine.  Logs go to
+a rotating file; SIGTERM / SIGINT (and SIGBREAK on Windows) stop it cleanly.
+"""
+
+from __future__ import annotations
+
+import logging
+import logging.handlers
+import signal
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+LOG_FILENAME: str = "stream_manager.log"
+LOG_MAX_BYTES: int = 5 * 1024 * 1024
+LOG_BACKUP_COUNT: int = 3
+
+
+def configure_file_logging(path: str, fmt: str, datefmt: str) -> None:
+    """Send all log records to a rotating file at *path*."""
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter(fmt, datefmt))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+
+
+def install_signal_handlers(stop_event: threading.Event) -> None:
+    """Set *stop_event* on SIGTERM / SIGINT (/ SIGBREAK); main thread only."""
+
+    def _handle(signum: int, _frame: object) -> None:
+        logger.info("Received %s – shutting down…", signal.Signals(signum).name)
+        stop_event.set()
+
+    for name in ("SIGTERM", "SIGINT", "SIGBREAK"):
+        sig = getattr(signal, name, None)
+        if sig is not None:
+            signal.signal(sig, _handle)
+
+
+def serve(stop_event: threading.Event, shutdown: Callable[[], None]) -> None:
+    """Block until *stop_event* is set, then run *shutdown*."""
+    install_signal_handlers(stop_event)
+    logger.info("Running headless (send SIGTERM to stop)")
+    try:
+        # Wake periodically so signals are handled promptly on every platform.
+        while not stop_event.wait(1.0):
+            pass
+    finally:
+        shutdown()
+        logger.info("Stopped.")
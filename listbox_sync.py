@@ -0,0 +1,101 @@
+"""Incremental listbox updates and type-ahead filtering.
+
+Refilling a ``tk.Listbox`` with ``delete(0, END)`` plus one ``insert`` per
+row loses the selection and scroll position and gets slow for long lists.
+:func:`sync_listbox` applies only the rows that differ between the old and
+new contents; Tk shifts the selection and view of the untouched rows
+itself.  :class:`FilteredList` keeps the full row set plus a lower-cased
+index and narrows it as a filter string grows.
+"""
+
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Any, Sequence
+
+
+def diff_rows(old: Sequence[str], new: Sequence[str]) -> list[tuple[int, int, list[str]]]:
+    """Return ``(start, end, rows)`` replacements turning *old* into *new*.
+
+    Each entry replaces ``old[start:end]`` with *rows*; entries are ordered
+    from the bottom up so they can be applied one after another.
+    """
+    # Trim the common head/tail first: refreshes mostly change a few rows,
+    # and SequenceMatcher is much slower than a linear scan on long lists.
+    head = 0
+    limit = min(len(old), len(new))
+    while head < limit and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    old_mid = old[head:len(old) - tail]
+    new_mid = new[head:len(new) - tail]
+    if not old_mid and not new_mid:
+        return []
+    if not old_mid or not new_mid:
+        return [(head, head + len(old_mid), list(new_mid))]
+
+    matcher = SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    changes = [
+        (head + i1, head + i2, list(new_mid[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+    changes.reverse()
+    return changes
+
+
+def sync_listbox(listbox: Any, old: Sequence[str], new: Sequence[str]) -> None:
+    """Make *listbox* (currently showing *old*) show *new* with minimal edits."""
+    for start, end, rows in diff_rows(old, new):
+        if end > start:
+            listbox.delete(start, end - 1)
+        if rows:
+            listbox.insert(start, *rows)
+
+
+class FilteredList:
+    """Rows of a listbox plus a case-insensitive substring filter.
+
+    :attr:`shown` is what the listbox currently displays; :meth:`apply`
+    brings the listbox in line with :meth:`visible`.  When the filter only
+    grows (the usual case while typing), matching starts from the previous
+    matches instead of the full list.
+    """
+
+    def __init__(self) -> None:
+        self.shown: list[str] = []
+        self._rows: list[str] = []
+        self._keys: list[str] = []
+        self._query: str = ""
+        self._matches: list[int] | None = None
+
+    def set_rows(self, rows: Sequence[str]) -> None:
+        self._rows = list(rows)
+        self._keys = [row.lower() for row in self._rows]
+        self._matches = None
+
+    def set_query(self, query: str) -> None:
+        query = query.strip().lower()
+        if query == self._query:
+            return
+        if not (self._matches is not None and self._query and query.startswith(self._query)):
+            self._matches = None
+        self._query = query
+        if self._matches is not None:
+            keys = self._keys
+            self._matches = [i for i in self._matches if query in keys[i]]
+
+    def visible(self) -> list[str]:
+        if not self._query:
+            return self._rows
+        if self._matches is None:
+            query = self._query
+            self._matches = [i for i, key in enumerate(self._keys) if query in key]
+        return [self._rows[i] for i in self._matches]
+
+    def apply(self, listbox: Any) -> None:
+        rows = self.visible()
+        sync_listbox(listbox, self.shown, rows)
+        self.shown = list(rows)
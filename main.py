@@ -1,114 +1,163 @@
 """Twitch Stream Auto-Title – entry point.
 
 Monitors running processes, detects games, and updates a Twitch stream's
-title and category automatically.
+title and category automatically.  ``--headless`` runs the same services
+without the Tkinter GUI (see :mod:`headless`).
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
+import os
+import sys
 import threading
-import tkinter as tk
-
-from watchdog.events import FileSystemEvent, FileSystemEventHandler
-from watchdog.observers import Observer
 
+import tracing
 from app_state import AppState
 from bootstrap import ensure_required_files, get_base_dir, load_credentials
-from config_store import apply_config_to_state, load_config, load_excluded_processes
+from config_store import apply_config_to_state, export_json, flush_config, load_config, load_excluded_processes
+from config_watcher import ConfigWatcher
+from game_cache import GameIdCache
+from metrics import start_metrics_server
+from process_events import create_event_source
 from process_monitor import monitor_game_and_update_title
 from twitch_client import TwitchClient
-from ui import AppGUI
+from update_outbox import UpdateOutbox
 
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+LOG_FORMAT: str = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+LOG_DATEFMT: str = "%Y-%m-%d %H:%M:%S"
+
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, datefmt=LOG_DATEFMT)
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# Config file hot-reload watcher
+# Main
 # ---------------------------------------------------------------------------
 
 
-class ConfigFileEventHandler(FileSystemEventHandler):
-    """Watchdog handler that reloads config.json on modification."""
-
-    def __init__(self, base_dir: str, state: AppState) -> None:
-        super().__init__()
-        self._base_dir = base_dir
-        self._state = state
-
-    def on_modified(self, event: FileSystemEvent) -> None:
-        if event.src_path.endswith("config.json"):
-            cfg = load_config(self._base_dir)
-            apply_config_to_state(self._state, cfg)
-            logger.info("config.json reloaded (%d games)", len(self._state.process_names))
-
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Twitch Stream Auto-Title")
+    parser.add_argument("--headless", action="store_true", help="run without the GUI (background service)")
+    parser.add_argument("--log-file", help="headless log file (default: stream_manager.log next to the app)")
+    parser.add_argument(
+        "--export-json",
+        action="store_true",
+        help="move mappings, game ids and exclusions from the SQLite database back to JSON, then exit",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_file",
+        metavar="FILE",
+        help="add the game mappings in a CSV or JSON file (categories checked on Twitch), then exit",
+    )
+    return parser.parse_args(argv)
 
-# ---------------------------------------------------------------------------
-# Main
-# ---------------------------------------------------------------------------
 
+def _import_mappings(base_dir: str, state: AppState, twitch_client: TwitchClient, path: str) -> int:
+    from mapping_import import import_mapping_file
 
-def _stop_observer(observer: Observer) -> None:
-    """Safely stop a Watchdog observer."""
     try:
-        observer.stop()
-        observer.join(timeout=1)
-    except Exception:
-        logger.debug("Observer stop raised (ignored)", exc_info=True)
+        report = import_mapping_file(base_dir, state, path, twitch_client.resolve_games)
+    except (OSError, ValueError) as exc:
+        logger.error("Cannot import %s: %s", path, exc)
+        return 1
+    flush_config(base_dir)
+    return 0 if report.saved else 1
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
     base_dir = get_base_dir()
-    ensure_required_files(base_dir)
+    if args.headless:
+        from headless import LOG_FILENAME, configure_file_logging
+
+        configure_file_logging(args.log_file or os.path.join(base_dir, LOG_FILENAME), LOG_FORMAT, LOG_DATEFMT)
+    ensure_required_files(base_dir, interactive=not args.headless)
+
+    # --- Application state (selects the storage backend) ---
+    state = AppState()
+    apply_config_to_state(state, load_config(base_dir))
+    if args.export_json:
+        export_json(base_dir)
+        return
+    load_excluded_processes(base_dir, state)
 
     # --- Credentials & API client ---
-    creds = load_credentials(base_dir)
+    try:
+        creds = load_credentials(base_dir)
+    except ValueError as exc:
+        logger.error("%s – check config.ini or the TWITCH_* environment variables", exc)
+        sys.exit(1)
     twitch_client = TwitchClient(
         client_id=creds["client_id"],
         access_token=creds["access_token"],
         streamer_id=creds["streamer_id"],
+        game_cache=GameIdCache(base_dir),
     )
+    if args.import_file:
+        sys.exit(_import_mappings(base_dir, state, twitch_client, args.import_file))
 
-    # --- Application state ---
-    state = AppState()
-    apply_config_to_state(state, load_config(base_dir))
-    load_excluded_processes(base_dir, state)
+    metrics_server = start_metrics_server(state.app_config.get("metrics"))
+    tracing.configure(state.app_config.get("tracing"))
+    tracing.install_dump_signal(base_dir)
 
     logger.info("Twitch Stream Auto-Title Started!")
     logger.info("Monitoring for games: %s", list(state.process_names.keys()))
 
-    # --- File watcher for hot-reload ---
-    event_handler = ConfigFileEventHandler(base_dir, state)
-    observer = Observer()
-    observer.schedule(event_handler, path=base_dir, recursive=False)
-    observer.start()
-
-    # --- Background monitor thread ---
+    # --- Background monitor thread (first scan as early as possible) ---
+    outbox = UpdateOutbox(twitch_client, base_dir)
+    stop_event = threading.Event()
+    event_source = create_event_source()
     monitor_thread = threading.Thread(
         target=monitor_game_and_update_title,
-        args=(state, twitch_client),
+        args=(state, outbox, event_source, stop_event),
         daemon=True,
     )
     monitor_thread.start()
 
+    # --- Twitch update outbox (imports requests on its own thread) ---
+    outbox.start(state.twitch_categories.values())
+
+    # --- Hot reload of config.json / excluded_processes.json ---
+    watcher = ConfigWatcher.from_config(base_dir, state, state.app_config.get("config_watch"))
+    watcher.start()
+
+    def shutdown() -> None:
+        stop_event.set()
+        event_source.wake()
+        watcher.stop()
+        monitor_thread.join(timeout=2)
+        outbox.stop()
+        event_source.close()
+        flush_config(base_dir)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+
+    if args.headless:
+        from headless import serve
+
+        serve(stop_event, shutdown)
+        return
+
     # --- Tkinter GUI ---
+    import tkinter as tk
+
+    from ui import AppGUI
+
     root = tk.Tk()
-    AppGUI(root, base_dir, state, twitch_client, lambda: _stop_observer(observer))
+    AppGUI(root, base_dir, state, twitch_client, watcher.stop)
 
     try:
         root.mainloop()
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt – shutting down…")
     finally:
-        _stop_observer(observer)
+        shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+"""Bulk import of game → process → category mappings from CSV or JSON.
+
+Accepted files:
+
+* CSV with a header row naming the ``game``, ``process`` and (optional)
+  ``category`` columns (``game_name`` / ``process_name`` /
+  ``twitch_category`` work too);
+* a JSON list of objects with the same keys;
+* a JSON object in the config.json format (``process_name`` plus optional
+  ``TwitchCategoryName``), e.g. another user's config.json.
+
+Games that are already configured are skipped, as are repeats within the
+file (the first row wins).  Every category is checked against Twitch in
+batched ``/games`` lookups (see :meth:`twitch_client.TwitchClient.resolve_games`),
+known ones are stored under their canonical Twitch spelling, and the rest
+are reported.  All new mappings are stored as one transaction.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Mapping
+
+from app_state import AppState
+from config_snapshot import CATEGORIES_KEY, MAPPINGS_KEY
+from config_store import apply_mapping_edits
+
+logger = logging.getLogger(__name__)
+
+GAME_COLUMNS: tuple[str, ...] = ("game", "game_name", "name")
+PROCESS_COLUMNS: tuple[str, ...] = ("process", "process_name", "exe")
+CATEGORY_COLUMNS: tuple[str, ...] = ("category", "twitch_category", "twitchcategoryname")
+SUMMARY_MAX_CATEGORIES: int = 20
+
+Entry = tuple[str, str, str | None]
+Resolver = Callable[[Iterable[str]], Mapping[str, tuple[str | None, str | None]]]
+
+
+@dataclass
+class ImportReport:
+    """Outcome of one :func:`import_mappings` run."""
+
+    added: int = 0
+    existing: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    unresolved: list[str] = field(default_factory=list)
+    saved: bool = True
+
+    def summary(self) -> str:
+        if not self.saved:
+            return f"Import of {self.added} mappings failed – see the log"
+        text = (
+            f"Imported {self.added} mappings ({self.existing} already configured, "
+            f"{self.duplicates} duplicates, {self.invalid} invalid rows skipped)"
+        )
+        if self.unresolved:
+            names = ", ".join(self.unresolved[:SUMMARY_MAX_CATEGORIES])
+            if len(self.unresolved) > SUMMARY_MAX_CATEGORIES:
+                names += ", …"
+            text += f"; {len(self.unresolved)} categories not found on Twitch: {names}"
+        return text
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def read_mapping_file(path: str) -> tuple[list[Entry], int]:
+    """Return the ``(game, process, category)`` rows of *path* and the number of unusable rows.
+
+    Raises :class:`ValueError` when the file is not in a supported format.
+    """
+    if os.path.splitext(path)[1].lower() == ".json":
+        with open(path, "r", encoding="utf-8") as fh:
+            return _entries_from_json(json.load(fh))
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        return _entries_from_rows(csv.DictReader(fh))
+
+
+def _entries_from_json(data: Any) -> tuple[list[Entry], int]:
+    if isinstance(data, dict) and isinstance(data.get(MAPPINGS_KEY), dict):
+        categories = data.get(CATEGORIES_KEY) or {}
+        data = [
+            {"game": game, "process": process, "category": categories.get(game)}
+            for game, process in data[MAPPINGS_KEY].items()
+        ]
+    if not isinstance(data, list):
+        raise ValueError("expected a list of mappings or a config.json-style object")
+    return _entries_from_rows(row if isinstance(row, dict) else {} for row in data)
+
+
+def _entries_from_rows(rows: Iterable[Mapping[str, Any]]) -> tuple[list[Entry], int]:
+    entries: list[Entry] = []
+    invalid = 0
+    for row in rows:
+        row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+        game = _first(row, GAME_COLUMNS)
+        process = _first(row, PROCESS_COLUMNS)
+        if not game or not process:
+            invalid += 1
+            continue
+        entries.append((game, process, _first(row, CATEGORY_COLUMNS) or None))
+    if not entries and invalid:
+        raise ValueError(f"no rows with a game and a process column (expected one of {GAME_COLUMNS} / {PROCESS_COLUMNS})")
+    return entries, invalid
+
+
+def _first(row: Mapping[str, Any], columns: tuple[str, ...]) -> str:
+    for column in columns:
+        value = row.get(column)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    return ""
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def import_mappings(
+    base_dir: str,
+    state: AppState,
+    entries: Iterable[Entry],
+    resolve: Resolver | None = None,
+    invalid: int = 0,
+) -> ImportReport:
+    """Add the new mappings among *entries* to the config in one transaction.
+
+    *resolve* (usually ``TwitchClient.resolve_games``) validates the
+    categories; without it they are stored unchecked.  *invalid* is the
+    number of rows the reader already skipped (for the report).
+    """
+    report = ImportReport(invalid=invalid)
+    configured = state.config.process_names
+    upserts: dict[str, tuple[str, str | None]] = {}
+    for game, process, category in entries:
+        if game in configured:
+            report.existing += 1
+        elif game in upserts:
+            report.duplicates += 1
+        else:
+            upserts[game] = (process, category)
+
+    if resolve is not None:
+        categories = list(dict.fromkeys(c for _, c in upserts.values() if c))
+        resolved = resolve(categories) if categories else {}
+        canonical: dict[str, str] = {}
+        for category in categories:
+            game_id, game_name = resolved.get(category, (None, None))
+            if game_id:
+                canonical[category] = game_name or category
+            else:
+                # Kept as written: it may be a typo, or Twitch was unreachable.
+                report.unresolved.append(category)
+        upserts = {
+            game: (process, canonical.get(category, category) if category else None)
+            for game, (process, category) in upserts.items()
+        }
+
+    report.added = len(upserts)
+    if upserts:
+        report.saved = apply_mapping_edits(base_dir, state, upserts)
+    logger.info(report.summary())
+    return report
+
+
+def import_mapping_file(base_dir: str, state: AppState, path: str, resolve: Resolver | None = None) -> ImportReport:
+    """Read *path* and import it (see :func:`import_mappings`)."""
+    entries, invalid = read_mapping_file(path)
+    return import_mappings(base_dir, state, entries, resolve, invalid=invalid)
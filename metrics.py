@@ -0,0 +1,255 @@
+"""In-process metrics with an optional Prometheus ``/metrics`` endpoint.
+
+The monitor, the Twitch client and the outbox update the module-level
+metrics below unconditionally: each update is a dict lookup and an add
+under a lock, far cheaper than a log line.  Exposing them is opt-in via
+the ``metrics`` object in config.json (see :func:`start_metrics_server`),
+which serves the Prometheus text format on localhost.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import threading
+from typing import TYPE_CHECKING, Any, Mapping
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+METRICS_DEFAULT_HOST: str = "127.0.0.1"
+METRICS_DEFAULT_PORT: int = 9464
+
+_LATENCY_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_HTTP_BUCKETS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# ---------------------------------------------------------------------------
+# Metric types
+# ---------------------------------------------------------------------------
+
+class _Metric:
+    """Base for labelled metric families; label values are positional."""
+
+    kind: str = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _label_str(self, values: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def replace(self, value: float, *labels: str) -> None:
+        """Drop every other label set and set this one (info-style gauges)."""
+        with self._lock:
+            self._values = {labels: value}
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Bucketed observations (cumulative buckets, sum and count)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = _LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            row = self._values.get(labels)
+            return int(sum(row[:-1])) if row else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for labels, row in items:
+            cumulative = 0.0
+            for bound, n in zip((*self.buckets, math.inf), row[:-1]):
+                cumulative += n
+                le = 'le="+Inf"' if bound == math.inf else f'le="{_fmt(bound)}"'
+                lines.append(f"{self.name}_bucket{self._label_str(labels, le)} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{self._label_str(labels)} {_fmt(row[-1])}")
+            lines.append(f"{self.name}_count{self._label_str(labels)} {_fmt(cumulative)}")
+        return lines
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY: list[_Metric] = []
+
+
+def render_all() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return "\n".join(m.render() for m in REGISTRY) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Application metrics
+# ---------------------------------------------------------------------------
+
+SCAN_SECONDS = Histogram("streammanager_scan_seconds", "Process snapshot + game detection time per monitor cycle.")
+PROCESSES = Gauge("streammanager_processes", "Processes in the current snapshot.")
+EXCLUDED_PROCESSES = Gauge("streammanager_excluded_processes", "Processes hidden by the exclusion filter.")
+CANDIDATE_NAMES = Gauge("streammanager_candidate_names", "Distinct non-excluded process names matched against.")
+POLL_INTERVAL = Gauge("streammanager_poll_interval_seconds", "Current adaptive wait between process scans.")
+DETECTIONS = Counter(
+    "streammanager_detections_total",
+    "Game detections by outcome (match, miss, or cached when the process set was unchanged).",
+    ("result",),
+)
+GAME_SWITCHES = Counter("streammanager_game_switches_total", "Committed game switches pushed to the outbox.")
+CURRENT_GAME = Gauge("streammanager_current_game", "Committed game (value 1 on the current game's label).", ("game",))
+OUTBOX_DEPTH = Gauge("streammanager_outbox_depth", "Channel updates waiting for delivery.")
+CHANNEL_UPDATES = Counter(
+    "streammanager_channel_updates_total",
+    "update_channel outcomes (sent, unchanged, failed, superseded).",
+    ("result",),
+)
+HELIX_SECONDS = Histogram(
+    "streammanager_helix_request_seconds",
+    "Helix request latency per attempt, including urllib3 retries.",
+    ("method", "endpoint"),
+    buckets=_HTTP_BUCKETS,
+)
+HELIX_RESPONSES = Counter(
+    "streammanager_helix_responses_total",
+    "Helix responses by status code ('error' when no response was received).",
+    ("method", "endpoint", "status"),
+)
+HELIX_RETRIES = Counter(
+    "streammanager_helix_retries_total",
+    "Helix retries: 'transport' by urllib3 (5xx, connection errors), 'rate_limit' after a 429.",
+    ("reason",),
+)
+HELIX_RATE_LIMIT_REMAINING = Gauge("streammanager_helix_ratelimit_remaining", "Helix rate-limit points left.")
+
+
+# ---------------------------------------------------------------------------
+# HTTP endpoint
+# ---------------------------------------------------------------------------
+
+def start_metrics_server(config: Mapping[str, Any] | None) -> ThreadingHTTPServer | None:
+    """Serve ``/metrics`` if ``config["enabled"]`` is true; return the server.
+
+    *config* is the ``metrics`` object from config.json
+    (``{"enabled": true, "port": 9464, "host": "127.0.0.1"}``).
+    """
+    if not config or not config.get("enabled"):
+        return None
+    # http.server pulls in the email package; only pay for it when enabled.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            payload = render_all().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    host = str(config.get("host") or METRICS_DEFAULT_HOST)
+    port = int(config.get("port") or METRICS_DEFAULT_PORT)
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError:
+        logger.exception("Could not start metrics endpoint on %s:%d", host, port)
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info("Metrics available at http://%s:%d/metrics", host, server.server_address[1])
+    return server
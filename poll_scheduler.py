@@ -0,0 +1,91 @@
+"""Adaptive interval between process scans.
+
+Right after the process set changes (a launch, a game switch) the monitor
+re-scans every few seconds so follow-up processes are picked up quickly.
+While nothing changes the interval backs off exponentially towards a
+ceiling, and while system CPU is busy it is stretched further so the scan
+does not compete with the game for frames.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Mapping
+
+import psutil
+
+MODE_FAST: str = "fast"
+MODE_BACKOFF: str = "backoff"
+MODE_IDLE: str = "idle"
+MODE_CPU_BUSY: str = "cpu_busy"
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    """Tunables, read from the ``poll_policy`` object in config.json.
+
+    Scans run every *min_seconds* for *fast_window_seconds* after a change,
+    then the interval grows by *backoff_factor* per quiet scan up to
+    *max_seconds*.  While system CPU is at or above *cpu_busy_percent* the
+    interval is multiplied by *cpu_busy_factor* (still capped at
+    *max_seconds*); set *cpu_busy_percent* to ``0`` to disable that.
+    """
+
+    min_seconds: float = 2.0
+    max_seconds: float = 30.0
+    backoff_factor: float = 2.0
+    fast_window_seconds: float = 20.0
+    cpu_busy_percent: float = 80.0
+    cpu_busy_factor: float = 2.0
+
+    @classmethod
+    def from_config(cls, raw: Mapping[str, Any] | None) -> PollPolicy:
+        """Build a policy from config values, keeping defaults for bad entries."""
+        values: dict[str, Any] = {}
+        for f in fields(cls):
+            value = (raw or {}).get(f.name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+                values[f.name] = type(f.default)(value)
+        return cls(**values)
+
+
+class AdaptivePollScheduler:
+    """Pick the wait before the next scan from recent change and CPU load.
+
+    Like :class:`~switch_policy.GameSwitchDebouncer`, it takes the current
+    monotonic time explicitly.  *cpu_percent* defaults to the non-blocking
+    ``psutil.cpu_percent(interval=None)`` (load since the previous call).
+    """
+
+    def __init__(
+        self,
+        policy: PollPolicy | None = None,
+        cpu_percent: Callable[[], float] | None = None,
+    ) -> None:
+        self.policy: PollPolicy = policy or PollPolicy()
+        self.interval: float = self.policy.min_seconds
+        self.mode: str = MODE_FAST
+        self._cpu_percent = cpu_percent or (lambda: psutil.cpu_percent(interval=None))
+        self._base: float = self.policy.min_seconds
+        self._fast_until: float = 0.0
+
+    def next_interval(self, changed: bool, now: float) -> float:
+        """Record one scan (*changed*: it saw a different process set); return the wait."""
+        policy = self.policy
+        low = min(policy.min_seconds, policy.max_seconds)
+        high = max(policy.min_seconds, policy.max_seconds)
+        if changed:
+            self._fast_until = now + policy.fast_window_seconds
+            self._base = low
+        elif now >= self._fast_until:
+            self._base = self._base * max(1.0, policy.backoff_factor)
+        self._base = min(high, max(low, self._base))
+
+        interval = self._base
+        mode = MODE_FAST if interval <= low else MODE_IDLE if interval >= high else MODE_BACKOFF
+        if policy.cpu_busy_percent > 0 and self._cpu_percent() >= policy.cpu_busy_percent:
+            interval = min(high, interval * max(1.0, policy.cpu_busy_factor))
+            mode = MODE_CPU_BUSY
+        self.interval = interval
+        self.mode = mode
+        return interval
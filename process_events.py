@@ -0,0 +1,248 @@
+"""Process event sources: wake the monitor when processes start or exit.
+
+The monitor no longer has to sleep blindly between full process scans.
+Instead it blocks on a :class:`ProcessEventSource`, which reports
+``exec`` / ``exit`` events as soon as they are known:
+
+* :class:`NetlinkProcessEventSource` – Linux kernel proc connector
+  (push-based, zero cost while idle; needs ``CAP_NET_ADMIN``).
+* :class:`PollingProcessEventSource` – portable fallback that diffs the
+  PID set returned by ``psutil.pids()`` (no per-process syscalls).
+* :class:`SyntheticProcessEventSource` – manually fed, for tests and
+  benchmarks.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+import psutil
+
+from app_state import EVENT_POLL_INTERVAL_SEC
+
+logger = logging.getLogger(__name__)
+
+EVENT_EXEC: str = "exec"
+EVENT_EXIT: str = "exit"
+
+
+@dataclass(frozen=True)
+class ProcessEvent:
+    """A single process lifecycle event."""
+
+    kind: str
+    pid: int
+
+
+# ---------------------------------------------------------------------------
+# Base class
+# ---------------------------------------------------------------------------
+
+class ProcessEventSource:
+    """Interface for anything that can report process lifecycle events."""
+
+    def wait(self, timeout: float) -> list[ProcessEvent]:
+        """Block up to *timeout* seconds; return the events seen (maybe none)."""
+        raise NotImplementedError
+
+    def wake(self) -> None:
+        """Make a blocked :meth:`wait` return early (e.g. on shutdown)."""
+
+    def close(self) -> None:
+        """Release any OS resources held by the source."""
+
+
+# ---------------------------------------------------------------------------
+# Portable fallback: PID-set diff
+# ---------------------------------------------------------------------------
+
+class PollingProcessEventSource(ProcessEventSource):
+    """Synthesize events by diffing ``psutil.pids()`` every *interval* seconds."""
+
+    def __init__(self, interval: float = EVENT_POLL_INTERVAL_SEC) -> None:
+        self.interval: float = interval
+        self._pids: set[int] = set(psutil.pids())
+        self._woken = threading.Event()
+
+    def wait(self, timeout: float) -> list[ProcessEvent]:
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            current = set(psutil.pids())
+            events = [ProcessEvent(EVENT_EXIT, pid) for pid in self._pids - current]
+            events.extend(ProcessEvent(EVENT_EXEC, pid) for pid in current - self._pids)
+            self._pids = current
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0 or self._woken.is_set():
+                self._woken.clear()
+                return events
+            self._woken.wait(min(self.interval, remaining))
+
+    def wake(self) -> None:
+        self._woken.set()
+
+
+# ---------------------------------------------------------------------------
+# Linux: kernel proc connector over netlink
+# ---------------------------------------------------------------------------
+
+_NETLINK_CONNECTOR: int = 11
+_CN_IDX_PROC: int = 1
+_CN_VAL_PROC: int = 1
+_NLMSG_DONE: int = 3
+_PROC_CN_MCAST_LISTEN: int = 1
+_PROC_EVENT_EXEC: int = 0x00000002
+_PROC_EVENT_EXIT: int = 0x80000000
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_CN_MSG = struct.Struct("=IIIIHH")
+_PROC_EVENT_HDR = struct.Struct("=IIQ")
+_PID_TGID = struct.Struct("=II")
+
+
+class NetlinkProcessEventSource(ProcessEventSource):
+    """Receive exec/exit notifications from the Linux proc connector.
+
+    Raises ``OSError`` from the constructor when the connector is not
+    available (non-Linux, missing privileges, kernel without
+    ``CONFIG_PROC_EVENTS``); use :func:`create_event_source` to fall back.
+    """
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("proc connector is only available on Linux")
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_CONNECTOR)
+        try:
+            sock.bind((os.getpid(), _CN_IDX_PROC))
+            op = struct.pack("=I", _PROC_CN_MCAST_LISTEN)
+            cn_msg = _CN_MSG.pack(_CN_IDX_PROC, _CN_VAL_PROC, 0, 0, len(op), 0) + op
+            nl_hdr = _NLMSGHDR.pack(_NLMSGHDR.size + len(cn_msg), _NLMSG_DONE, 0, 0, os.getpid())
+            sock.send(nl_hdr + cn_msg)
+        except OSError:
+            sock.close()
+            raise
+        self._sock: socket.socket = sock
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+
+    def wait(self, timeout: float) -> list[ProcessEvent]:
+        deadline = time.monotonic() + max(0.0, timeout)
+        events: list[ProcessEvent] = []
+        while not events:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([self._sock, self._wake_r], [], [], remaining)
+            if self._sock in ready:
+                self._drain(events)
+            if self._wake_r in ready:
+                try:
+                    self._wake_r.recv(64)
+                except BlockingIOError:
+                    pass
+                break
+        return events
+
+    def wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+
+    def _drain(self, events: list[ProcessEvent]) -> None:
+        """Read every queued datagram without blocking (fork events are ignored)."""
+        while True:
+            try:
+                data = self._sock.recv(4096, socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                return
+            except OSError:
+                # ENOBUFS: the kernel dropped events; report a wildcard so
+                # the caller still rescans.
+                logger.debug("proc connector overrun", exc_info=True)
+                events.append(ProcessEvent(EVENT_EXEC, -1))
+                return
+            event = _parse_proc_event(data)
+            if event is not None:
+                events.append(event)
+
+    def close(self) -> None:
+        for sock in (self._sock, self._wake_r, self._wake_w):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+def _parse_proc_event(data: bytes) -> ProcessEvent | None:
+    """Decode one netlink datagram into a :class:`ProcessEvent` (or ``None``)."""
+    offset = _NLMSGHDR.size + _CN_MSG.size
+    if len(data) < offset + _PROC_EVENT_HDR.size + _PID_TGID.size:
+        return None
+    what, _cpu, _ts = _PROC_EVENT_HDR.unpack_from(data, offset)
+    pid, tgid = _PID_TGID.unpack_from(data, offset + _PROC_EVENT_HDR.size)
+    if what == _PROC_EVENT_EXEC:
+        return ProcessEvent(EVENT_EXEC, tgid)
+    if what == _PROC_EVENT_EXIT and pid == tgid:
+        # Thread exits are reported too; only the leader ends the process.
+        return ProcessEvent(EVENT_EXIT, tgid)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Synthetic feed (tests / benchmarks)
+# ---------------------------------------------------------------------------
+
+class SyntheticProcessEventSource(ProcessEventSource):
+    """Event source fed by hand via :meth:`push`; thread-safe."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[ProcessEvent | None] = queue.Queue()
+
+    def push(self, events: Iterable[ProcessEvent]) -> None:
+        for event in events:
+            self._queue.put(event)
+
+    def wait(self, timeout: float) -> list[ProcessEvent]:
+        try:
+            first = self._queue.get(timeout=max(0.0, timeout))
+        except queue.Empty:
+            return []
+        events = [first] if first is not None else []
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                return events
+            if event is not None:
+                events.append(event)
+
+    def wake(self) -> None:
+        self._queue.put(None)
+
+
+# ---------------------------------------------------------------------------
+# Factory
+# ---------------------------------------------------------------------------
+
+def create_event_source() -> ProcessEventSource:
+    """Return the cheapest event source available on this platform."""
+    if sys.platform.startswith("linux"):
+        try:
+            source = NetlinkProcessEventSource()
+            logger.info("Process events: kernel proc connector")
+            return source
+        except OSError as exc:
+            logger.info("Proc connector unavailable (%s) – falling back to PID polling", exc)
+    else:
+        logger.info("Process events: PID polling every %.1fs", EVENT_POLL_INTERVAL_SEC)
+    return PollingProcessEventSource()
@@ -3,114 +3,132 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from typing import Sequence
-
-import psutil
+from typing import Iterable, Sequence
 
+import metrics
+import tracing
 from app_state import (
+    EVENT_SETTLE_SEC,
     FALLBACK_CATEGORY,
     NO_GAME_LABEL,
     PERIODIC_DEBUG_CYCLES,
-    POLL_INTERVAL_SEC,
     AppState,
 )
-from twitch_client import TwitchClient, format_title
+from config_snapshot import ConfigSnapshot
+from game_matcher import GameMatcher
+from poll_scheduler import MODE_CPU_BUSY, AdaptivePollScheduler
+from process_events import EVENT_EXEC, EVENT_EXIT, ProcessEvent, ProcessEventSource, create_event_source
+from process_snapshot import ProcessSnapshot
+from switch_policy import GameSwitchDebouncer
+from twitch_client import format_title
+from update_outbox import ChannelUpdate, UpdateOutbox
 
 logger = logging.getLogger(__name__)
 
-
 # ---------------------------------------------------------------------------
 # Exclusion helpers
 # ---------------------------------------------------------------------------
 
 def is_excluded_process(proc_name: str, state: AppState) -> bool:
     """Return ``True`` if *proc_name* should be ignored."""
-    if not proc_name:
-        return True
-    name_l = proc_name.lower()
-    if name_l in state.excluded_names:
-        return True
-    for prefix in state.excluded_prefixes:
-        if name_l.startswith(prefix):
-            return True
-    return False
+    return state.exclusion_filter.is_excluded(proc_name)
 
 
 # ---------------------------------------------------------------------------
-# Process iteration (cached for one scan)
+# Process snapshot (shared, incrementally maintained)
 # ---------------------------------------------------------------------------
 
-def _iter_non_excluded(state: AppState) -> list[str]:
-    """Return a deduplicated, sorted list of non-excluded process names."""
-    names: set[str] = set()
-    for proc in psutil.process_iter(["name"]):
-        try:
-            name: str = proc.info["name"] or ""
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-        if name and not is_excluded_process(name, state):
-            names.add(name)
-    return sorted(names, key=str.lower)
+def take_process_snapshot(
+    state: AppState,
+    exited: Iterable[int] = (),
+    execed: Iterable[int] = (),
+    verify: bool = False,
+) -> ProcessSnapshot:
+    """Apply the process churn since the last call and return the snapshot."""
+    exclusions = state.exclusion_filter
+    return state.processes.refresh(exclusions.is_excluded, exclusions.version, exited, execed, verify)
+
+
+def _iter_non_excluded(state: AppState) -> tuple[str, ...]:
+    """Return a deduplicated, sorted tuple of non-excluded process names."""
+    return take_process_snapshot(state).names
 
 
 # ---------------------------------------------------------------------------
 # Game detection
 # ---------------------------------------------------------------------------
 
-def get_current_game(state: AppState) -> str | None:
-    """Scan running processes and return the first matching game name.
+def compiled_matcher(state: AppState, config: ConfigSnapshot | None = None) -> GameMatcher:
+    """Return the matcher for *config* (default: the current snapshot), compiled once per version."""
+    return (config if config is not None else state.config).derived("matcher", _compile_matcher)
+
+
+def _compile_matcher(config: ConfigSnapshot) -> GameMatcher:
+    matcher = GameMatcher(config.process_names)
+    logger.debug("Compiled matcher for %d mappings (config v%d)", len(matcher), config.version)
+    return matcher
+
+
+def get_current_game(state: AppState, snapshot: ProcessSnapshot | None = None) -> str | None:
+    """Return the configured game whose process is running, if any.
 
     The algorithm:
-    1. Collect all non-excluded process names in one pass.
-    2. For each configured ``(game, expected_proc)`` mapping, try exact
-       and fuzzy matches.  The first hit wins.
+    1. Take the non-excluded process names from *snapshot* (refreshing the
+       shared snapshot when none is given).
+    2. Return the memoized decision if the filtered process set, the
+       mappings and the exclusions are all unchanged since the last call.
+    3. Otherwise run the names through the compiled :class:`GameMatcher` in
+       one pass; when several games match, its priority rules pick the winner.
     """
-    detected: list[str] = []
-    for proc_name in _iter_non_excluded(state):
-        detected.append(proc_name)
-
-        for game, expected_proc in state.process_names.items():
-            if _proc_matches(proc_name, expected_proc):
-                logger.info("FOUND GAME: %s (process: %s)", game, proc_name)
-                return game
+    config = state.config
+    if snapshot is None:
+        snapshot = take_process_snapshot(state)
+
+    # Most scans see exactly the same processes and config as the last one.
+    key = (snapshot.fingerprint, config, state.exclusion_filter.version)
+    cached = state.processes.detection
+    if cached is not None and cached[0] == key:
+        metrics.DETECTIONS.inc("cached")
+        return cached[1]
+
+    with tracing.span("match", names=len(snapshot.names)) as sp:
+        hit = compiled_matcher(state, config).best(snapshot.names)
+        sp.set("game", hit.game if hit is not None else None)
+    state.processes.detection = (key, hit.game if hit is not None else None)
+    metrics.DETECTIONS.inc("match" if hit is not None else "miss")
+    if hit is not None:
+        logger.info("FOUND GAME: %s (process: %s)", hit.game, hit.process)
+        return hit.game
 
     # Diagnostics
-    logger.debug(
-        "Looking for: %s – recent processes (non-excluded): %s",
-        list(state.process_names.values()),
-        detected[-10:],
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Looking for: %s – recent processes (non-excluded): %s",
+            list(config.process_names.values()),
+            list(snapshot.names[-10:]),
+        )
     return None
 
 
-def _proc_matches(actual: str, expected: str) -> bool:
-    """Fuzzy-match a process name against the configured expected name."""
-    if not expected:
-        return False
-    a = actual.lower()
-    e = expected.lower()
-    return a == e or e in a
-
-
 # ---------------------------------------------------------------------------
 # Debugging
 # ---------------------------------------------------------------------------
 
 def debug_all_processes(state: AppState) -> None:
-    """Print a full snapshot of running processes (for troubleshooting)."""
-    all_names = _iter_non_excluded(state)
-    expected_vals = {v.lower() for v in state.process_names.values() if v}
+    """Print the current process snapshot (for troubleshooting)."""
+    config = state.config
+    all_names = state.processes.current.names
+    matched = {hit.process for hit in compiled_matcher(state, config).match_all(all_names)}
 
     logger.debug("=== DEBUG: Running Processes ===")
     logger.debug("Total unique (non-excluded): %d", len(all_names))
-    for game, proc_name in state.process_names.items():
+    for game, proc_name in config.process_names.items():
         logger.debug("  Configured: %s → '%s'", game, proc_name)
 
     for i, name in enumerate(all_names):
-        marker = "  <-- POTENTIAL MATCH" if any(
-            ev and ev in name.lower() for ev in expected_vals
-        ) else ""
+        marker = "  <-- POTENTIAL MATCH" if name in matched else ""
         logger.debug("  %3d. %s%s", i, name, marker)
     logger.debug("=== END DEBUG ===")
 
@@ -119,47 +137,121 @@ def debug_all_processes(state: AppState) -> None:
 # Monitoring loop
 # ---------------------------------------------------------------------------
 
-def monitor_game_and_update_title(state: AppState, twitch_client: TwitchClient) -> None:
-    """Main loop: detect game → update Twitch title & category."""
+def monitor_game_and_update_title(
+    state: AppState,
+    outbox: UpdateOutbox,
+    event_source: ProcessEventSource | None = None,
+    stop_event: threading.Event | None = None,
+) -> None:
+    """Main loop: detect game → queue the Twitch title & category update.
+
+    A scan runs as soon as *event_source* reports a process start/exit, and
+    otherwise after the interval chosen by an :class:`AdaptivePollScheduler`
+    (short after the process set changed, backing off while it is stable).
+    Polling event sources keep diffing PIDs every ``EVENT_POLL_INTERVAL_SEC``
+    whatever the interval, so a game launch is normally noticed within about
+    a second.  While the scheduler reports a busy CPU, process events are
+    batched instead and scanned at most once per interval.  Detections pass
+    through a :class:`GameSwitchDebouncer` before they reach Twitch, and
+    delivery happens on the *outbox* worker, so a slow Twitch API never
+    delays detection.  Runs until *stop_event* is set (call
+    ``event_source.wake()`` as well to interrupt a pending wait).
+    """
+    source = event_source if event_source is not None else create_event_source()
+    stop = stop_event if stop_event is not None else threading.Event()
     last_game: str | None = None
     cycle_count: int = 0
+    exited: list[int] = []
+    execed: list[int] = []
+    full_rescan = False
+    last_fingerprint: int | None = None
+    debouncer = GameSwitchDebouncer(state.switch_policy)
+    scheduler = AdaptivePollScheduler(state.poll_policy)
 
     logger.info("Starting game monitoring for %d games", len(state.process_names))
+    take_process_snapshot(state)
     debug_all_processes(state)
 
-    while True:
-        detected_game = get_current_game(state)
-
-        if detected_game is None:
-            state.current_game = NO_GAME_LABEL
-            if state.keep_last_when_no_game:
-                time.sleep(POLL_INTERVAL_SEC)
-                continue
-            current_game = FALLBACK_CATEGORY
-        else:
-            current_game = detected_game
-            state.current_game = current_game
-
-        if current_game != last_game:
-            last_game = current_game
-            logger.info("Game changed → %s", current_game)
-            _push_update(state, twitch_client, current_game)
-
-        cycle_count += 1
-        if cycle_count >= PERIODIC_DEBUG_CYCLES:
-            logger.debug("--- Periodic process check ---")
-            get_current_game(state)  # re-scan for logging
-            cycle_count = 0
-
-        time.sleep(POLL_INTERVAL_SEC)
-
-
-def _push_update(state: AppState, twitch_client: TwitchClient, game: str) -> None:
-    """Build the formatted title and push it + the category to Twitch."""
-    new_title = format_title(state.base_template, game)
-    if state.custom_suffix:
-        new_title = f"{new_title} {state.custom_suffix}"
-    twitch_client.update_stream_title(new_title)
-
-    category = state.twitch_categories.get(game, FALLBACK_CATEGORY)
-    twitch_client.update_stream_category(category)
+    while not stop.is_set():
+        with tracing.span("monitor.cycle"):
+            scan_start = time.perf_counter()
+            with tracing.span("snapshot", exited=len(exited), execed=len(execed), full=full_rescan):
+                snapshot = take_process_snapshot(state, exited, execed, verify=full_rescan)
+            detected_game = get_current_game(state, snapshot)
+            metrics.SCAN_SECONDS.observe(time.perf_counter() - scan_start)
+            metrics.PROCESSES.set(len(snapshot.entries))
+            metrics.EXCLUDED_PROCESSES.set(snapshot.excluded)
+            metrics.CANDIDATE_NAMES.set(len(snapshot.names))
+
+            state.update_observed(current_game=detected_game if detected_game is not None else NO_GAME_LABEL)
+
+            # Only switch once the detection has settled (see switch_policy).
+            now = time.monotonic()
+            debouncer.policy = state.switch_policy
+            with tracing.span("debounce"):
+                debouncer.observe(detected_game, now)
+
+            current_game: str | None = debouncer.committed
+            if current_game is None and debouncer.decided and not state.keep_last_when_no_game:
+                current_game = FALLBACK_CATEGORY
+
+            changed = snapshot.fingerprint != last_fingerprint
+            last_fingerprint = snapshot.fingerprint
+            if current_game is not None and current_game != last_game:
+                changed = True
+                last_game = current_game
+                logger.info("Game changed → %s", current_game)
+                metrics.GAME_SWITCHES.inc()
+                metrics.CURRENT_GAME.replace(1, current_game)
+                _push_update(state, outbox, current_game)
+
+            cycle_count += 1
+            if cycle_count >= PERIODIC_DEBUG_CYCLES:
+                logger.debug(
+                    "--- Periodic process check --- %d processes (non-excluded), detected: %s",
+                    len(snapshot.names),
+                    detected_game,
+                )
+                cycle_count = 0
+
+        scheduler.policy = state.poll_policy
+        interval = scheduler.next_interval(changed, now)
+        state.update_observed(poll_interval=interval, poll_mode=scheduler.mode)
+        metrics.POLL_INTERVAL.set(interval)
+        due = debouncer.seconds_until_due(now)
+        timeout = interval if due is None else min(interval, due)
+        events = _wait_for_process_change(source, timeout)
+        if events and scheduler.mode == MODE_CPU_BUSY:
+            # Under load, fold the churn into at most one scan per interval.
+            deadline = now + timeout
+            while (remaining := deadline - time.monotonic()) > 0 and not stop.is_set():
+                events.extend(source.wait(remaining))
+        exited = [e.pid for e in events if e.kind == EVENT_EXIT]
+        execed = [e.pid for e in events if e.kind == EVENT_EXEC]
+        # The timeout-driven rescan (or a dropped-event wildcard) also
+        # re-checks create times, catching PIDs reused between two diffs.
+        full_rescan = not events or -1 in execed
+
+
+def _wait_for_process_change(source: ProcessEventSource, timeout: float) -> list[ProcessEvent]:
+    """Block until processes start or exit (or *timeout*), coalescing bursts.
+
+    A game launch usually spawns several processes (launcher, anti-cheat,
+    the game itself); collecting the burst makes it cost a single scan.
+    """
+    events = source.wait(timeout)
+    if events:
+        events.extend(source.wait(EVENT_SETTLE_SEC))
+    return events
+
+
+def _push_update(state: AppState, outbox: UpdateOutbox, game: str) -> None:
+    """Build the formatted title and queue it + the category for Twitch."""
+    config = state.config
+    with tracing.span("format_title"):
+        new_title = format_title(config.base_template, game)
+        if state.custom_suffix:
+            new_title = f"{new_title} {state.custom_suffix}"
+        category = config.twitch_categories.get(game, FALLBACK_CATEGORY)
+    with tracing.span("outbox.submit"):
+        outbox.submit(ChannelUpdate(title=new_title, category=category))
@@ -0,0 +1,185 @@
+"""Incremental, PID-keyed process table shared by the monitor and the UI.
+
+Instead of walking every process on every scan, the service keeps a
+``pid → (name, create_time, excluded)`` table and only resolves PIDs that
+appeared since the previous refresh – or that exec'd a new program, or
+whose create time shows the PID was reused.  Readers get an immutable, versioned
+:class:`ProcessSnapshot`; the version only changes when the table does.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, NamedTuple
+
+import psutil
+
+import tracing
+
+if TYPE_CHECKING:
+    from config_snapshot import ConfigSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessEntry(NamedTuple):
+    """Cached facts about one running process."""
+
+    name: str
+    create_time: float
+    excluded: bool
+
+
+@dataclass(frozen=True)
+class ProcessSnapshot:
+    """Immutable view of the process table at one point in time."""
+
+    version: int = 0
+    entries: Mapping[int, ProcessEntry] = field(default_factory=lambda: MappingProxyType({}))
+    names: tuple[str, ...] = ()
+    """Deduplicated, case-insensitively sorted non-excluded process names."""
+    fingerprint: int = hash(())
+    """Hash of :attr:`names`; equal when the filtered name set is unchanged."""
+    excluded: int = 0
+    """Number of processes hidden by the exclusion filter (or nameless)."""
+
+
+def _resolve_pid(pid: int) -> tuple[str, float] | None:
+    """Return ``(name, create_time)`` for *pid*, or ``None`` if it vanished."""
+    try:
+        proc = psutil.Process(pid)
+        name = proc.name() or ""
+    except psutil.NoSuchProcess:
+        return None
+    except psutil.AccessDenied:
+        return "", 0.0
+    try:
+        create_time = proc.create_time()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        create_time = 0.0
+    return name, create_time
+
+
+def _pid_create_time(pid: int) -> float | None:
+    """Return the create time of *pid* (``0.0`` if unknown), or ``None`` if it vanished."""
+    try:
+        return psutil.Process(pid).create_time()
+    except psutil.NoSuchProcess:
+        return None
+    except psutil.AccessDenied:
+        return 0.0
+
+
+def _create_time_from(
+    resolve: Callable[[int], tuple[str, float] | None],
+) -> Callable[[int], float | None]:
+    def create_time(pid: int) -> float | None:
+        resolved = resolve(pid)
+        return None if resolved is None else resolved[1]
+    return create_time
+
+
+class ProcessSnapshotService:
+    """Maintain the process table incrementally; safe to share across threads.
+
+    ``list_pids``, ``resolve`` and ``create_time`` default to psutil and can
+    be replaced with a synthetic process table for benchmarks (by default
+    ``create_time`` then reads the second field of ``resolve``).
+    """
+
+    def __init__(
+        self,
+        list_pids: Callable[[], Iterable[int]] = psutil.pids,
+        resolve: Callable[[int], tuple[str, float] | None] = _resolve_pid,
+        create_time: Callable[[int], float | None] | None = None,
+    ) -> None:
+        if create_time is None:
+            create_time = _pid_create_time if resolve is _resolve_pid else _create_time_from(resolve)
+        self._list_pids = list_pids
+        self._resolve = resolve
+        self._create_time = create_time
+        self._lock = threading.Lock()
+        self._table: dict[int, ProcessEntry] = {}
+        self._exclusions_version: int | None = None
+        self._snapshot: ProcessSnapshot = ProcessSnapshot()
+        # (fingerprint, config, exclusions version) → detected game, kept by
+        # process_monitor.get_current_game next to the snapshot it is keyed on.
+        self.detection: tuple[tuple[int, ConfigSnapshot, int], str | None] | None = None
+
+    @property
+    def current(self) -> ProcessSnapshot:
+        """The most recently published snapshot (no refresh)."""
+        return self._snapshot
+
+    def refresh(
+        self,
+        is_excluded: Callable[[str], bool],
+        exclusions_version: int,
+        exited: Iterable[int] = (),
+        execed: Iterable[int] = (),
+        verify: bool = False,
+    ) -> ProcessSnapshot:
+        """Apply the PID churn since the last call and return the new snapshot.
+
+        *exited* and *execed* list PIDs known to have exited or exec'd a new
+        program (e.g. from process events); they are dropped first so they
+        resolve afresh.  With *verify*, every known PID's create time is
+        re-read to catch PIDs reused between two refreshes (one syscall per
+        process, so callers do it on their slow full-rescan cadence).
+        """
+        with self._lock:
+            table = self._table
+            changed = False
+            for pid in (*exited, *execed):
+                changed |= table.pop(pid, None) is not None
+
+            if verify:
+                with tracing.span("snapshot.verify_create_times", processes=len(table)):
+                    for pid, entry in list(table.items()):
+                        if not entry.create_time:
+                            continue
+                        create_time = self._create_time(pid)
+                        if create_time is None or (create_time and create_time != entry.create_time):
+                            del table[pid]
+                            changed = True
+
+            with tracing.span("snapshot.list_pids"):
+                pids = set(self._list_pids())
+            gone = table.keys() - pids
+            for pid in gone:
+                del table[pid]
+            changed |= bool(gone)
+
+            if exclusions_version != self._exclusions_version:
+                with tracing.span("snapshot.rescore_exclusions", processes=len(table)):
+                    for pid, entry in table.items():
+                        table[pid] = entry._replace(excluded=not entry.name or is_excluded(entry.name))
+                self._exclusions_version = exclusions_version
+                changed = True
+
+            new_pids = pids - table.keys()
+            if new_pids:
+                # Resolving a name and filtering it happen together per PID.
+                with tracing.span("snapshot.resolve_and_filter", processes=len(new_pids)):
+                    for pid in new_pids:
+                        resolved = self._resolve(pid)
+                        if resolved is None:
+                            continue
+                        name, create_time = resolved
+                        table[pid] = ProcessEntry(name, create_time, not name or is_excluded(name))
+                        changed = True
+
+            if changed:
+                visible = {e.name for e in table.values() if not e.excluded}
+                names = tuple(sorted(visible, key=str.lower))
+                self._snapshot = ProcessSnapshot(
+                    version=self._snapshot.version + 1,
+                    entries=MappingProxyType(dict(table)),
+                    names=names,
+                    fingerprint=hash(names),
+                    excluded=sum(e.excluded for e in table.values()),
+                )
+            return self._snapshot
@@ -0,0 +1,61 @@
+"""Token bucket mirrored from Twitch Helix ``Ratelimit-*`` response headers.
+
+Helix reports the bucket size (``Ratelimit-Limit``), the points left
+(``Ratelimit-Remaining``) and the epoch second at which the bucket is full
+again (``Ratelimit-Reset``) on every response.  The limiter spends one
+point per request locally and resynchronizes from each response, so a
+request is only delayed when the bucket is actually empty – and then
+exactly until the reset time instead of a blind backoff.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Mapping
+
+DEFAULT_BUCKET_SIZE: int = 800
+
+
+class HelixRateLimiter:
+    """Thread-safe local mirror of the Helix rate-limit bucket."""
+
+    def __init__(self, limit: int = DEFAULT_BUCKET_SIZE) -> None:
+        self._lock = threading.Lock()
+        self.limit: int = limit
+        self._remaining: int = limit
+        self._reset_at: float = 0.0  # time.monotonic() value
+
+    @property
+    def remaining(self) -> int:
+        """Points left in the bucket as last reported (minus local spends)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._remaining
+
+    def reserve(self) -> float:
+        """Spend one point and return ``0``, or return the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            self._refill(now)
+            if self._remaining > 0:
+                self._remaining -= 1
+                return 0.0
+            return max(0.0, self._reset_at - now)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Resynchronize from a response's ``Ratelimit-*`` headers (if present)."""
+        try:
+            limit = int(headers["Ratelimit-Limit"])
+            remaining = int(headers["Ratelimit-Remaining"])
+            reset_epoch = float(headers["Ratelimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self.limit = limit
+            self._remaining = remaining
+            self._reset_at = time.monotonic() + max(0.0, reset_epoch - time.time())
+
+    def _refill(self, now: float) -> None:
+        if self._remaining <= 0 and now >= self._reset_at:
+            self._remaining = self.limit
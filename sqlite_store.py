@@ -0,0 +1,212 @@
+"""SQLite storage backend for large mapping libraries.
+
+Selected with ``"storage": {"backend": "sqlite"}`` in config.json (see
+:mod:`config_store`).  The game → process → category mappings, the
+category → game id cache and the exclusion lists live in indexed tables of
+one database file, so an edit touches only its own rows instead of
+rewriting a JSON file with thousands of entries.  The other settings stay
+in config.json.
+
+Uses only the standard library; the connection is shared between threads
+behind a lock.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Mapping
+
+from config_snapshot import CATEGORIES_KEY, MAPPINGS_KEY
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION: int = 1
+
+EXCLUDE_NAME: str = "name"
+EXCLUDE_PREFIX: str = "prefix"
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS mappings (
+    game     TEXT PRIMARY KEY,
+    process  TEXT NOT NULL,
+    category TEXT
+);
+CREATE INDEX IF NOT EXISTS mappings_by_category ON mappings (category);
+CREATE TABLE IF NOT EXISTS game_ids (
+    category  TEXT PRIMARY KEY,
+    game_id   TEXT,
+    game_name TEXT,
+    fetched   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exclusions (
+    kind  TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (kind, value)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_MAPPING: str = (
+    "INSERT INTO mappings (game, process, category) VALUES (?, ?, ?) "
+    "ON CONFLICT (game) DO UPDATE SET "
+    "process = excluded.process, category = COALESCE(excluded.category, mappings.category)"
+)
+
+
+class MappingStore:
+    """One SQLite database holding mappings, game ids and exclusions.
+
+    A new database (:attr:`is_new`) has no tables until :meth:`create` fills
+    it from the JSON files.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self.is_new = self._conn.execute("PRAGMA user_version").fetchone()[0] == 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Mappings
+    # ------------------------------------------------------------------
+
+    def load_mappings(self) -> tuple[dict[str, str], dict[str, str]]:
+        """Return ``(process_name, TwitchCategoryName)`` dicts keyed by game."""
+        with self._lock:
+            rows = self._conn.execute("SELECT game, process, category FROM mappings ORDER BY game").fetchall()
+        process_names = {game: process for game, process, _ in rows}
+        categories = {game: category for game, _, category in rows if category}
+        return process_names, categories
+
+    def edit_mappings(
+        self,
+        upserts: Mapping[str, tuple[str, str | None]] | None = None,
+        removals: Iterable[str] = (),
+    ) -> None:
+        """Delete *removals*, then upsert ``{game: (process, category)}`` – one transaction.
+
+        A ``None`` category leaves the game's existing category untouched.
+        """
+        with self._lock, self._transaction():
+            self._edit_mappings(upserts, removals)
+
+    def _edit_mappings(self, upserts: Mapping[str, tuple[str, str | None]] | None, removals: Iterable[str]) -> None:
+        self._conn.executemany("DELETE FROM mappings WHERE game = ?", ((game,) for game in removals))
+        self._conn.executemany(
+            _UPSERT_MAPPING,
+            ((game, process, category or None) for game, (process, category) in (upserts or {}).items()),
+        )
+
+    def categories(self) -> list[str]:
+        """Distinct categories used by the mappings."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT category FROM mappings WHERE category IS NOT NULL ORDER BY category"
+            ).fetchall()
+        return [category for (category,) in rows]
+
+    # ------------------------------------------------------------------
+    # Category → game id cache
+    # ------------------------------------------------------------------
+
+    def load_game_ids(self) -> dict[str, dict[str, Any]]:
+        """Return entries in the ``game_cache.json`` shape."""
+        with self._lock:
+            rows = self._conn.execute("SELECT category, game_id, game_name, fetched FROM game_ids").fetchall()
+        return {key: {"id": game_id, "name": name, "fetched": fetched} for key, game_id, name, fetched in rows}
+
+    def save_game_ids(self, entries: Mapping[str, Mapping[str, Any]]) -> None:
+        """Insert or replace the given cache entries (other rows are kept)."""
+        with self._lock, self._transaction():
+            self._save_game_ids(entries)
+
+    def _save_game_ids(self, entries: Mapping[str, Mapping[str, Any]]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO game_ids (category, game_id, game_name, fetched) VALUES (?, ?, ?, ?)",
+            (
+                (key, entry.get("id"), entry.get("name"), entry["fetched"])
+                for key, entry in entries.items()
+                if "fetched" in entry
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Exclusions
+    # ------------------------------------------------------------------
+
+    def load_exclusions(self) -> dict[str, list[str]]:
+        """Return the lists in the ``excluded_processes.json`` shape."""
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, value FROM exclusions ORDER BY value").fetchall()
+        return {
+            "exclude_process_names": [value for kind, value in rows if kind == EXCLUDE_NAME],
+            "exclude_prefixes": [value for kind, value in rows if kind == EXCLUDE_PREFIX],
+        }
+
+    def save_exclusions(self, names: Iterable[str], prefixes: Iterable[str]) -> None:
+        """Make the stored lists equal *names* / *prefixes*, touching only changed rows."""
+        with self._lock, self._transaction():
+            self._save_exclusions(names, prefixes)
+
+    def _save_exclusions(self, names: Iterable[str], prefixes: Iterable[str]) -> None:
+        wanted = {(EXCLUDE_NAME, n) for n in names if n} | {(EXCLUDE_PREFIX, p) for p in prefixes if p}
+        current = set(self._conn.execute("SELECT kind, value FROM exclusions").fetchall())
+        self._conn.executemany("DELETE FROM exclusions WHERE kind = ? AND value = ?", current - wanted)
+        self._conn.executemany("INSERT INTO exclusions (kind, value) VALUES (?, ?)", wanted - current)
+
+    # ------------------------------------------------------------------
+    # Creation (JSON migration)
+    # ------------------------------------------------------------------
+
+    def create(
+        self,
+        config: Mapping[str, Any],
+        game_ids: Mapping[str, Mapping[str, Any]],
+        exclusions: Mapping[str, Any],
+    ) -> None:
+        """Create the tables and copy the JSON-format data (config.json
+        mappings, game_cache.json entries, excluded_processes.json lists)
+        into them.
+
+        Everything, including the schema version that marks the database
+        as initialised, is one transaction: an interrupted import leaves a
+        database that is still :attr:`is_new` and is imported again.
+        """
+        process_names = config.get(MAPPINGS_KEY) or {}
+        categories = config.get(CATEGORIES_KEY) or {}
+        with self._lock, self._transaction():
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    self._conn.execute(statement)
+            self._edit_mappings(
+                {game: (process, categories.get(game)) for game, process in process_names.items()}, ()
+            )
+            self._save_game_ids(game_ids)
+            self._save_exclusions(exclusions.get("exclude_process_names", []), exclusions.get("exclude_prefixes", []))
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.is_new = False
+        logger.info("Imported %d mappings and %d cached game ids into %s", len(process_names), len(game_ids), self.path)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """``BEGIN`` … ``COMMIT`` (``ROLLBACK`` on error); the connection autocommits otherwise."""
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
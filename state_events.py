@@ -0,0 +1,63 @@
+"""Change notifications from worker threads to the UI.
+
+The monitor thread publishes the state fields the window displays (the
+detected game, the scan interval); the UI binds a *notify* callback that
+wakes the Tk loop (``event_generate``) and drains the changes there.  Only
+the latest value per field is kept, so nothing piles up while no UI is
+attached (headless mode) or while the window is busy, and a burst of
+changes costs a single wakeup.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class StateChanges:
+    """Latest-value mailbox for observable state fields."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[str, Any] = {}
+        self._notify: Callable[[], None] | None = None
+        self._signalled: bool = False
+
+    def bind(self, notify: Callable[[], None] | None) -> None:
+        """Call *notify* (from the publishing thread) when changes arrive."""
+        with self._lock:
+            self._notify = notify
+            self._signalled = False
+            pending = bool(self._pending)
+        if pending and notify is not None:
+            self._signal()
+
+    def publish(self, field: str, value: Any) -> None:
+        with self._lock:
+            self._pending[field] = value
+        self._signal()
+
+    def drain(self) -> dict[str, Any]:
+        """Return and clear the changes published since the last drain."""
+        with self._lock:
+            changes, self._pending = self._pending, {}
+            self._signalled = False
+        return changes
+
+    def _signal(self) -> None:
+        with self._lock:
+            notify = self._notify
+            if notify is None or self._signalled:
+                return
+            self._signalled = True
+        try:
+            notify()
+        except Exception:
+            # The window was closed; keep collecting silently, but let the
+            # next publish try again in case the failure was transient.
+            with self._lock:
+                self._signalled = False
+            logger.debug("State change notification failed", exc_info=True)
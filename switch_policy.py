@@ -0,0 +1,103 @@
+"""Hysteresis between raw game detection and Twitch updates.
+
+Launchers, anti-cheat helpers and the game itself often start and stop in
+quick succession.  :class:`GameSwitchDebouncer` only commits a new game
+once it has been observed consistently, ignores short "no game" gaps while
+a game is committed, and caps how many switches are committed per minute.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Mapping
+
+SWITCH_RECHECK_SEC: float = 1.0
+_RATE_WINDOW_SEC: float = 60.0
+
+
+@dataclass(frozen=True)
+class SwitchPolicy:
+    """Tunables, read from the ``switch_policy`` object in config.json.
+
+    A new game is committed once it has been seen in *stable_observations*
+    consecutive scans **and** for *stable_seconds*; set either to ``0`` to
+    rely on the other alone.
+    """
+
+    stable_observations: int = 2
+    stable_seconds: float = 3.0
+    no_game_grace_seconds: float = 15.0
+    max_switches_per_minute: int = 4
+
+    @classmethod
+    def from_config(cls, raw: Mapping[str, Any] | None) -> SwitchPolicy:
+        """Build a policy from config values, keeping defaults for bad entries."""
+        values: dict[str, Any] = {}
+        for f in fields(cls):
+            value = (raw or {}).get(f.name)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+                values[f.name] = type(f.default)(value)
+        return cls(**values)
+
+
+class GameSwitchDebouncer:
+    """Turn a stream of raw detections into committed game switches.
+
+    All methods take the current monotonic time explicitly, which keeps the
+    stage deterministic and replayable.
+    """
+
+    def __init__(self, policy: SwitchPolicy | None = None) -> None:
+        self.policy: SwitchPolicy = policy or SwitchPolicy()
+        self.committed: str | None = None
+        self.decided: bool = False
+        """``False`` until the first commit; nothing should be pushed before."""
+        self._candidate: str | None = None
+        self._candidate_since: float = 0.0
+        self._candidate_count: int = 0
+        self._switch_times: deque[float] = deque()
+
+    def observe(self, game: str | None, now: float) -> bool:
+        """Feed one detection; return ``True`` if it committed a switch."""
+        if self.decided and game == self.committed:
+            self._candidate_count = 0
+            return False
+        if game != self._candidate or self._candidate_count == 0:
+            self._candidate = game
+            self._candidate_since = now
+            self._candidate_count = 0
+        self._candidate_count += 1
+
+        if self._remaining_stability(now) > 0 or self._remaining_rate_limit(now) > 0:
+            return False
+        self.committed = game
+        self.decided = True
+        self._candidate_count = 0
+        self._switch_times.append(now)
+        return True
+
+    def seconds_until_due(self, now: float) -> float | None:
+        """Seconds until the pending candidate may be committed, if one is pending.
+
+        The monitor uses this to re-check even when no process events arrive.
+        """
+        if self._candidate_count == 0:
+            return None
+        return max(0.0, self._remaining_stability(now), self._remaining_rate_limit(now))
+
+    def _remaining_stability(self, now: float) -> float:
+        elapsed = now - self._candidate_since
+        if self._candidate is None and self.committed is not None:
+            return self.policy.no_game_grace_seconds - elapsed
+        if self._candidate_count < self.policy.stable_observations:
+            return max(SWITCH_RECHECK_SEC, self.policy.stable_seconds - elapsed)
+        return self.policy.stable_seconds - elapsed
+
+    def _remaining_rate_limit(self, now: float) -> float:
+        limit = self.policy.max_switches_per_minute
+        while self._switch_times and now - self._switch_times[0] >= _RATE_WINDOW_SEC:
+            self._switch_times.popleft()
+        if limit <= 0 or len(self._switch_times) < limit:
+            return 0.0
+        return _RATE_WINDOW_SEC - (now - self._switch_times[0])
@@ -0,0 +1,58 @@
+"""ConfigJournal: replay after a crash, and no in-memory edit without a durable write."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from config_journal import ConfigJournal, map_op, set_op
+
+
+def _journal(tmp_path, write_config=None) -> ConfigJournal:
+    path = tmp_path / "config.json"
+    if not path.exists():
+        path.write_text(json.dumps({"language": "en", "process_name": {}}), encoding="utf-8")
+
+    def write(data):
+        path.write_text(json.dumps(data), encoding="utf-8")
+
+    return ConfigJournal(
+        str(tmp_path / "config.journal"),
+        read_config=lambda: json.loads(path.read_text(encoding="utf-8")),
+        write_config=write_config or write,
+    )
+
+
+def test_uncompacted_edits_are_replayed(tmp_path) -> None:
+    journal = _journal(tmp_path)
+    assert journal.commit([map_op("Valorant", "valorant.exe", "VALORANT")])
+    assert journal.pending == 1
+
+    recovered = _journal(tmp_path).load()  # as after a crash before compaction
+    assert recovered["process_name"] == {"Valorant": "valorant.exe"}
+    assert recovered["TwitchCategoryName"] == {"Valorant": "VALORANT"}
+
+
+def test_no_op_commit_is_not_journaled(tmp_path) -> None:
+    journal = _journal(tmp_path)
+    assert not journal.commit([set_op("language", "en")])
+    assert journal.pending == 0
+
+
+def test_failed_commit_leaves_memory_matching_disk(tmp_path) -> None:
+    def broken_write(data):
+        raise OSError("disk full")
+
+    journal = _journal(tmp_path, write_config=broken_write)
+    journal.load()
+    good_path, journal.path = journal.path, str(tmp_path)  # appending to a directory fails
+    with pytest.raises(OSError):
+        journal.commit([set_op("language", "zh")])
+    assert journal.pending == 0
+
+    # Had the failed edit stayed in memory, retrying it would be a no-op.
+    journal.path = good_path
+    assert journal.commit([set_op("language", "zh")])
+    assert _journal(tmp_path).load()["language"] == "zh"
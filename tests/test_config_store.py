@@ -0,0 +1,29 @@
+"""Hot reload of config.json keeps the app's own pending edits."""
+
+from __future__ import annotations
+
+import json
+
+from app_state import AppState
+from config_store import CONFIG_FILENAME, add_custom_game, apply_config_to_state, flush_config, load_config, reload_config
+
+
+def test_reload_keeps_pending_mapping_edits(tmp_path) -> None:
+    base_dir = str(tmp_path)
+    (tmp_path / CONFIG_FILENAME).write_text(
+        json.dumps({"base": " %game%", "language": "en", "process_name": {"Minecraft": "javaw.exe"}}),
+        encoding="utf-8",
+    )
+    state = AppState()
+    apply_config_to_state(state, load_config(base_dir))
+    assert add_custom_game(base_dir, state, "Valorant", "valorant.exe", "VALORANT")
+
+    # An editor changes config.json before the edit above was compacted.
+    external = json.loads((tmp_path / CONFIG_FILENAME).read_text(encoding="utf-8"))
+    external["language"] = "zh"
+    reload_config(base_dir, state, external)
+
+    assert state.language == "zh"
+    assert dict(state.process_names) == {"Minecraft": "javaw.exe", "Valorant": "valorant.exe"}
+    assert state.twitch_categories["Valorant"] == "VALORANT"
+    flush_config(base_dir)
@@ -0,0 +1,78 @@
+"""Bulk mapping import: dedupe, batched category checks, one write."""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+
+import pytest
+
+from app_state import HELIX_GAMES_BATCH_SIZE, AppState
+from benchmarks.fake_helix import FakeHelix
+from config_journal import JOURNAL_FILENAME
+from config_store import CONFIG_FILENAME, apply_config_to_state, flush_config, load_config
+from mapping_import import import_mapping_file, read_mapping_file
+from twitch_client import TwitchClient
+
+KNOWN = {f"Category {i}": str(100000 + i) for i in range(230)}
+UNKNOWN = [f"Unknown Category {i}" for i in range(20)]
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    config = {"base": " %game%", "process_name": {"Game 0": "game0.exe", "Game 1": "game1.exe"}}
+    (tmp_path / CONFIG_FILENAME).write_text(json.dumps(config), encoding="utf-8")
+    yield str(tmp_path)
+    flush_config(str(tmp_path))
+
+
+def _write_csv(path: str, rows: list[tuple[str, str, str]]) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["game", "process", "category"])
+        writer.writerows(rows)
+
+
+def _journal_entries(base_dir: str) -> int:
+    with open(os.path.join(base_dir, JOURNAL_FILENAME), "r", encoding="utf-8") as fh:
+        return sum(1 for line in fh if line.strip())
+
+
+def test_import_dedupes_batches_and_writes_once(base_dir: str) -> None:
+    names = list(KNOWN) + UNKNOWN
+    rows = [(f"Game {i}", f"game{i}.exe", names[i % len(names)].lower()) for i in range(500)]
+    rows += rows[-10:]
+    path = os.path.join(base_dir, "library.csv")
+    _write_csv(path, rows)
+
+    state = AppState()
+    apply_config_to_state(state, load_config(base_dir))
+    with FakeHelix(games=KNOWN) as helix:
+        client = TwitchClient("client-id", "token", helix.channel["broadcaster_id"], api_base=helix.base_url)
+        report = import_mapping_file(base_dir, state, path, client.resolve_games)
+        lookups = helix.count("GET", "/games")
+
+    assert (report.added, report.existing, report.duplicates) == (498, 2, 10)
+    assert sorted(report.unresolved) == sorted(name.lower() for name in UNKNOWN)
+    assert lookups == math.ceil(len(names) / HELIX_GAMES_BATCH_SIZE)
+    assert _journal_entries(base_dir) == 1
+    assert len(state.process_names) == 500
+    assert state.twitch_categories["Game 2"] == "Category 2"  # Twitch's spelling
+    assert state.twitch_categories["Game 230"] == "unknown category 0"  # kept as written
+
+
+def test_reads_config_json_format(tmp_path) -> None:
+    path = tmp_path / "other.json"
+    path.write_text(
+        json.dumps({"process_name": {"Valorant": "valorant.exe"}, "TwitchCategoryName": {"Valorant": "VALORANT"}}),
+        encoding="utf-8",
+    )
+    assert read_mapping_file(str(path)) == ([("Valorant", "valorant.exe", "VALORANT")], 0)
+
+
+def test_rows_without_game_or_process_are_counted(tmp_path) -> None:
+    path = tmp_path / "list.json"
+    path.write_text(json.dumps([{"game": "A", "process": "a.exe"}, {"game": "B"}, "junk"]), encoding="utf-8")
+    assert read_mapping_file(str(path)) == ([("A", "a.exe", None)], 2)
@@ -0,0 +1,121 @@
+"""Process events wake the monitor instead of the poll timeout."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import poll_scheduler
+from app_state import AppState
+from benchmarks.bench_end_to_end import INSTANT_POLICY, FakeProcessTable
+from config_snapshot import ConfigSnapshot
+from poll_scheduler import PollPolicy
+from process_events import EVENT_EXEC, ProcessEvent, SyntheticProcessEventSource
+from process_monitor import monitor_game_and_update_title
+from process_snapshot import ProcessSnapshotService
+
+SLOW_POLL = PollPolicy(min_seconds=30.0, max_seconds=30.0, cpu_busy_percent=0.0)
+
+
+class RecordingOutbox:
+    def __init__(self) -> None:
+        self.updates: list = []
+
+    def submit(self, update) -> None:
+        self.updates.append(update)
+
+
+def _wait_for(predicate, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_synthetic_source_returns_pushed_events() -> None:
+    source = SyntheticProcessEventSource()
+    source.push([ProcessEvent(EVENT_EXEC, 1), ProcessEvent(EVENT_EXEC, 2)])
+    assert [e.pid for e in source.wait(1.0)] == [1, 2]
+
+
+def test_wake_interrupts_wait() -> None:
+    source = SyntheticProcessEventSource()
+    threading.Timer(0.05, source.wake).start()
+    start = time.monotonic()
+    assert source.wait(5.0) == []
+    assert time.monotonic() - start < 1.0
+
+
+def _monitored_state(table: FakeProcessTable, poll_policy: PollPolicy, list_pids=None) -> AppState:
+    return AppState(
+        config=ConfigSnapshot.from_config({
+            "process_name": {"Valorant": "valorant.exe"},
+            "TwitchCategoryName": {"Valorant": "VALORANT"},
+        }),
+        processes=ProcessSnapshotService(list_pids=list_pids or table.pids, resolve=table.resolve),
+        keep_last_when_no_game=True,
+        switch_policy=INSTANT_POLICY,
+        poll_policy=poll_policy,
+    )
+
+
+def test_launch_event_wakes_the_monitor() -> None:
+    source = SyntheticProcessEventSource()
+    table = FakeProcessTable(source)
+    table.spawn("explorer.exe")
+    state = _monitored_state(table, SLOW_POLL)
+    outbox = RecordingOutbox()
+    stop = threading.Event()
+    monitor = threading.Thread(
+        target=monitor_game_and_update_title, args=(state, outbox, source, stop), daemon=True
+    )
+    monitor.start()
+    try:
+        # Let the first scan settle into its 30 s wait, then launch the game.
+        time.sleep(0.2)
+        assert outbox.updates == []
+        table.switch(None, "valorant.exe")
+        assert _wait_for(lambda: state.current_game == "Valorant", timeout=2.0)
+        assert _wait_for(lambda: len(outbox.updates) == 1, timeout=1.0)
+        assert outbox.updates[0].category == "VALORANT"
+    finally:
+        stop.set()
+        source.wake()
+        monitor.join(timeout=2.0)
+
+
+def test_busy_cpu_batches_process_events(monkeypatch) -> None:
+    monkeypatch.setattr(poll_scheduler.psutil, "cpu_percent", lambda interval=None: 100.0)
+    source = SyntheticProcessEventSource()
+    table = FakeProcessTable(source)
+    scans: list[float] = []
+
+    def counting_pids() -> list[int]:
+        scans.append(time.monotonic())
+        return table.pids()
+
+    busy = PollPolicy(min_seconds=2.0, max_seconds=2.0, cpu_busy_percent=50.0)
+    state = _monitored_state(table, busy, counting_pids)
+    stop = threading.Event()
+    monitor = threading.Thread(
+        target=monitor_game_and_update_title, args=(state, RecordingOutbox(), source, stop), daemon=True
+    )
+    monitor.start()
+    try:
+        time.sleep(0.2)
+        assert state.poll_mode == poll_scheduler.MODE_CPU_BUSY
+        first = len(scans)
+        for i in range(5):
+            table.spawn(f"helper_{i}.exe")
+            source.push([ProcessEvent(EVENT_EXEC, 0)])
+            time.sleep(0.2)
+        # Five bursts within one second, but at most one scan per 2 s interval.
+        assert len(scans) - first <= 1
+        table.switch(None, "valorant.exe")
+        assert _wait_for(lambda: state.current_game == "Valorant", timeout=3.0)
+    finally:
+        stop.set()
+        source.wake()
+        monitor.join(timeout=2.0)
@@ -0,0 +1,81 @@
+"""Migration of the JSON data into the SQLite backend."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import config_store
+from app_state import AppState
+from config_store import (
+    CONFIG_FILENAME,
+    DATABASE_FILENAME,
+    apply_config_to_state,
+    export_json,
+    load_config,
+    load_excluded_processes,
+)
+from sqlite_store import MappingStore
+
+CONFIG = {
+    "base": " %game%",
+    "storage": {"backend": "sqlite"},
+    "process_name": {"Valorant": "valorant.exe", "Minecraft": "javaw.exe"},
+    "TwitchCategoryName": {"Valorant": "VALORANT", "Old Game": "Retro"},
+}
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    (tmp_path / CONFIG_FILENAME).write_text(json.dumps(CONFIG), encoding="utf-8")
+    (tmp_path / "excluded_processes.json").write_text(
+        json.dumps({"exclude_process_names": ["svchost.exe"], "exclude_prefixes": ["system"]}), encoding="utf-8"
+    )
+    yield str(tmp_path)
+    store = config_store._store(str(tmp_path))
+    if store is not None:
+        export_json(str(tmp_path))
+
+
+def _config_json(base_dir: str) -> dict:
+    with open(f"{base_dir}/{CONFIG_FILENAME}", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def test_migration_moves_mappings_and_keeps_orphan_categories(base_dir: str) -> None:
+    state = AppState()
+    apply_config_to_state(state, load_config(base_dir))
+    load_excluded_processes(base_dir, state)
+
+    assert dict(state.process_names) == CONFIG["process_name"]
+    assert dict(state.twitch_categories) == {"Valorant": "VALORANT"}
+    assert state.excluded_names == {"svchost.exe"}
+    on_disk = _config_json(base_dir)
+    assert "process_name" not in on_disk
+    assert on_disk["TwitchCategoryName"] == {"Old Game": "Retro"}
+
+    assert export_json(base_dir)
+    on_disk = _config_json(base_dir)
+    assert on_disk["process_name"] == CONFIG["process_name"]
+    assert on_disk["TwitchCategoryName"] == CONFIG["TwitchCategoryName"]
+
+
+def test_failed_import_keeps_the_json_backend(base_dir: str, monkeypatch) -> None:
+    def broken_save(self, entries):
+        raise RuntimeError("interrupted")
+
+    monkeypatch.setattr(MappingStore, "_save_game_ids", broken_save)
+    config = load_config(base_dir)
+    assert not config_store.uses_database(base_dir)
+    assert config["process_name"] == CONFIG["process_name"]
+    assert _config_json(base_dir)["process_name"] == CONFIG["process_name"]
+
+    # The next start finds a database that is still new and imports again.
+    monkeypatch.undo()
+    store = MappingStore(f"{base_dir}/{DATABASE_FILENAME}")
+    assert store.is_new
+    store.close()
+    assert dict(load_config(base_dir)["process_name"]) == CONFIG["process_name"]
+    assert config_store.uses_database(base_dir)
+    assert "process_name" not in _config_json(base_dir)
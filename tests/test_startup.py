@@ -0,0 +1,18 @@
+"""Startup budget: ``import main`` stays cheap and keeps heavy modules lazy."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from benchmarks.bench_startup import REPO_ROOT
+
+
+def test_startup_budget() -> None:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--runs", "3"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
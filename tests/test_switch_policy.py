@@ -0,0 +1,37 @@
+"""The switch debouncer turns a noisy launch into one Twitch update."""
+
+from __future__ import annotations
+
+from benchmarks.replay_switch_trace import NOISY_LAUNCH, replay_debounced, replay_naive
+from switch_policy import GameSwitchDebouncer, SwitchPolicy
+
+
+def test_noisy_launch_yields_one_update() -> None:
+    assert len(replay_naive(NOISY_LAUNCH, keep_last=False)) > 1
+    assert [game for _, game in replay_debounced(NOISY_LAUNCH, keep_last=False)] == ["Valorant"]
+
+
+def test_noisy_launch_yields_one_update_when_keeping_the_last_title() -> None:
+    assert [game for _, game in replay_debounced(NOISY_LAUNCH, keep_last=True)] == ["Valorant"]
+
+
+def test_short_no_game_gap_keeps_the_committed_game() -> None:
+    debouncer = GameSwitchDebouncer(SwitchPolicy(stable_observations=1, stable_seconds=0.0, no_game_grace_seconds=10.0))
+    debouncer.observe("Valorant", 0.0)
+    assert debouncer.committed == "Valorant"
+    debouncer.observe(None, 1.0)
+    debouncer.observe(None, 5.0)
+    assert debouncer.committed == "Valorant"
+    debouncer.observe(None, 12.0)
+    assert debouncer.committed is None
+
+
+def test_switches_are_capped_per_minute() -> None:
+    debouncer = GameSwitchDebouncer(
+        SwitchPolicy(stable_observations=1, stable_seconds=0.0, no_game_grace_seconds=0.0, max_switches_per_minute=2)
+    )
+    committed = []
+    for i, game in enumerate(["A", "B", "C", "D"]):
+        debouncer.observe(game, float(i))
+        committed.append(debouncer.committed)
+    assert committed == ["A", "B", "B", "B"]
@@ -0,0 +1,90 @@
+"""TwitchClient against the local Helix stand-in."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_helix import FakeHelix
+from twitch_client import TwitchClient
+
+
+@pytest.fixture
+def helix():
+    with FakeHelix(title="Old title", game_name="Minecraft") as server:
+        yield server
+
+
+def _client(helix: FakeHelix) -> TwitchClient:
+    return TwitchClient("client-id", "token", helix.channel["broadcaster_id"], api_base=helix.base_url)
+
+
+def _patches(helix: FakeHelix) -> list[dict]:
+    return [r.body for r in helix.requests if r.method == "PATCH"]
+
+
+def test_unchanged_channel_sends_no_patch(helix: FakeHelix) -> None:
+    client = _client(helix)
+    assert client.sync_channel_state()
+    assert client.update_channel(title="Old title", category="Minecraft") is True
+    assert _patches(helix) == []
+
+
+def test_only_changed_fields_are_sent(helix: FakeHelix) -> None:
+    client = _client(helix)
+    assert client.sync_channel_state()
+    assert client.update_channel(title="New title", category="Minecraft") is True
+    assert _patches(helix) == [{"title": "New title"}]
+    assert client.update_channel(title="New title", category="Minecraft") is True
+    assert len(_patches(helix)) == 1
+
+
+def test_title_and_category_share_one_patch(helix: FakeHelix) -> None:
+    client = _client(helix)
+    assert client.sync_channel_state()
+    assert client.update_channel(title="Ranked", category="VALORANT") is True
+    assert _patches(helix) == [{"title": "Ranked", "game_id": "516575"}]
+    assert helix.channel["game_name"] == "VALORANT"
+
+
+def test_force_sends_even_when_state_matches(helix: FakeHelix) -> None:
+    client = _client(helix)
+    assert client.sync_channel_state()
+    assert client.update_channel(title="Old title", category="Minecraft", force=True) is True
+    assert _patches(helix) == [{"title": "Old title", "game_id": "27471"}]
+
+
+def test_empty_bucket_waits_for_the_reset_instead_of_a_429() -> None:
+    with FakeHelix(rate_limit=2, refill_seconds=1.0) as helix:
+        client = _client(helix)
+        start = time.monotonic()
+        for i in range(3):
+            assert client.update_channel(title=f"title {i}") is True
+        assert time.monotonic() - start >= 0.5
+        assert helix.statuses("PATCH") == [204, 204, 204]
+        assert helix.channel["title"] == "title 2"
+
+
+def test_429_is_retried_after_the_reset() -> None:
+    with FakeHelix(rate_limit=10, refill_seconds=1.0) as helix:
+        client = _client(helix)
+        helix.inject(429, 1)
+        assert client.update_channel(title="after 429") is True
+        assert helix.statuses("PATCH") == [429, 204]
+        assert helix.channel["title"] == "after 429"
+
+
+def test_superseded_patch_returns_none() -> None:
+    with FakeHelix(rate_limit=1, refill_seconds=1.0) as helix:
+        client = _client(helix)
+        assert client.update_channel(title="drain") is True  # bucket now empty
+        results: list = []
+        older = threading.Thread(target=lambda: results.append(client.update_channel(title="older")))
+        older.start()
+        time.sleep(0.1)  # the older PATCH is now waiting for budget
+        assert client.update_channel(title="newer") is True
+        older.join(timeout=5.0)
+        assert results == [None]
+        assert [body["title"] for body in _patches(helix)] == ["drain", "newer"]
@@ -0,0 +1,58 @@
+"""UpdateOutbox delivery and retry decisions."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from update_outbox import ChannelUpdate, UpdateOutbox
+
+
+class StubClient:
+    def __init__(self, results: list) -> None:
+        self.results = results
+        self.calls: list[str] = []
+        self.done = threading.Event()
+
+    def sync_channel_state(self) -> bool:
+        return True
+
+    def prewarm_game_cache(self, categories) -> None:
+        pass
+
+    def update_channel(self, title: str, category: str):
+        self.calls.append(title)
+        result = self.results.pop(0) if self.results else True
+        if not self.results:
+            self.done.set()
+        return result
+
+
+def test_superseded_update_is_not_retried() -> None:
+    client = StubClient([None])
+    outbox = UpdateOutbox(client)
+    outbox.start()
+    try:
+        outbox.submit(ChannelUpdate("auto", "Minecraft"))
+        assert client.done.wait(2.0)
+        time.sleep(0.1)
+        assert client.calls == ["auto"]
+        assert outbox.depth == 0
+    finally:
+        outbox.stop()
+
+
+def test_newer_submission_replaces_a_failed_one() -> None:
+    client = StubClient([False, True])
+    outbox = UpdateOutbox(client)
+    outbox.start()
+    try:
+        outbox.submit(ChannelUpdate("first", "Minecraft"))
+        deadline = time.monotonic() + 2.0
+        while not client.calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+        outbox.submit(ChannelUpdate("second", "VALORANT"))
+        assert client.done.wait(2.0)
+        assert client.calls == ["first", "second"]
+    finally:
+        outbox.stop()
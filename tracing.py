@@ -0,0 +1,189 @@
+"""Lightweight span tracing with a ring buffer of recent cycles.
+
+Code wraps interesting sections in ``with tracing.span("name"):``.  The
+outermost span on a thread (a monitor cycle, an outbox delivery) closes a
+*cycle*; the last N cycles are kept in memory and can be written out as
+Chrome trace-event JSON (open in ``chrome://tracing`` or Perfetto) from
+the UI or, on POSIX, by sending ``SIGUSR1``.
+
+Tracing is off unless enabled via the ``tracing`` object in config.json;
+a disabled :func:`span` returns a shared no-op object.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from collections import deque
+from typing import Any, Mapping
+
+logger = logging.getLogger(__name__)
+
+TRACE_DEFAULT_CYCLES: int = 200
+
+_PID: int = os.getpid()
+
+
+class _Span:
+    """An open span; records a complete ("X") event when it exits."""
+
+    __slots__ = ("_tracer", "name", "args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict[str, Any]) -> None:
+        self._tracer = tracer
+        self.name = name
+        self.args = args
+        self._start = 0
+
+    def set(self, key: str, value: Any) -> None:
+        """Attach *value* to the span (e.g. a status known only at the end)."""
+        self.args[key] = value
+
+    def __enter__(self) -> _Span:
+        self._tracer._enter()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = getattr(exc_type, "__name__", str(exc_type))
+        self._tracer._exit(self, self._start, end)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Tracer:
+    """Collect spans per thread and keep the last *capacity* cycles."""
+
+    def __init__(self, capacity: int = TRACE_DEFAULT_CYCLES, enabled: bool = False) -> None:
+        self.enabled: bool = enabled
+        self._cycles: deque[list[dict[str, Any]]] = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads: dict[int, str] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self._cycles.maxlen or 0
+
+    def resize(self, capacity: int) -> None:
+        with self._lock:
+            self._cycles = deque(self._cycles, maxlen=max(1, capacity))
+
+    def span(self, name: str, **args: Any) -> _Span | _NoopSpan:
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, args)
+
+    def _enter(self) -> None:
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            local.events = []
+        local.depth = depth + 1
+
+    def _exit(self, span: _Span, start_ns: int, end_ns: int) -> None:
+        local = self._local
+        tid = threading.get_ident()
+        local.events.append({
+            "name": span.name,
+            "ph": "X",
+            "ts": start_ns / 1000.0,
+            "dur": (end_ns - start_ns) / 1000.0,
+            "pid": _PID,
+            "tid": tid,
+            "args": span.args,
+        })
+        local.depth -= 1
+        if local.depth == 0:
+            with self._lock:
+                self._cycles.append(local.events)
+                self._threads.setdefault(tid, threading.current_thread().name)
+            local.events = []
+
+    def cycles(self) -> list[list[dict[str, Any]]]:
+        """Snapshot of the buffered cycles, oldest first."""
+        with self._lock:
+            return [list(c) for c in self._cycles]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cycles.clear()
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The buffered cycles as a Chrome trace-event document."""
+        with self._lock:
+            events = [e for cycle in self._cycles for e in cycle]
+            threads = dict(self._threads)
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": _PID, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        return {"traceEvents": meta + sorted(events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+
+    def dump(self, path: str) -> int:
+        """Write :meth:`chrome_trace` to *path*; return the number of cycles written."""
+        doc = self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh)
+        with self._lock:
+            return len(self._cycles)
+
+
+TRACER = Tracer()
+
+
+def span(name: str, **args: Any) -> _Span | _NoopSpan:
+    """Open a span on the global tracer (a no-op while tracing is disabled)."""
+    return TRACER.span(name, **args)
+
+
+def configure(config: Mapping[str, Any] | None) -> None:
+    """Apply the ``tracing`` object from config.json (``{"enabled": true, "cycles": 200}``)."""
+    config = config or {}
+    cycles = config.get("cycles", TRACE_DEFAULT_CYCLES)
+    if isinstance(cycles, int) and cycles > 0 and cycles != TRACER.capacity:
+        TRACER.resize(cycles)
+    TRACER.enabled = bool(config.get("enabled"))
+
+
+def dump_to_dir(base_dir: str) -> str:
+    """Dump the buffer to ``trace-<timestamp>.json`` in *base_dir*; return the path."""
+    path = os.path.join(base_dir, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+    count = TRACER.dump(path)
+    logger.info("Wrote %d traced cycles to %s", count, path)
+    return path
+
+
+def install_dump_signal(base_dir: str) -> None:
+    """Dump the trace on ``SIGUSR1`` (POSIX only; call from the main thread)."""
+    sig = getattr(signal, "SIGUSR1", None)
+    if sig is None:
+        return
+
+    def _handle(_signum: int, _frame: object) -> None:
+        try:
+            dump_to_dir(base_dir)
+        except OSError:
+            logger.exception("Trace dump failed")
+
+    signal.signal(sig, _handle)
@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import metrics
+import tracing
+from app_state import API_MAX_RETRIES, API_TIMEOUT_SEC, FALLBACK_CATEGORY, HELIX_GAMES_BATCH_SIZE
+from game_cache import GameIdCache
+from rate_limit import HelixRateLimiter
 
-from app_state import API_MAX_RETRIES, API_TIMEOUT_SEC, FALLBACK_CATEGORY
+if TYPE_CHECKING:
+    import requests
 
 logger = logging.getLogger(__name__)
 
@@ -18,92 +22,235 @@ TWITCH_API_BASE: str = "https://api.twitch.tv/helix"
 
 
 def _build_session() -> requests.Session:
-    """Create a requests Session with retry logic for transient failures."""
+    """Create a requests Session with retry logic for transient failures.
+
+    429s are not retried here: :meth:`TwitchClient._request` waits for the
+    bucket reset reported by Helix instead of backing off blindly.
+    """
+    # requests/urllib3 are the heaviest imports of the app; load them on
+    # first use so they stay off the startup path.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
     retry = Retry(
         total=API_MAX_RETRIES,
         backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
+        status_forcelist=[500, 502, 503, 504],
         allowed_methods={"GET", "PATCH"},
     )
     adapter = HTTPAdapter(max_retries=retry)
     session = requests.Session()
     session.mount("https://", adapter)
+    session.mount("http://", adapter)
     return session
 
 
 class TwitchClient:
-    """Minimal Twitch Helix API wrapper for updating stream info."""
+    """Minimal Twitch Helix API wrapper for updating stream info.
+
+    The client remembers the channel's last-known title and category
+    (seeded by :meth:`sync_channel_state`) and only sends the fields that
+    actually differ, in a single PATCH.  Requests are paced by a
+    :class:`HelixRateLimiter` kept in sync with the ``Ratelimit-*`` headers.
+    """
 
-    def __init__(self, client_id: str, access_token: str, streamer_id: str) -> None:
+    def __init__(
+        self,
+        client_id: str,
+        access_token: str,
+        streamer_id: str,
+        api_base: str = TWITCH_API_BASE,
+        game_cache: GameIdCache | None = None,
+    ) -> None:
         self.streamer_id: str = streamer_id
-        self._session: requests.Session = _build_session()
+        self._game_cache: GameIdCache = game_cache if game_cache is not None else GameIdCache()
+        self._api_base: str = api_base.rstrip("/")
+        self._http: requests.Session | None = None
+        self._http_lock = threading.Lock()
         self._headers: dict[str, str] = {
             "Client-ID": client_id,
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
+        self._channel_lock = threading.Lock()
+        self._channel: dict[str, str] = {}
+        self._limiter = HelixRateLimiter()
+        self._pacing = threading.Condition()
+        self._tickets: dict[str, int] = {}
+
+    @property
+    def rate_limit_remaining(self) -> int:
+        """Helix rate-limit points left, as last reported by Twitch."""
+        return self._limiter.remaining
+
+    @property
+    def _session(self) -> requests.Session:
+        """HTTP session, built on the first request."""
+        with self._http_lock:
+            if self._http is None:
+                self._http = _build_session()
+            return self._http
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def update_stream_category(self, category: str) -> None:
-        """Resolve *category* name to a Twitch game_id and set it on the channel.
+    def sync_channel_state(self) -> bool:
+        """Seed the last-known channel state from GET ``/channels``."""
+        try:
+            resp = self._request("GET", "/channels", params={"broadcaster_id": self.streamer_id})
+            resp.raise_for_status()
+            items: list[dict[str, Any]] = resp.json().get("data", [])
+        except Exception:
+            logger.exception("Failed to read channel information")
+            return False
+        if not items:
+            return False
+        with self._channel_lock:
+            self._channel = {
+                "title": items[0].get("title", ""),
+                "game_id": items[0].get("game_id", ""),
+                "game_name": items[0].get("game_name", ""),
+            }
+        logger.info("Channel state: '%s' [%s]", self._channel["title"], self._channel["game_name"])
+        return True
 
-        Falls back to ``FALLBACK_CATEGORY`` exactly once to avoid infinite
-        recursion when the fallback itself cannot be resolved.
+    def update_channel(
+        self, title: str | None = None, category: str | None = None, force: bool = False
+    ) -> bool | None:
+        """Set title and/or category in one PATCH, skipping unchanged fields.
+
+        With *force* every given field is sent, whatever the last-known state
+        says (it may be stale after an edit on the Twitch dashboard).
+
+        A category Twitch does not know falls back to ``FALLBACK_CATEGORY``;
+        a failed lookup does not (the update fails and can be retried).
+        Returns ``True`` when the channel is (now) in the requested state,
+        ``False`` on failure, and ``None`` when a newer PATCH superseded this
+        one before it was sent (nothing to retry: the newer state wins).
         """
-        game_id, game_name = self._resolve_game(category)
-        if game_id is None:
-            if category != FALLBACK_CATEGORY:
+        with self._channel_lock:
+            known = {} if force else dict(self._channel)
+
+        payload: dict[str, str] = {}
+        game_name: str | None = None
+        if title is not None and title != known.get("title"):
+            payload["title"] = title
+        if category is not None and category.lower() != known.get("game_name", "").lower():
+            resolved = self._resolve_game(category)
+            if resolved is not None and resolved[0] is None and category != FALLBACK_CATEGORY:
                 logger.warning("Category '%s' not found – falling back to '%s'", category, FALLBACK_CATEGORY)
-                self.update_stream_category(FALLBACK_CATEGORY)
-            return
+                resolved = self._resolve_game(FALLBACK_CATEGORY)
+            if resolved is None:
+                logger.error("Could not look up category '%s' – channel not updated", category)
+                metrics.CHANNEL_UPDATES.inc("failed")
+                return False
+            game_id, game_name = resolved
+            if game_id is not None and game_id != known.get("game_id"):
+                payload["game_id"] = game_id
+
+        if not payload:
+            logger.debug("Channel already up to date – no request sent")
+            metrics.CHANNEL_UPDATES.inc("unchanged")
+            return True
+        patched = self._patch_channel(payload)
+        if patched is None:
+            metrics.CHANNEL_UPDATES.inc("superseded")
+            return None
+        if not patched:
+            logger.error("Failed to update channel (%s)", ", ".join(payload))
+            metrics.CHANNEL_UPDATES.inc("failed")
+            return False
+        metrics.CHANNEL_UPDATES.inc("sent")
 
-        if not self._patch_channel({"game_id": game_id}):
-            logger.error("Failed to update category to '%s'", game_name)
-        else:
+        with self._channel_lock:
+            if "title" in payload:
+                self._channel["title"] = payload["title"]
+            if "game_id" in payload:
+                self._channel["game_id"] = payload["game_id"]
+                self._channel["game_name"] = game_name or ""
+        if "title" in payload:
+            logger.info("Stream title updated → %s", payload["title"])
+        if "game_id" in payload:
             logger.info("Stream category updated → %s", game_name)
+        return True
+
+    def resolve_games(self, categories: Iterable[str]) -> dict[str, tuple[str | None, str | None]]:
+        """Resolve category names to ``(game_id, game_name)``.
+
+        Cached answers (including cached misses) are returned without a
+        request; the rest are looked up ``HELIX_GAMES_BATCH_SIZE`` names per
+        GET ``/games``.  Names that could not be looked up (network error)
+        map to ``(None, None)`` and are not cached.
+        """
+        categories = [c for c in categories if c]
+        for batch in _chunks(self._game_cache.missing(categories), HELIX_GAMES_BATCH_SIZE):
+            found = self._fetch_games(batch)
+            if found is None:
+                continue
+            for name in batch:
+                game_id, game_name = found.get(name.lower(), (None, None))
+                self._game_cache.put(name, game_id, game_name)
+        self._game_cache.save()
+        return {c: self._game_cache.get(c) or (None, None) for c in categories}
+
+    def prewarm_game_cache(self, categories: Iterable[str]) -> None:
+        """Resolve every configured category (plus the fallback) up front."""
+        names = {*categories, FALLBACK_CATEGORY}
+        missing = self._game_cache.missing(names)
+        if missing:
+            logger.info("Pre-warming game id cache: %d of %d categories", len(missing), len(names))
+            self.resolve_games(missing)
+
+    def update_stream_category(self, category: str) -> None:
+        """Resolve *category* name to a Twitch game_id and set it on the channel."""
+        self.update_channel(category=category)
 
     def update_stream_title(self, title: str) -> None:
         """Set the stream title via Twitch Helix."""
-        if self._patch_channel({"title": title}):
-            logger.info("Stream title updated → %s", title)
-        else:
-            logger.error("Failed to update stream title")
+        self.update_channel(title=title)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _resolve_game(self, name: str) -> tuple[str | None, str | None]:
-        """Return ``(game_id, game_name)`` for a category name, or ``(None, None)``."""
+    def _resolve_game(self, name: str) -> tuple[str | None, str | None] | None:
+        """Return ``(game_id, game_name)`` for a category name.
+
+        ``(None, None)`` means Twitch does not know the name (a cached
+        answer); ``None`` means the lookup itself failed.
+        """
+        self.resolve_games([name])
+        return self._game_cache.get(name)
+
+    def _fetch_games(self, names: list[str]) -> dict[str, tuple[str, str]] | None:
+        """GET ``/games`` for up to 100 *names*; ``None`` on request failure."""
         try:
-            resp = self._session.get(
-                f"{TWITCH_API_BASE}/games",
-                headers=self._headers,
-                params={"name": name},
-                timeout=API_TIMEOUT_SEC,
-            )
+            resp = self._request("GET", "/games", params=[("name", n) for n in names])
             resp.raise_for_status()
-            data: dict[str, Any] = resp.json()
-            items: list[dict[str, Any]] = data.get("data", [])
-            if items:
-                return items[0]["id"], items[0]["name"]
+            items: list[dict[str, Any]] = resp.json().get("data", [])
         except Exception:
-            logger.exception("Failed to resolve game '%s'", name)
-        return None, None
+            logger.exception("Failed to resolve games %s", names)
+            return None
+        return {item["name"].lower(): (item["id"], item["name"]) for item in items}
+
+    def _patch_channel(self, payload: dict[str, Any]) -> bool | None:
+        """PATCH the broadcaster's channel.  Returns ``True`` on success.
 
-    def _patch_channel(self, payload: dict[str, Any]) -> bool:
-        """PATCH the broadcaster's channel.  Returns ``True`` on success."""
+        A PATCH still waiting for rate-limit budget is dropped (``None``)
+        when a newer one is issued – only the latest channel state matters.
+        """
         try:
-            url = f"{TWITCH_API_BASE}/channels?broadcaster_id={self.streamer_id}"
-            resp = self._session.patch(
-                url,
-                headers=self._headers,
+            resp = self._request(
+                "PATCH",
+                "/channels",
+                supersede_key="channel",
+                params={"broadcaster_id": self.streamer_id},
                 json=payload,
-                timeout=API_TIMEOUT_SEC,
             )
+            if resp is None:
+                return None
             if resp.status_code == 204:
                 return True
             logger.error("PATCH failed (%d): %s", resp.status_code, resp.text)
@@ -111,6 +258,86 @@ class TwitchClient:
             logger.exception("PATCH exception for payload %s", payload)
         return False
 
+    def _request(
+        self,
+        method: str,
+        path: str,
+        supersede_key: str | None = None,
+        **kwargs: Any,
+    ) -> requests.Response | None:
+        """Send a Helix request when the rate-limit bucket allows it.
+
+        On 429 the request is retried (up to ``API_MAX_RETRIES`` times) right
+        after the reported bucket reset.  Requests sharing a *supersede_key*
+        replace each other: an older one still waiting for budget returns
+        ``None`` without being sent.
+        """
+        ticket = self._claim_ticket(supersede_key)
+        resp: requests.Response | None = None
+        for _ in range(API_MAX_RETRIES + 1):
+            with tracing.span("helix.wait_budget"):
+                allowed = self._wait_for_budget(supersede_key, ticket)
+            if not allowed:
+                logger.info("Dropping superseded %s %s", method, path)
+                return None
+            started = time.perf_counter()
+            with tracing.span("helix.request", method=method, path=path) as sp:
+                try:
+                    resp = self._session.request(
+                        method,
+                        f"{self._api_base}{path}",
+                        headers=self._headers,
+                        timeout=API_TIMEOUT_SEC,
+                        **kwargs,
+                    )
+                except Exception:
+                    metrics.HELIX_RESPONSES.inc(method, path, "error")
+                    raise
+                finally:
+                    metrics.HELIX_SECONDS.observe(time.perf_counter() - started, method, path)
+                sp.set("status", resp.status_code)
+            _record_response(method, path, resp)
+            self._limiter.update(resp.headers)
+            metrics.HELIX_RATE_LIMIT_REMAINING.set(self._limiter.remaining)
+            if resp.status_code != 429:
+                return resp
+            logger.warning("Rate limited on %s %s – waiting for bucket reset", method, path)
+            metrics.HELIX_RETRIES.inc("rate_limit")
+        return resp
+
+    def _claim_ticket(self, key: str | None) -> int:
+        if key is None:
+            return 0
+        with self._pacing:
+            ticket = self._tickets.get(key, 0) + 1
+            self._tickets[key] = ticket
+            self._pacing.notify_all()
+            return ticket
+
+    def _wait_for_budget(self, key: str | None, ticket: int) -> bool:
+        """Block until a rate-limit point is available; ``False`` if superseded."""
+        with self._pacing:
+            while True:
+                if key is not None and self._tickets.get(key) != ticket:
+                    return False
+                delay = self._limiter.reserve()
+                if delay <= 0:
+                    return True
+                self._pacing.wait(timeout=delay)
+
+
+def _record_response(method: str, path: str, resp: requests.Response) -> None:
+    """Count the response status and the retries urllib3 made to get it."""
+    metrics.HELIX_RESPONSES.inc(method, path, str(resp.status_code))
+    retries = getattr(resp.raw, "retries", None)
+    if retries is not None and retries.history:
+        metrics.HELIX_RETRIES.inc("transport", amount=len(retries.history))
+
+
+def _chunks(items: list[str], size: int) -> Iterator[list[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 
 def format_title(template: str, game: str) -> str:
     """Replace ``%date%`` and ``%game%`` placeholders in *template*."""
@@ -8,19 +8,16 @@ import re
 import sys
 import threading
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
 from typing import Any, Callable, Sequence
 
-import psutil
-import requests
-
+import tracing
 from app_state import (
     APP_VERSION,
     GITHUB_REPO,
     I18N,
     LANGUAGE_LABEL_TO_CODE,
     PROCESS_LIST_REFRESH_INTERVAL_MS,
-    UI_REFRESH_INTERVAL_MS,
     AppState,
 )
 from config_store import (
@@ -28,14 +25,21 @@ from config_store import (
     apply_config_to_state,
     load_config,
     load_excluded_processes,
+    mark_exclusions_changed,
+    remove_custom_game,
     save_config,
     save_excluded_processes,
 )
-from process_monitor import get_current_game, is_excluded_process
+from listbox_sync import FilteredList
+from mapping_import import SUMMARY_MAX_CATEGORIES, ImportReport, import_mapping_file
+from process_monitor import get_current_game, take_process_snapshot
 from twitch_client import TwitchClient, format_title
+from ui_tasks import BackgroundTasks
 
 logger = logging.getLogger(__name__)
 
+STATE_CHANGED_EVENT: str = "<<StateChanged>>"
+
 # ---------------------------------------------------------------------------
 # Theme definitions
 # ---------------------------------------------------------------------------
@@ -189,24 +193,6 @@ def _darken(hex_color: str, factor: float) -> str:
     return f"#{r:02x}{g:02x}{b:02x}"
 
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-
-def _list_running_process_names(state: AppState) -> list[str]:
-    """Return a sorted list of non-excluded process names."""
-    names: set[str] = set()
-    for proc in psutil.process_iter(["name"]):
-        try:
-            name: str = proc.info["name"] or ""
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-        if name and not is_excluded_process(name, state):
-            names.add(name)
-    return sorted(names, key=str.lower)
-
-
 # ---------------------------------------------------------------------------
 # Main Application GUI
 # ---------------------------------------------------------------------------
@@ -230,6 +216,12 @@ class AppGUI:
         self.on_close_callback = on_close_callback
 
         self._exclusion_window: tk.Toplevel | None = None
+        self._mapping_rows = FilteredList()
+        self._proc_rows = FilteredList()
+        self._running_rows = FilteredList()
+        self._excluded_name_rows = FilteredList()
+        self._excluded_prefix_rows = FilteredList()
+        self.tasks = BackgroundTasks(lambda callback: root.after(0, callback))
 
         root.title(I18N[self.state.language]["app_title"])
         root.geometry("1280x720")
@@ -241,9 +233,16 @@ class AppGUI:
         self.refresh_process_list()
         self.apply_theme()
 
+        # State pushed by the monitor thread (see state_events)
+        self.root.bind(STATE_CHANGED_EVENT, self._on_state_changed)
+        self.state.changes.bind(lambda: root.event_generate(STATE_CHANGED_EVENT, when="tail"))
+        # The monitor may publish before mainloop() runs, when event_generate
+        # can fail; drain once the loop is up so nothing waits for the next change.
+        self.root.after_idle(self._on_state_changed)
+        self._show_poll_interval()
+
         # Periodic tasks
         self.root.after(PROCESS_LIST_REFRESH_INTERVAL_MS, self._periodic_process_refresh)
-        self.root.after(UI_REFRESH_INTERVAL_MS, self._update_loop)
         self.root.after(3000, self._start_update_check)
 
     # ------------------------------------------------------------------
@@ -280,6 +279,8 @@ class AppGUI:
         self.current_detected_label.pack(anchor="w", padx=10, pady=(10, 0))
         self.current_label = tk.Label(self.root, text=self.state.current_game, font=("Segoe UI", 12))
         self.current_label.pack(anchor="w", padx=10)
+        self.poll_label = tk.Label(self.root, text="", font=("Segoe UI", 9))
+        self.poll_label.pack(anchor="w", padx=10)
 
         # -- Configured mappings list --
         self.configured_mappings_label = tk.Label(
@@ -287,6 +288,9 @@ class AppGUI:
         )
         self.configured_mappings_label.pack(anchor="w", padx=10, pady=(10, 0))
         self.listbox = tk.Listbox(self.root, height=8, width=72)
+        mapping_filter = tk.Frame(self.root)
+        mapping_filter.pack(anchor="w", padx=10)
+        self.mapping_filter_label = self._filter_box(mapping_filter, self._mapping_rows, self.listbox)
         self.listbox.pack(padx=10, pady=(0, 6))
 
         # -- Action buttons --
@@ -296,10 +300,14 @@ class AppGUI:
         self.reload_btn.pack(side="left")
         self.remove_btn = tk.Button(btn_frame, text=tr["remove_selected"], command=self.remove_selected)
         self.remove_btn.pack(side="left", padx=6)
+        self.import_btn = tk.Button(btn_frame, text=tr["import_mappings"], command=self.import_mappings)
+        self.import_btn.pack(side="left", padx=6)
         self.edit_exclusions_btn = tk.Button(
             btn_frame, text=tr["edit_exclusions"], command=self.open_exclusions_editor
         )
         self.edit_exclusions_btn.pack(side="left", padx=6)
+        self.dump_trace_btn = tk.Button(btn_frame, text=tr["dump_trace"], command=self.dump_trace)
+        self.dump_trace_btn.pack(side="left", padx=6)
 
         # -- Add/Update form --
         frm = tk.Frame(self.root)
@@ -324,17 +332,23 @@ class AppGUI:
         self.proc_refresh_btn.pack(pady=(0, 2))
         self.proc_auto_btn = tk.Button(proc_btn_frame, text=tr["auto_select_match"], command=self.auto_select_process)
         self.proc_auto_btn.pack()
+        proc_filter = tk.Frame(proc_btn_frame)
+        proc_filter.pack(pady=(6, 0))
+        self.proc_filter_label = self._filter_box(proc_filter, self._proc_rows, self.proc_listbox, width=16)
 
         # -- Custom suffix --
         self.custom_text_label = tk.Label(
             self.root, text=tr["custom_text_hint"], font=("Segoe UI", 10, "bold")
         )
         self.custom_text_label.pack(anchor="w", padx=10, pady=(10, 0))
-        self.custom_text_entry = tk.Entry(self.root, width=80)
+        self.custom_text_var = tk.StringVar(value=self.state.custom_suffix)
+        self.custom_text_var.trace_add("write", self._on_custom_text_changed)
+        self.custom_text_entry = tk.Entry(self.root, width=80, textvariable=self.custom_text_var)
         self.custom_text_entry.pack(padx=10, pady=(0, 10))
 
         # -- Keep-last checkbox --
         self.keep_last_var = tk.BooleanVar(value=self.state.keep_last_when_no_game)
+        self.keep_last_var.trace_add("write", self._on_keep_last_changed)
         self.keep_last_checkbox = tk.Checkbutton(
             self.root,
             text=tr["keep_last_when_none"],
@@ -353,6 +367,24 @@ class AppGUI:
         self.status_label = tk.Label(self.root, text="", fg="green")
         self.status_label.pack()
 
+    def _filter_box(
+        self, parent: tk.Widget, rows: FilteredList, listbox: tk.Listbox, width: int = 30
+    ) -> tk.Label:
+        """Add a "Filter:" entry to *parent* that narrows *listbox* as you type."""
+        tr = I18N.get(self.state.language, I18N["en"])
+        label = tk.Label(parent, text=tr["filter"])
+        label.pack(side="left")
+        query = tk.StringVar()
+
+        def on_change(*_: object) -> None:
+            rows.set_query(query.get())
+            if listbox.winfo_exists():
+                rows.apply(listbox)
+
+        query.trace_add("write", on_change)
+        tk.Entry(parent, textvariable=query, width=width).pack(side="left", padx=(4, 0))
+        return label
+
     # ------------------------------------------------------------------
     # Language & theme
     # ------------------------------------------------------------------
@@ -372,9 +404,13 @@ class AppGUI:
             (self.lang_label, "language"),
             (self.current_detected_label, "current_detected_game"),
             (self.configured_mappings_label, "configured_mappings"),
+            (self.mapping_filter_label, "filter"),
+            (self.proc_filter_label, "filter"),
             (self.reload_btn, "reload_config"),
             (self.remove_btn, "remove_selected"),
+            (self.import_btn, "import_mappings"),
             (self.edit_exclusions_btn, "edit_exclusions"),
+            (self.dump_trace_btn, "dump_trace"),
             (self.game_name_label, "game_name"),
             (self.process_select_label, "process_select"),
             (self.twitch_category_label, "twitch_category"),
@@ -388,6 +424,7 @@ class AppGUI:
         ]
         for widget, key in widgets:
             widget.config(text=tr.get(key, key))
+        self._show_poll_interval()
 
     def toggle_dark_mode(self) -> None:
         self.state.dark_mode = bool(self.dark_mode_var.get())
@@ -441,10 +478,12 @@ class AppGUI:
     # ------------------------------------------------------------------
 
     def refresh_mappings(self) -> None:
-        self.listbox.delete(0, tk.END)
-        for game, proc in sorted(self.state.process_names.items()):
-            cat = self.state.twitch_categories.get(game, "")
-            self.listbox.insert(tk.END, f"{game} -> {proc}   [Category: {cat}]")
+        config = self.state.config
+        self._mapping_rows.set_rows([
+            f"{game} -> {proc}   [Category: {config.twitch_categories.get(game, '')}]"
+            for game, proc in sorted(config.process_names.items())
+        ])
+        self._mapping_rows.apply(self.listbox)
 
     def add_mapping(self) -> None:
         game = self.entry_game.get().strip()
@@ -475,21 +514,51 @@ class AppGUI:
         game = item.split("->")[0].strip()
         if not messagebox.askyesno("Confirm", f"Remove mapping for '{game}'?"):
             return
-        try:
-            cfg = dict(self.state.app_config)
-            for section in ("process_name", "TwitchCategoryName"):
-                if section in cfg and game in cfg[section]:
-                    del cfg[section][game]
-            self.state.app_config = cfg
-            self.state.process_names = cfg.get("process_name", {})
-            self.state.twitch_categories = cfg.get("TwitchCategoryName", {})
-            save_config(self.base_dir, self.state)
+        if remove_custom_game(self.base_dir, self.state, game):
             self.refresh_mappings()
             messagebox.showinfo("Removed", f"Removed mapping for '{game}'.")
-        except Exception:
-            logger.exception("remove_selected failed")
+        else:
             messagebox.showerror("Error", "Failed to remove mapping.")
 
+    def import_mappings(self) -> None:
+        """Bulk-add mappings from a CSV/JSON file (categories checked on Twitch)."""
+        tr = I18N.get(self.state.language, I18N["en"])
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            title=tr["import_mappings"],
+            filetypes=[(tr["mapping_files"], "*.csv *.json"), ("*", "*")],
+        )
+        if not path:
+            return
+        self.tasks.submit(
+            "import_mappings",
+            lambda: import_mapping_file(self.base_dir, self.state, path, self.twitch_client.resolve_games),
+            self._import_done,
+            on_error=lambda exc: self._import_failed(path, exc),
+            busy=self._busy_setter(self.import_btn),
+        )
+
+    def _import_done(self, report: ImportReport) -> None:
+        tr = I18N.get(self.state.language, I18N["en"])
+        self.refresh_mappings()
+        if not report.saved:
+            messagebox.showerror(tr["import_mappings"], report.summary())
+            return
+        text = tr["import_summary"].format(
+            added=report.added, existing=report.existing, duplicates=report.duplicates, invalid=report.invalid
+        )
+        if report.unresolved:
+            names = "\n".join(report.unresolved[:SUMMARY_MAX_CATEGORIES])
+            if len(report.unresolved) > SUMMARY_MAX_CATEGORIES:
+                names += "\n…"
+            text += "\n\n" + tr["import_unresolved"].format(count=len(report.unresolved), names=names)
+        messagebox.showinfo(tr["import_mappings"], text)
+
+    def _import_failed(self, path: str, exc: BaseException) -> None:
+        tr = I18N.get(self.state.language, I18N["en"])
+        logger.error("Importing %s failed", path, exc_info=exc)
+        messagebox.showerror(tr["import_mappings"], tr["import_failed"].format(path=path, error=exc))
+
     def reload_config(self) -> None:
         cfg = load_config(self.base_dir)
         apply_config_to_state(self.state, cfg)
@@ -501,13 +570,16 @@ class AppGUI:
     # ------------------------------------------------------------------
 
     def refresh_process_list(self) -> None:
-        try:
-            procs = _list_running_process_names(self.state)
-            self.proc_listbox.delete(0, tk.END)
-            for proc in procs:
-                self.proc_listbox.insert(tk.END, proc)
-        except Exception:
-            logger.exception("refresh_process_list failed")
+        self.tasks.submit(
+            "process_list",
+            lambda: take_process_snapshot(self.state).names,
+            self._show_process_list,
+            busy=self._busy_setter(self.proc_refresh_btn),
+        )
+
+    def _show_process_list(self, procs: Sequence[str]) -> None:
+        self._proc_rows.set_rows(procs)
+        self._proc_rows.apply(self.proc_listbox)
 
     def _periodic_process_refresh(self) -> None:
         self.refresh_process_list()
@@ -515,7 +587,9 @@ class AppGUI:
 
     def auto_select_process(self) -> None:
         """Auto-select the first process that matches a configured mapping."""
-        configured = {v.lower() for v in self.state.process_names.values()}
+        configured = self.state.config.derived(
+            "process_names_lower", lambda config: {v.lower() for v in config.process_names.values()}
+        )
         for i in range(self.proc_listbox.size()):
             item = self.proc_listbox.get(i).lower()
             if any(cfg in item or item in cfg for cfg in configured):
@@ -531,19 +605,66 @@ class AppGUI:
     # ------------------------------------------------------------------
 
     def manual_update(self) -> None:
-        detected = get_current_game(self.state)
-        if detected is None and self.keep_last_var.get():
+        keep_last = bool(self.keep_last_var.get())
+        custom = (self.custom_text_entry.get() or "").strip()
+
+        def work() -> tuple[str, bool | None] | None:
+            config = self.state.config
+            detected = get_current_game(self.state)
+            if detected is None and keep_last:
+                return None
+            current = detected if detected is not None else "Just Chatting"
+            new_title = format_title(config.base_template, current)
+            if custom:
+                new_title = f"{new_title} {custom}"
+            category = config.twitch_categories.get(current, "Just Chatting")
+            return new_title, self.twitch_client.update_channel(title=new_title, category=category, force=True)
+
+        self.tasks.submit(
+            "manual_update",
+            work,
+            self._manual_update_done,
+            on_error=self._manual_update_failed,
+            busy=self._busy_setter(self.manual_update_btn),
+        )
+
+    def _manual_update_done(self, outcome: tuple[str, bool | None] | None) -> None:
+        if outcome is None:
             self.status_label.config(text="No game detected; kept last title.", fg="blue")
             return
-        current = detected if detected is not None else "Just Chatting"
-        custom = (self.custom_text_entry.get() or "").strip()
-        new_title = format_title(self.state.base_template, current)
-        if custom:
-            new_title = f"{new_title} {custom}"
-        self.twitch_client.update_stream_title(new_title)
-        category = self.state.twitch_categories.get(current, "Just Chatting")
-        self.twitch_client.update_stream_category(category)
-        self.status_label.config(text=f"Manual update sent: {new_title}", fg="blue")
+        new_title, ok = outcome
+        if ok:
+            self.status_label.config(text=f"Manual update sent: {new_title}", fg="blue")
+        elif ok is None:
+            self.status_label.config(text=f"Manual update replaced by a newer update: {new_title}", fg="blue")
+        else:
+            self.status_label.config(text=f"Manual update failed: {new_title}", fg="red")
+
+    def _manual_update_failed(self, exc: BaseException) -> None:
+        logger.error("manual_update failed", exc_info=exc)
+        self.status_label.config(text="Manual update failed", fg="red")
+
+    @staticmethod
+    def _busy_setter(button: tk.Button) -> Callable[[bool], None]:
+        """Return a callback that greys out *button* while its task runs."""
+        def set_busy(busy: bool) -> None:
+            if button.winfo_exists():
+                button.config(state=tk.DISABLED if busy else tk.NORMAL, cursor="watch" if busy else "")
+        return set_busy
+
+    def dump_trace(self) -> None:
+        """Write the buffered monitor/Twitch trace as Chrome trace JSON."""
+        tr = I18N.get(self.state.language, I18N["en"])
+        if not tracing.TRACER.enabled:
+            messagebox.showinfo(tr["dump_trace"], tr["trace_disabled"])
+            return
+        try:
+            path = tracing.dump_to_dir(self.base_dir)
+        except OSError as exc:
+            messagebox.showerror(tr["dump_trace"], str(exc))
+            return
+        count = len(tracing.TRACER.cycles())
+        messagebox.showinfo(tr["dump_trace"], tr["trace_saved"].format(count=count, path=path))
 
     # ------------------------------------------------------------------
     # Update checker
@@ -555,6 +676,8 @@ class AppGUI:
     def _check_for_update(self) -> None:
         tr = I18N.get(self.state.language, I18N["en"])
         try:
+            import requests
+
             resp = requests.get(
                 f"https://api.github.com/repos/{GITHUB_REPO}/releases/latest",
                 timeout=8,
@@ -579,14 +702,31 @@ class AppGUI:
         return (0, 0, 0)
 
     # ------------------------------------------------------------------
-    # Periodic UI refresh
+    # State synchronisation
     # ------------------------------------------------------------------
 
-    def _update_loop(self) -> None:
-        self.state.custom_suffix = (self.custom_text_entry.get() or "").strip()
+    def _on_state_changed(self, _event: tk.Event | None = None) -> None:
+        """Show what the monitor published since the last notification."""
+        changes = self.state.changes.drain()
+        if "current_game" in changes:
+            self.current_label.config(text=changes["current_game"])
+        if "poll_interval" in changes or "poll_mode" in changes:
+            self._show_poll_interval()
+        if "config_version" in changes:
+            self.refresh_mappings()
+
+    def _on_custom_text_changed(self, *_: object) -> None:
+        self.state.custom_suffix = self.custom_text_var.get().strip()
+
+    def _on_keep_last_changed(self, *_: object) -> None:
         self.state.keep_last_when_no_game = bool(self.keep_last_var.get())
-        self.current_label.config(text=self.state.current_game)
-        self.root.after(UI_REFRESH_INTERVAL_MS, self._update_loop)
+
+    def _show_poll_interval(self) -> None:
+        if self.state.poll_interval <= 0:
+            return  # the monitor has not finished its first scan yet
+        tr = I18N.get(self.state.language, I18N["en"])
+        mode = tr.get(f"poll_mode_{self.state.poll_mode}", self.state.poll_mode)
+        self.poll_label.config(text=tr["scan_interval"].format(seconds=self.state.poll_interval, mode=mode))
 
     def _save_ui_settings(self) -> None:
         self.state.keep_last_when_no_game = bool(self.keep_last_var.get())
@@ -603,6 +743,8 @@ class AppGUI:
         win.geometry("960x420")
         win.transient(self.root)
         self._exclusion_window = win
+        self._excluded_name_rows = FilteredList()
+        self._excluded_prefix_rows = FilteredList()
 
         frame = tk.Frame(win)
         frame.pack(fill="both", expand=True, padx=8, pady=8)
@@ -612,6 +754,9 @@ class AppGUI:
         left.pack(side="left", fill="both", expand=True, padx=(0, 6))
         tk.Label(left, text=tr["excluded_names"]).pack(anchor="w")
         self.exc_names_lb = tk.Listbox(left, height=14, width=36, exportselection=False, selectmode=tk.EXTENDED)
+        names_filter = tk.Frame(left)
+        names_filter.pack(anchor="w", pady=(2, 0))
+        self._filter_box(names_filter, self._excluded_name_rows, self.exc_names_lb, width=24)
         self.exc_names_lb.pack(fill="both", expand=True, padx=2, pady=4)
         en_frame = tk.Frame(left)
         en_frame.pack(fill="x")
@@ -625,10 +770,15 @@ class AppGUI:
         middle.pack(side="left", fill="both", expand=True, padx=(6, 6))
         tk.Label(middle, text=tr["running_processes"]).pack(anchor="w")
         self.running_procs_lb = tk.Listbox(middle, height=14, width=36, exportselection=False, selectmode=tk.EXTENDED)
+        running_filter = tk.Frame(middle)
+        running_filter.pack(anchor="w", pady=(2, 0))
+        self._running_rows = FilteredList()
+        self._filter_box(running_filter, self._running_rows, self.running_procs_lb, width=24)
         self.running_procs_lb.pack(fill="both", expand=True, padx=2, pady=4)
         rp_btns = tk.Frame(middle)
         rp_btns.pack(fill="x")
-        tk.Button(rp_btns, text=tr["refresh"], command=self._refresh_running_procs).pack(side="left")
+        self.running_refresh_btn = tk.Button(rp_btns, text=tr["refresh"], command=self._refresh_running_procs)
+        self.running_refresh_btn.pack(side="left")
         tk.Button(rp_btns, text=tr["add_to_names"], command=self._add_selected_to_names).pack(side="left", padx=6)
         tk.Button(rp_btns, text=tr["add_to_prefixes"], command=self._add_selected_to_prefixes).pack(side="left", padx=6)
 
@@ -637,6 +787,9 @@ class AppGUI:
         right.pack(side="left", fill="both", expand=True, padx=(6, 0))
         tk.Label(right, text=tr["excluded_prefixes"]).pack(anchor="w")
         self.exc_prefix_lb = tk.Listbox(right, height=14, width=36, exportselection=False, selectmode=tk.EXTENDED)
+        prefix_filter = tk.Frame(right)
+        prefix_filter.pack(anchor="w", pady=(2, 0))
+        self._filter_box(prefix_filter, self._excluded_prefix_rows, self.exc_prefix_lb, width=24)
         self.exc_prefix_lb.pack(fill="both", expand=True, padx=2, pady=4)
         pre_frame = tk.Frame(right)
         pre_frame.pack(fill="x")
@@ -658,21 +811,28 @@ class AppGUI:
     # --- Exclusion helpers ---
 
     def _refresh_running_procs(self) -> None:
-        try:
-            procs = _list_running_process_names(self.state)
-            self.running_procs_lb.delete(0, tk.END)
-            for proc in procs:
-                self.running_procs_lb.insert(tk.END, proc)
-        except Exception:
-            logger.exception("_refresh_running_procs failed")
+        self.tasks.submit(
+            "running_procs",
+            lambda: take_process_snapshot(self.state).names,
+            self._show_running_procs,
+            busy=self._busy_setter(self.running_refresh_btn),
+        )
+
+    def _show_running_procs(self, procs: Sequence[str]) -> None:
+        if self._exclusion_window is None or not self.running_procs_lb.winfo_exists():
+            return  # editor closed while the scan ran
+        self._running_rows.set_rows(procs)
+        self._running_rows.apply(self.running_procs_lb)
 
     def _refresh_exclusions_lists(self) -> None:
-        self.exc_names_lb.delete(0, tk.END)
-        for name in sorted(self.state.excluded_names):
-            self.exc_names_lb.insert(tk.END, name)
-        self.exc_prefix_lb.delete(0, tk.END)
-        for p in self.state.excluded_prefixes:
-            self.exc_prefix_lb.insert(tk.END, p)
+        self._excluded_name_rows.set_rows(sorted(self.state.excluded_names))
+        self._excluded_name_rows.apply(self.exc_names_lb)
+        self._excluded_prefix_rows.set_rows(self.state.excluded_prefixes)
+        self._excluded_prefix_rows.apply(self.exc_prefix_lb)
+
+    def _on_exclusions_edited(self) -> None:
+        mark_exclusions_changed(self.state)
+        self._refresh_exclusions_lists()
 
     def _add_excluded_name(self) -> None:
         val = (self.exc_name_entry.get() or "").strip()
@@ -681,10 +841,11 @@ class AppGUI:
             return
         self.state.excluded_names.add(val.lower())
         self.exc_name_entry.delete(0, tk.END)
-        self._refresh_exclusions_lists()
+        self._on_exclusions_edited()
 
     def _remove_selected_excluded_name(self) -> None:
         self._remove_selected_from_listbox(self.exc_names_lb, self.state.excluded_names)
+        self._on_exclusions_edited()
 
     def _add_excluded_prefix(self) -> None:
         val = (self.exc_prefix_entry.get() or "").strip()
@@ -695,7 +856,7 @@ class AppGUI:
         if p not in self.state.excluded_prefixes:
             self.state.excluded_prefixes.append(p)
         self.exc_prefix_entry.delete(0, tk.END)
-        self._refresh_exclusions_lists()
+        self._on_exclusions_edited()
 
     def _remove_selected_excluded_prefix(self) -> None:
         sel = self.exc_prefix_lb.curselection()
@@ -708,7 +869,7 @@ class AppGUI:
                 self.state.excluded_prefixes.remove(p)
             except ValueError:
                 pass
-        self._refresh_exclusions_lists()
+        self._on_exclusions_edited()
 
     @staticmethod
     def _remove_selected_from_listbox(lb: tk.Listbox, store: set[str]) -> None:
@@ -741,7 +902,7 @@ class AppGUI:
         added = self._collect_selected_running()
         for name in added:
             self.state.excluded_names.add(name.lower())
-        self._refresh_exclusions_lists()
+        self._on_exclusions_edited()
         self._refresh_running_procs()
         messagebox.showinfo("Added", f"Added to excluded names:\n{', '.join(added)}" if added else "No valid names were added.")
 
@@ -752,7 +913,7 @@ class AppGUI:
             if prefix and prefix not in self.state.excluded_prefixes:
                 self.state.excluded_prefixes.append(prefix)
                 added.append(prefix)
-        self._refresh_exclusions_lists()
+        self._on_exclusions_edited()
         self._refresh_running_procs()
         messagebox.showinfo("Added", f"Added prefixes:\n{', '.join(added)}" if added else "No new prefixes were added.")
 
@@ -768,6 +929,8 @@ class AppGUI:
     # ------------------------------------------------------------------
 
     def on_close(self) -> None:
+        self.state.changes.bind(None)
+        self.tasks.shutdown()
         try:
             self.on_close_callback()
         except Exception:
@@ -0,0 +1,113 @@
+"""Background work for the GUI: blocking calls off the Tk thread.
+
+Tk is single-threaded; anything that scans processes or talks to Twitch
+runs on a small thread pool instead, and its result is handed back to the
+Tk thread with ``root.after``.  Tasks are keyed: submitting a task under a
+key that is still pending makes the older one stale – it is cancelled if
+it has not started yet, and its result is dropped if it has.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app_state import UI_WORKER_THREADS
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """Run callables on worker threads and deliver results via *call_soon*.
+
+    *call_soon* must schedule a zero-argument callable on the Tk thread
+    (``lambda cb: root.after(0, cb)``); all callbacks passed to
+    :meth:`submit` run there.
+    """
+
+    def __init__(
+        self,
+        call_soon: Callable[[Callable[[], None]], Any],
+        max_workers: int = UI_WORKER_THREADS,
+    ) -> None:
+        self._call_soon = call_soon
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-worker")
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[int, Future[Any], Callable[[bool], None] | None]] = {}
+        self._generation: int = 0
+        self._closed: bool = False
+
+    def submit(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[BaseException], None] | None = None,
+        busy: Callable[[bool], None] | None = None,
+    ) -> None:
+        """Run *fn* in the background, replacing any pending task under *key*.
+
+        *on_done* gets the result and *on_error* the exception (logged when
+        omitted).  *busy* is called with ``True`` now and ``False`` once the
+        latest task for *key* has finished.  Call from the Tk thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._generation += 1
+            generation = self._generation
+            stale = self._pending.get(key)
+            if busy is None and stale is not None:
+                busy = stale[2]  # still owed a busy(False)
+            future = self._pool.submit(fn)
+            self._pending[key] = (generation, future, busy)
+        if stale is not None and stale[1].cancel():
+            logger.debug("Cancelled stale UI task %r", key)
+        if busy is not None:
+            busy(True)
+        future.add_done_callback(lambda f: self._finished(key, generation, f, on_done, on_error))
+
+    def shutdown(self) -> None:
+        """Drop queued tasks and stop delivering results."""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(
+        self,
+        key: str,
+        generation: int,
+        future: Future[Any],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[BaseException], None] | None,
+    ) -> None:
+        """Worker-thread side: hand the outcome to the Tk thread if still current."""
+        if future.cancelled():
+            return
+
+        def deliver() -> None:
+            with self._lock:
+                entry = self._pending.get(key)
+                if entry is None or entry[0] != generation:
+                    logger.debug("Dropping stale result of UI task %r", key)
+                    return
+                del self._pending[key]
+            busy = entry[2]
+            if busy is not None:
+                busy(False)
+            exc = future.exception()
+            if exc is None:
+                on_done(future.result())
+            elif on_error is not None:
+                on_error(exc)
+            else:
+                logger.error("UI task %r failed", key, exc_info=exc)
+
+        try:
+            self._call_soon(deliver)
+        except Exception:
+            # The Tk main loop is gone (window closed while the task ran).
+            logger.debug("UI task %r finished after shutdown", key, exc_info=True)
@@ -0,0 +1,146 @@
+"""Non-blocking delivery of channel updates to Twitch.
+
+The monitor thread only *submits* the desired channel state; a worker
+thread delivers it.  The outbox holds a single slot – a newer state
+replaces an undelivered older one, so after an outage only the latest
+title/category is sent.  The worker mirrors the pending state to
+``pending_update.json`` (so submitting never waits on disk either), and it
+is replayed after a restart.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import asdict, dataclass
+from typing import Iterable
+
+import metrics
+import tracing
+from app_state import OUTBOX_RETRY_MAX_SEC, OUTBOX_RETRY_MIN_SEC
+from config_store import load_pending_update, save_pending_update
+from twitch_client import TwitchClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChannelUpdate:
+    """Desired channel state."""
+
+    title: str
+    category: str
+
+
+class UpdateOutbox:
+    """Latest-wins mailbox between the monitor and the Twitch client.
+
+    *base_dir* ``None`` disables persistence.
+    """
+
+    def __init__(self, twitch_client: TwitchClient, base_dir: str | None = None) -> None:
+        self._client = twitch_client
+        self._base_dir = base_dir
+        self._cond = threading.Condition()
+        self._pending: ChannelUpdate | None = None
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self._persist_lock = threading.Lock()
+        if base_dir is not None:
+            saved = load_pending_update(base_dir)
+            if saved.get("title") is not None and saved.get("category"):
+                self._pending = ChannelUpdate(saved["title"], saved["category"])
+                logger.info("Replaying undelivered update: %s [%s]", self._pending.title, self._pending.category)
+        self._persisted: ChannelUpdate | None = self._pending
+        metrics.OUTBOX_DEPTH.set(self.depth)
+
+    @property
+    def depth(self) -> int:
+        """Number of undelivered updates (0 or 1)."""
+        return 0 if self._pending is None else 1
+
+    def submit(self, update: ChannelUpdate) -> None:
+        """Queue *update*, replacing any undelivered one.  Never blocks on I/O to Twitch."""
+        with self._cond:
+            if self._pending is not None:
+                logger.debug("Superseding undelivered update: %s", self._pending.title)
+            self._pending = update
+            metrics.OUTBOX_DEPTH.set(1)
+            self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def start(self, prewarm_categories: Iterable[str] = ()) -> None:
+        """Start the delivery thread.
+
+        Before the first delivery it seeds the client's channel state and
+        pre-warms the game-id cache for *prewarm_categories*.
+        """
+        categories = list(prewarm_categories)
+        self._thread = threading.Thread(target=self._run, args=(categories,), name="update-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the worker; an undelivered update stays persisted."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        # The worker may still be stuck in a request (or never started).
+        self._persist(self._pending)
+
+    def _run(self, prewarm_categories: list[str]) -> None:
+        with tracing.span("outbox.startup"):
+            self._client.sync_channel_state()
+            self._client.prewarm_game_cache(prewarm_categories)
+
+        backoff = OUTBOX_RETRY_MIN_SEC
+        while True:
+            with self._cond:
+                update = self._pending
+            # The slot is mirrored to disk here rather than in submit(), so
+            # the monitor thread never waits on the write.
+            self._persist(update)
+            with self._cond:
+                while update is None and self._pending is None and not self._stopping:
+                    self._cond.wait()
+                if self._pending is not update:
+                    continue  # replaced while we were writing or idle
+                if self._stopping:
+                    return
+
+            try:
+                with tracing.span("outbox.deliver", title=update.title, category=update.category):
+                    ok = self._client.update_channel(title=update.title, category=update.category)
+            except Exception:
+                logger.exception("Channel update raised")
+                ok = False
+
+            with self._cond:
+                if ok is None:
+                    # A newer PATCH (e.g. a manual update) replaced this one.
+                    logger.info("Channel update superseded by a newer one – not retrying")
+                if ok or ok is None:
+                    backoff = OUTBOX_RETRY_MIN_SEC
+                    if self._pending is update:
+                        self._pending = None
+                        metrics.OUTBOX_DEPTH.set(0)
+                    continue
+                logger.warning("Channel update failed – retrying in %.0fs", backoff)
+                # A newer submit() or stop() wakes us early.
+                if self._pending is update and not self._stopping:
+                    self._cond.wait(timeout=backoff)
+                backoff = min(backoff * 2, OUTBOX_RETRY_MAX_SEC)
+
+    def _persist(self, update: ChannelUpdate | None) -> None:
+        """Mirror *update* to disk unless it already is (worker and stop() only)."""
+        if self._base_dir is None:
+            return
+        with self._persist_lock:
+            if update == self._persisted:
+                return
+            save_pending_update(self._base_dir, asdict(update) if update is not None else None)
+            self._persisted = update